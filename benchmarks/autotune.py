@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Offline auto-tuner for the runtime parameters of the server.
+
+Every point of the parameter grid launches a fresh server with the real models and keeps
+a fixed number of FLORES-200 batch translations in flight. Points that oversubscribe the
+CPUs are pruned before launching, and the remaining points are screened with a short load
+of which only the fastest share is measured with the full load (successive halving).
+The Pareto-optimal points, trading throughput against p99 latency, are written as env files.
+
+Usage:
+    uv run python benchmarks/autotune.py
+    uv run python benchmarks/autotune.py --workers 1 2 --translator-threads 1 2 4 --compute-types int8 int8_float32
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+from pathlib import Path
+
+from benchmarks.cold_start import percentile
+from benchmarks.pinning import ThroughputResult, generate_load, launch_server
+
+# the grid arguments and the environment variables they set
+PARAMETERS = {
+    "workers": "WORKER_COUNT",
+    "translator_threads": "TRANSLATOR_THREADS",
+    "intra_threads": "TRANSLATOR_INTRA_THREADS",
+    "batch_max_tokens": "BATCH_MAX_TOKENS",
+    "compute_types": "COMPUTE_TYPE",
+}
+
+
+class TuningPoint:
+    """A point of the parameter grid and its measurements."""
+
+    def __init__(self, environment: dict[str, str]) -> None:
+        self.environment = environment
+        self.result: ThroughputResult | None = None
+        self.stage = "pending"
+
+    @property
+    def threads(self) -> int:
+        """The number of threads the point runs, an intra thread count of `0` counting as one."""
+        return (
+            int(self.environment["WORKER_COUNT"])
+            * int(self.environment["TRANSLATOR_THREADS"])
+            * max(1, int(self.environment["TRANSLATOR_INTRA_THREADS"]))
+        )
+
+    def summary(self) -> dict[str, object]:
+        """The parameters and measurements of the point."""
+        summary: dict[str, object] = {"stage": self.stage, **self.environment}
+
+        if self.result is not None and self.result.latencies:
+            summary["throughput"] = round(self.result.throughput, 3)
+            summary["p50_ms"] = round(statistics.median(self.result.latencies) * 1000, 1)
+            summary["p99_ms"] = round(percentile(self.result.latencies, 0.99) * 1000, 1)
+
+        return summary
+
+
+def get_grid(args: argparse.Namespace) -> list[TuningPoint]:
+    """Get every combination of the swept parameters."""
+    values = [[str(value) for value in getattr(args, argument)] for argument in PARAMETERS]
+
+    return [
+        TuningPoint(dict(zip(PARAMETERS.values(), combination, strict=True)))
+        for combination in itertools.product(*values)
+    ]
+
+
+def measure(point: TuningPoint, duration: float, args: argparse.Namespace) -> ThroughputResult:
+    """Launch a server with the parameters of the point and measure its throughput."""
+    environment = {key: value for key, value in point.environment.items() if key != "WORKER_COUNT"}
+    workers = int(point.environment["WORKER_COUNT"])
+
+    with launch_server(environment, workers=workers, timeout=args.timeout, root_path=args.root_path) as base_url:
+        asyncio.run(generate_load(base_url, args.batch_size, args.concurrency, args.warmup))
+        return asyncio.run(generate_load(base_url, args.batch_size, args.concurrency, duration))
+
+
+def get_pareto_front(points: list[TuningPoint]) -> list[TuningPoint]:
+    """Get the points that no other point beats in both throughput and p99 latency."""
+    measured = [point for point in points if point.result is not None and point.result.latencies]
+
+    def dominates(point: TuningPoint, other: TuningPoint) -> bool:
+        if point.result is None or other.result is None:
+            raise RuntimeError("only measured points can be compared")
+
+        throughput, other_throughput = point.result.throughput, other.result.throughput
+        p99, other_p99 = percentile(point.result.latencies, 0.99), percentile(other.result.latencies, 0.99)
+
+        better_or_equal = throughput >= other_throughput and p99 <= other_p99
+        return better_or_equal and (throughput, p99) != (other_throughput, other_p99)
+
+    front = [point for point in measured if not any(dominates(other, point) for other in measured)]
+    return sorted(front, key=lambda point: point.result.throughput if point.result else 0.0, reverse=True)
+
+
+def write_env_files(front: list[TuningPoint], output_directory: Path) -> None:
+    """Write every Pareto-optimal point as an env file, explicit settings take precedence over `AUTO_SIZING`."""
+    for rank, point in enumerate(front, start=1):
+        summary = point.summary()
+        lines = [
+            (
+                f"# throughput: {summary['throughput']} translations/s, "
+                f"p50: {summary['p50_ms']} ms, p99: {summary['p99_ms']} ms"
+            ),
+            *(f"{key}={value}" for key, value in point.environment.items()),
+        ]
+        (output_directory / f"pareto-{rank}.env").write_text("\n".join(lines) + "\n")
+
+
+def run_tuner(args: argparse.Namespace) -> None:
+    """Run the auto-tuner."""
+    output_directory = Path(args.output_dir)
+    output_directory.mkdir(parents=True, exist_ok=True)
+    points = get_grid(args)
+    cores = len(os.sched_getaffinity(0))
+
+    print(f"Tuning {len(points)} points on {cores} CPUs")
+
+    for point in points:
+        if point.threads > cores * args.max_oversubscription:
+            point.stage = "pruned: oversubscribed"
+
+    candidates = [point for point in points if point.stage == "pending"]
+
+    for index, point in enumerate(candidates, start=1):
+        try:
+            point.result = measure(point, args.screen_duration, args)
+            point.stage = "screened"
+
+        except (RuntimeError, TimeoutError) as error:
+            point.stage = f"pruned: {error}"
+
+        print(f"[screen {index}/{len(candidates)}] {point.summary()}")
+
+    screened = sorted(
+        (point for point in candidates if point.result is not None),
+        key=lambda point: point.result.throughput if point.result else 0.0,
+        reverse=True,
+    )
+    survivors = screened[: max(1, int(len(screened) * args.keep))]
+
+    for point in screened[len(survivors) :]:
+        point.stage = "pruned: slow"
+
+    for index, point in enumerate(survivors, start=1):
+        point.result = measure(point, args.duration, args)
+        point.stage = "measured"
+        print(f"[measure {index}/{len(survivors)}] {point.summary()}")
+
+    # only points measured with the full load are compared, screening loads are too short for a stable p99
+    front = get_pareto_front([point for point in points if point.stage == "measured"])
+    write_env_files(front, output_directory)
+    (output_directory / "results.json").write_text(json.dumps([point.summary() for point in points], indent=2))
+
+    print("\n" + "=" * 70)
+    print("PARETO FRONT (throughput vs p99 latency)")
+    print("=" * 70)
+
+    for rank, point in enumerate(front, start=1):
+        print(f"  pareto-{rank}.env: {point.summary()}")
+
+    print("=" * 70)
+    print(f"Results written to {output_directory}")
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Sweep the runtime parameters and write the Pareto-optimal configs")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2], help="WORKER_COUNT values (default: 1 2)")
+    parser.add_argument(
+        "--translator-threads",
+        nargs="+",
+        type=int,
+        default=[1, 2, 4],
+        help="TRANSLATOR_THREADS values (default: 1 2 4)",
+    )
+    parser.add_argument(
+        "--intra-threads",
+        nargs="+",
+        type=int,
+        default=[1, 2, 4],
+        help="TRANSLATOR_INTRA_THREADS values (default: 1 2 4)",
+    )
+    parser.add_argument(
+        "--batch-max-tokens",
+        nargs="+",
+        type=int,
+        default=[2048, 8192],
+        help="BATCH_MAX_TOKENS values (default: 2048 8192)",
+    )
+    parser.add_argument(
+        "--compute-types",
+        nargs="+",
+        default=["auto"],
+        help="COMPUTE_TYPE values, e.g. int8 int8_float32 int8_bfloat16 (default: auto)",
+    )
+    parser.add_argument("--batch-size", type=int, default=8, help="Translations per batch request (default: 8)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Batch requests in flight (default: 8)")
+    parser.add_argument(
+        "--screen-duration",
+        type=float,
+        default=15.0,
+        help="Seconds of load every candidate is screened with (default: 15)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=60.0,
+        help="Seconds of load the surviving candidates are measured with (default: 60)",
+    )
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds of unmeasured load (default: 5)")
+    parser.add_argument(
+        "--keep",
+        type=float,
+        default=0.25,
+        help="Share of the screened candidates, by throughput, that are measured (default: 0.25)",
+    )
+    parser.add_argument(
+        "--max-oversubscription",
+        type=float,
+        default=1.0,
+        help="Threads per CPU above which a point is pruned without launching it (default: 1.0)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="Seconds to wait for a launch to become ready (default: 600)",
+    )
+    parser.add_argument(
+        "--root-path",
+        type=str,
+        default="/api",
+        help="The SERVER_ROOT_PATH the server is launched with (default: /api)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="autotune",
+        help="Directory the results and env files are written to (default: autotune)",
+    )
+
+    run_tuner(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
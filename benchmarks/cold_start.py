@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool to measure how long the server takes to start.
+
+Every run launches a fresh server process and polls it until it listens (`/health`)
+and until every model is ready (`/ready`). The server logs a `Startup profile` event
+once its models are loaded, which breaks the startup down into phases.
+
+Usage:
+    uv run python benchmarks/cold_start.py
+    uv run python benchmarks/cold_start.py --modes stub real --runs 10
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+MODE_ENVIRONMENTS = {
+    "stub": {"STUB_TRANSLATOR": "True", "STUB_LANGUAGE_DETECTOR": "True"},
+    "real": {"STUB_TRANSLATOR": "False", "STUB_LANGUAGE_DETECTOR": "False"},
+}
+
+
+class ColdStartResult:
+    """Results from a single server launch."""
+
+    def __init__(self, time_to_listen: float, time_to_ready: float, phases: dict[str, float]) -> None:
+        self.time_to_listen = time_to_listen
+        self.time_to_ready = time_to_ready
+        self.phases = phases
+
+
+def get_free_port() -> int:
+    """Get a port that is free on the loopback interface."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def read_startup_profile(log_path: Path) -> dict[str, float] | None:
+    """Read the phases of the `Startup profile` event from the server log."""
+    for line in log_path.read_text(errors="replace").splitlines():
+        try:
+            event = json.loads(line)
+
+        except json.JSONDecodeError:
+            continue
+
+        if isinstance(event, dict) and event.get("event") == "Startup profile":
+            return event.get("phases", {})
+
+    return None
+
+
+def launch(mode: str, timeout: float, root_path: str) -> ColdStartResult:
+    """Launch a server process and wait until it is ready."""
+    port = get_free_port()
+    base_url = f"http://127.0.0.1:{port}{root_path}"
+    environment = {
+        **os.environ,
+        **MODE_ENVIRONMENTS[mode],
+        "SERVER_PORT": str(port),
+        "SERVER_ROOT_PATH": root_path,
+        "LOG_JSON": "true",
+    }
+    time_to_listen = None
+
+    with tempfile.TemporaryDirectory() as directory, httpx.Client(timeout=1.0) as client:
+        log_path = Path(directory) / "server.log"
+
+        with log_path.open("w") as log:
+            start = time.perf_counter()
+            process = subprocess.Popen(
+                [sys.executable, "-c", "from server import main; main()"],
+                env=environment,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+
+            try:
+                while (elapsed := time.perf_counter() - start) < timeout:
+                    if process.poll() is not None:
+                        raise RuntimeError(f"server exited with code {process.returncode}")
+
+                    try:
+                        response = client.get(f"{base_url}/ready")
+
+                    except httpx.TransportError:
+                        time.sleep(0.05)
+                        continue
+
+                    time_to_listen = time_to_listen or elapsed
+
+                    if response.status_code == 200:
+                        break
+
+                    time.sleep(0.05)
+
+                else:
+                    raise TimeoutError(f"server was not ready after {timeout:.0f}s")
+
+                # the profile is logged right after the last model becomes ready
+                deadline = time.perf_counter() + 5.0
+                while (phases := read_startup_profile(log_path)) is None and time.perf_counter() < deadline:
+                    time.sleep(0.05)
+
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+    return ColdStartResult(time_to_listen or elapsed, elapsed, phases or {})
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Get the value below which the given share of values fall."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def print_distribution(name: str, values: list[float]) -> None:
+    """Print the distribution of a list of durations in seconds."""
+    print(
+        f"  {name:<28} {min(values):>9.3f} {statistics.median(values):>9.3f} "
+        f"{percentile(values, 0.95):>9.3f} {max(values):>9.3f}"
+    )
+
+
+def run_benchmark(modes: list[str], runs: int, timeout: float, root_path: str) -> None:
+    """Run the cold-start benchmark."""
+    print("Benchmark Configuration:")
+    print(f"  Modes: {', '.join(modes)}")
+    print(f"  Runs per mode: {runs}")
+    print(f"  Timeout: {timeout:.0f}s")
+    print()
+
+    for mode in modes:
+        results: list[ColdStartResult] = []
+
+        for run in range(runs):
+            results.append(launch(mode, timeout, root_path))
+            print(f"[{mode}] run {run + 1}/{runs}: ready after {results[-1].time_to_ready:.3f}s")
+
+        print("\n" + "=" * 70)
+        print(f"COLD START ({mode}, seconds)")
+        print("=" * 70)
+        print(f"  {'Phase':<28} {'Min':>9} {'P50':>9} {'P95':>9} {'Max':>9}")
+        print("-" * 70)
+        print_distribution("time to listen", [result.time_to_listen for result in results])
+        print_distribution("time to ready", [result.time_to_ready for result in results])
+
+        for phase in sorted({phase for result in results for phase in result.phases}):
+            print_distribution(phase, [result.phases[phase] for result in results if phase in result.phases])
+
+        print("=" * 70 + "\n")
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the time from process start until the server is ready")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=list(MODE_ENVIRONMENTS),
+        default=["stub", "real"],
+        help="Launch with the stub models, the real models or both (default: stub real)",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of launches per mode (default: 5)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="Seconds to wait for a launch to become ready (default: 600)",
+    )
+    parser.add_argument(
+        "--root-path",
+        type=str,
+        default="/api",
+        help="The SERVER_ROOT_PATH the server is launched with (default: /api)",
+    )
+
+    args = parser.parse_args()
+    run_benchmark(modes=args.modes, runs=args.runs, timeout=args.timeout, root_path=args.root_path)
+
+
+if __name__ == "__main__":
+    main()
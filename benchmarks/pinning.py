@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool to compare the throughput of pinned and unpinned replicas.
+
+Every mode launches a fresh server process with the real models, waits until it is ready
+and then keeps `--concurrency` batch translations of FLORES-200 samples in flight for
+`--duration` seconds. With `CPU_PINNING` enabled, every worker is pinned to a core set
+within one NUMA node and loads its weights on that node.
+
+Usage:
+    uv run python benchmarks/pinning.py
+    uv run python benchmarks/pinning.py --workers 2 --translator-threads 2 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+
+from benchmarks.cold_start import get_free_port, percentile
+from benchmarks.flores_data import get_flores_samples
+
+MODE_ENVIRONMENTS = {
+    "unpinned": {"CPU_PINNING": "False"},
+    "pinned": {"CPU_PINNING": "True"},
+}
+
+
+class ThroughputResult:
+    """Results from a single load run."""
+
+    def __init__(self, translations: int, elapsed: float, latencies: list[float]) -> None:
+        self.translations = translations
+        self.elapsed = elapsed
+        self.latencies = latencies
+
+    @property
+    def throughput(self) -> float:
+        """Translations per second."""
+        return self.translations / self.elapsed
+
+
+async def generate_load(base_url: str, batch_size: int, concurrency: int, duration: float) -> ThroughputResult:
+    """Keep `concurrency` batch translations in flight until the duration has passed."""
+    samples = get_flores_samples()
+    batches = [
+        {"translations": [samples[(start + offset) % len(samples)] for offset in range(batch_size)]}
+        for start in range(0, len(samples), batch_size)
+    ]
+    latencies: list[float] = []
+    translations = 0
+
+    async def worker(client: httpx.AsyncClient, offset: int, deadline: float) -> None:
+        nonlocal translations
+        index = offset
+
+        while time.perf_counter() < deadline:
+            request_start = time.perf_counter()
+            response = await client.post(f"{base_url}/translator/batch", json=batches[index % len(batches)])
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - request_start)
+            translations += batch_size
+            index += concurrency
+
+    async with httpx.AsyncClient(timeout=300.0) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(worker(client, offset, deadline) for offset in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return ThroughputResult(translations, elapsed, latencies)
+
+
+@contextmanager
+def launch_server(environment: dict[str, str], *, workers: int, timeout: float, root_path: str) -> Iterator[str]:
+    """Launch a server process with the real models and yield its base URL once every worker is ready."""
+    port = get_free_port()
+    base_url = f"http://127.0.0.1:{port}{root_path}"
+    environment = {
+        **os.environ,
+        "STUB_TRANSLATOR": "False",
+        "LANGUAGE_DETECTOR_ENABLED": "False",
+        **environment,
+        "WORKER_COUNT": str(workers),
+        "SERVER_PORT": str(port),
+        "SERVER_ROOT_PATH": root_path,
+        "LOG_JSON": "true",
+    }
+
+    with tempfile.TemporaryDirectory() as directory, httpx.Client(timeout=1.0) as client:
+        log_path = Path(directory) / "server.log"
+
+        with log_path.open("w") as log:
+            process = subprocess.Popen(
+                [sys.executable, "-c", "from server import main; main()"],
+                env=environment,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+
+            try:
+                start = time.perf_counter()
+                # every worker has to be ready, so `/ready` has to pass a few times in a row
+                consecutive_ready = 0
+
+                while consecutive_ready < workers * 4:
+                    if process.poll() is not None:
+                        raise RuntimeError(f"server exited with code {process.returncode}")
+
+                    if time.perf_counter() - start > timeout:
+                        raise TimeoutError(f"server was not ready after {timeout:.0f}s")
+
+                    try:
+                        ready = client.get(f"{base_url}/ready").status_code == 200
+
+                    except httpx.TransportError:
+                        ready = False
+
+                    consecutive_ready = consecutive_ready + 1 if ready else 0
+                    time.sleep(0.1)
+
+                yield base_url
+
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+
+def run_mode(mode: str, args: argparse.Namespace) -> ThroughputResult:
+    """Launch a server process in the given mode and measure its throughput."""
+    environment = {**MODE_ENVIRONMENTS[mode], "TRANSLATOR_THREADS": str(args.translator_threads)}
+
+    with launch_server(environment, workers=args.workers, timeout=args.timeout, root_path=args.root_path) as base_url:
+        asyncio.run(generate_load(base_url, args.batch_size, args.concurrency, args.warmup))
+        return asyncio.run(generate_load(base_url, args.batch_size, args.concurrency, args.duration))
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Compare the throughput of pinned and unpinned replicas")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=list(MODE_ENVIRONMENTS),
+        default=["unpinned", "pinned"],
+        help="Launch unpinned, pinned or both (default: unpinned pinned)",
+    )
+    parser.add_argument("--workers", type=int, default=2, help="WORKER_COUNT of the server (default: 2)")
+    parser.add_argument(
+        "--translator-threads",
+        type=int,
+        default=1,
+        help="TRANSLATOR_THREADS of the server (default: 1)",
+    )
+    parser.add_argument("--batch-size", type=int, default=8, help="Translations per batch request (default: 8)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Batch requests in flight (default: 8)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of measured load (default: 60)")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Seconds of unmeasured load (default: 10)")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="Seconds to wait for a launch to become ready (default: 600)",
+    )
+    parser.add_argument(
+        "--root-path",
+        type=str,
+        default="/api",
+        help="The SERVER_ROOT_PATH the server is launched with (default: /api)",
+    )
+
+    args = parser.parse_args()
+    results: dict[str, ThroughputResult] = {}
+
+    for mode in args.modes:
+        print(f"[{mode}] launching {args.workers} workers with {args.translator_threads} translator threads")
+        results[mode] = run_mode(mode, args)
+
+    print("\n" + "=" * 70)
+    print("THROUGHPUT")
+    print("=" * 70)
+    print(f"  {'Mode':<12} {'Translations/s':>15} {'P50 (ms)':>10} {'P95 (ms)':>10} {'Requests':>10}")
+    print("-" * 70)
+
+    for mode, result in results.items():
+        print(
+            f"  {mode:<12} {result.throughput:>15.2f} {statistics.median(result.latencies) * 1000:>10.1f} "
+            f"{percentile(result.latencies, 0.95) * 1000:>10.1f} {len(result.latencies):>10}"
+        )
+
+    if {"unpinned", "pinned"} <= results.keys():
+        change = results["pinned"].throughput / results["unpinned"].throughput - 1
+        print("-" * 70)
+        print(f"  Pinned throughput: {change:+.2%}")
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
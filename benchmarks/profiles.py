@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool to compare the latency/quality trade-off of decoding profiles.
+
+Every profile translates the same FLORES-200 samples through `POST /translator`.
+The bundled samples carry no reference translations, so chrF is computed against
+the output of the reference profile (default: `quality`).
+
+Usage:
+    uv run python benchmarks/profiles.py
+    uv run python benchmarks/profiles.py --profiles fast balanced quality --num-translations 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Sequence
+from typing import Any
+
+import httpx
+
+from benchmarks.benchmark import BenchmarkError, BenchmarkResult
+from benchmarks.flores_data import get_flores_samples
+from server.utils.chrf import chrf
+
+
+async def _profile_request(
+    client: httpx.AsyncClient,
+    base_url: str,
+    item: dict[str, Any],
+    profile: str,
+    semaphore: asyncio.Semaphore,
+) -> tuple[float, str]:
+    """Translate a single item with the given decoding profile."""
+    async with semaphore:
+        request_start = time.time()
+        response = await client.post(f"{base_url}/translator", json={**item, "profile": profile})
+        request_end = time.time()
+
+        if response.status_code != 200:
+            request_info = {"profile": profile, "source": item["source"], "target": item["target"]}
+            raise BenchmarkError(response.status_code, response.text[:500], request_info)
+
+        return request_end - request_start, response.json()["result"]
+
+
+async def benchmark_profile(
+    client: httpx.AsyncClient,
+    base_url: str,
+    test_data: Sequence[dict[str, Any]],
+    profile: str,
+    workers: int = 1,
+) -> tuple[BenchmarkResult, list[str]]:
+    """Benchmark a decoding profile and collect its translations."""
+    semaphore = asyncio.Semaphore(workers)
+    start_time = time.time()
+    results = await asyncio.gather(
+        *(_profile_request(client, base_url, item, profile, semaphore) for item in test_data)
+    )
+    total_time = time.time() - start_time
+
+    latencies = [latency for latency, _ in results]
+    translations = [translation for _, translation in results]
+
+    return BenchmarkResult(f"Profile '{profile}'", total_time, len(test_data), latencies), translations
+
+
+async def run_benchmark(
+    base_url: str,
+    profiles: list[str],
+    reference_profile: str,
+    num_translations: int,
+    warmup: int,
+    workers: int = 1,
+) -> None:
+    """Run the decoding profile benchmark."""
+    test_data = get_flores_samples(num_translations)
+    all_profiles = list(dict.fromkeys([*profiles, reference_profile]))
+
+    print("Benchmark Configuration:")
+    print(f"  Base URL: {base_url}")
+    print(f"  Profiles: {', '.join(profiles)}")
+    print(f"  Reference profile: {reference_profile}")
+    print(f"  Total translations: {num_translations}")
+    print(f"  Async workers: {workers}")
+    print()
+
+    async with httpx.AsyncClient(timeout=300.0) as client:
+        try:
+            if warmup > 0:
+                print(f"Warming up with {warmup} requests per profile...")
+                for profile in all_profiles:
+                    await benchmark_profile(client, base_url, test_data[:warmup], profile, workers=workers)
+                print("Warmup complete.\n")
+
+            runs: dict[str, tuple[BenchmarkResult, list[str]]] = {}
+            for profile in all_profiles:
+                print(f"Benchmarking profile '{profile}'...")
+                runs[profile] = await benchmark_profile(client, base_url, test_data, profile, workers=workers)
+
+        except BenchmarkError as e:
+            print(f"\n❌ BENCHMARK STOPPED - HTTP {e.status_code}: {e.error_detail}")
+            print(f"  Request: {e.request_info}")
+            sys.exit(1)
+
+    _, references = runs[reference_profile]
+
+    print("\n" + "=" * 85)
+    print(f"DECODING PROFILES (chrF against '{reference_profile}')")
+    print("=" * 85)
+    print(f"{'Profile':<15} {'Throughput':>12} {'Avg (ms)':>12} {'P50 (ms)':>12} {'P99 (ms)':>12} {'chrF':>10}")
+    print("-" * 85)
+
+    for profile in profiles:
+        result, translations = runs[profile]
+        score = statistics.mean(
+            chrf(translation, reference) for translation, reference in zip(translations, references, strict=True)
+        )
+        print(
+            f"{profile:<15} {result.throughput:>12.2f} {result.avg_latency:>12.2f} "
+            f"{result.p50_latency:>12.2f} {result.p99_latency:>12.2f} {score:>10.2f}"
+        )
+
+    print("=" * 85)
+
+
+def main() -> None:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the latency/chrF trade-off of decoding profiles")
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default="http://localhost:49494/api",
+        help="Base URL of the API (default: http://localhost:49494/api)",
+    )
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["fast", "balanced", "quality"],
+        help="Decoding profiles to benchmark (default: fast balanced quality)",
+    )
+    parser.add_argument(
+        "--reference-profile",
+        type=str,
+        default="quality",
+        help="Profile whose output is used as the chrF reference (default: quality)",
+    )
+    parser.add_argument(
+        "--num-translations",
+        type=int,
+        default=len(get_flores_samples()),
+        help="Number of FLORES samples to translate per profile (default: all bundled samples)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=5,
+        help="Number of warmup requests per profile (default: 5)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of async workers for concurrent requests (default: 1)",
+    )
+
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_benchmark(
+            base_url=args.base_url,
+            profiles=args.profiles,
+            reference_profile=args.reference_profile,
+            num_translations=args.num_translations,
+            warmup=args.warmup,
+            workers=args.workers,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,100 +1,148 @@
 #!/usr/bin/env python3
 """Download models to local cache and copy to models/ directory for Docker builds.
-Only downloads if models don't already exist locally."""
+Only downloads if models don't already exist locally.
+
+Files are downloaded in parallel, and interrupted downloads resume from their partial blobs.
+The exact snapshot, file sizes and checksums of every repository are recorded in the model
+manifest, which the server resolves models from on startup without scanning the cache."""
 
 import os
 import shutil
 import sys
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from huggingface_hub import hf_hub_download, snapshot_download
+from huggingface_hub import HfApi, hf_hub_download
+
+from server.utils.model_manifest import (
+    MANIFEST_NAME,
+    StaleSnapshotError,
+    describe_snapshot,
+    read_manifest,
+    verify_snapshot,
+    write_manifest,
+)
+
+# repositories and the files to download from them, None downloads every file
+DEFAULT_REPOSITORIES = {
+    "OpenNMT/nllb-200-3.3B-ct2-int8": None,
+    "facebook/fasttext-language-identification": ["model.bin"],
+}
+
+
+def parse_repository(argument: str) -> tuple[str, list[str] | None]:
+    """Parse a `REPOSITORY[:FILE,FILE]` argument."""
+    repository, _, files = argument.partition(":")
+    return repository, files.split(",") if files else None
+
+
+def is_downloaded(repository: str, cache_dir: Path) -> bool:
+    """Check if the manifest records the repository and its files still match."""
+    if (entry := read_manifest(cache_dir).get(repository)) is None:
+        return False
+
+    try:
+        verify_snapshot(repository, cache_dir / entry["snapshot"], entry["files"], checksums=False)
+
+    except StaleSnapshotError as e:
+        print(f"⚠️  {e}, downloading again")
+        return False
+
+    print(f"✅ Model {repository} already exists in cache at revision {entry['revision']}")
+    return True
+
+
+def download(repositories: dict[str, list[str] | None], cache_dir: Path, *, workers: int) -> dict[str, dict]:
+    """Download the files of every repository in parallel and describe the resulting snapshots."""
+    api = HfApi()
+    revisions = {repository: api.model_info(repository) for repository in repositories}
+    downloads = [
+        (repository, info.sha, file)
+        for repository, info in revisions.items()
+        for file in repositories[repository] or [sibling.rfilename for sibling in info.siblings]
+    ]
 
+    print(f"Downloading {len(downloads)} files from {len(repositories)} repositories with {workers} workers...")
 
-def check_model_exists(model_id: str, cache_dir: str) -> bool:
-    """Check if model already exists in cache."""
-    # Check both hub/ format and legacy format
-    model_cache_hub = os.path.join(cache_dir, "hub", f"models--{model_id.replace('/', '--')}")
-    model_cache_legacy = os.path.join(cache_dir, f"models--{model_id.replace('/', '--')}")
-    
-    if os.path.exists(model_cache_hub) or os.path.exists(model_cache_legacy):
-        print(f"✅ Model {model_id} already exists in cache")
-        return True
-    return False
+    with ThreadPoolExecutor(workers) as executor:
+        # files already in the cache are not downloaded again, partial blobs are resumed
+        paths = list(
+            executor.map(
+                lambda download: hf_hub_download(
+                    download[0], download[2], revision=download[1], cache_dir=str(cache_dir)
+                ),
+                downloads,
+            )
+        )
+
+    snapshots: dict[str, tuple[Path, str, list[str]]] = {}
+
+    for (repository, revision, file), path in zip(downloads, paths, strict=True):
+        snapshot = Path(path.removesuffix(file))
+        snapshots.setdefault(repository, (snapshot, revision, []))[2].append(file)
+
+    print("Recording file sizes and checksums in the manifest...")
+
+    return {
+        repository: describe_snapshot(cache_dir, snapshot, revision=revision, files=files)
+        for repository, (snapshot, revision, files) in snapshots.items()
+    }
+
+
+def copy_models(repositories: list[str], cache_dir: Path, models_dir: Path) -> None:
+    """Copy the snapshots recorded in the manifest and the manifest itself to the models/ directory."""
+    if models_dir.exists():
+        shutil.rmtree(models_dir)
+
+    models_dir.mkdir()
+    manifest = read_manifest(cache_dir)
+
+    for repository in repositories:
+        # the snapshot is stored at <cache>/[hub/]models--<name>/snapshots/<revision>, the repository directory
+        # is copied to the same place relative to models/ so the manifest paths stay valid in the image
+        repository_dir = Path(manifest[repository]["snapshot"]).parents[1]
+        print(f"Copying {repository} from {cache_dir / repository_dir}...")
+        shutil.copytree(cache_dir / repository_dir, models_dir / repository_dir)
+
+    shutil.copy(cache_dir / MANIFEST_NAME, models_dir / MANIFEST_NAME)
+    print(f"All models copied to {models_dir}/ directory")
 
 
 def main() -> None:
     """Download models and copy to models/ directory."""
-    cache_dir = os.path.expanduser("~/.cache/huggingface")
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repository",
+        action="append",
+        type=parse_repository,
+        help="a repository to download as REPOSITORY[:FILE,FILE], defaults to the translator and language detector",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="the number of files downloaded in parallel")
+    parser.add_argument("--update", action="store_true", help="download the latest revision of recorded models")
+    parser.add_argument("--no-copy", action="store_true", help="skip copying the models to the models/ directory")
+    args = parser.parse_args()
+
+    cache_dir = Path(os.path.expanduser("~/.cache/huggingface"))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    repositories = dict(args.repository) if args.repository else DEFAULT_REPOSITORIES
 
     print("Checking for existing models in cache...")
     try:
-        # Check and download translation model
-        translation_model_id = "OpenNMT/nllb-200-3.3B-ct2-int8"
-        if check_model_exists(translation_model_id, cache_dir):
-            print(f"⏭️  Translation model already exists, skipping download")
-        else:
-            print("Downloading translation model...")
-            translation_path = snapshot_download(translation_model_id, cache_dir=cache_dir)
-            print(f"✅ Translation model downloaded to: {translation_path}")
-
-        # Check and download language detection model
-        lang_model_id = "facebook/fasttext-language-identification"
-        if check_model_exists(lang_model_id, cache_dir):
-            print(f"⏭️  Language detection model already exists, skipping download")
-        else:
-            print("Downloading language detection model...")
-            lang_path = hf_hub_download(lang_model_id, "model.bin", cache_dir=cache_dir)
-            print(f"✅ Language detection model downloaded to: {lang_path}")
+        missing = {
+            repository: files
+            for repository, files in repositories.items()
+            if args.update or not is_downloaded(repository, cache_dir)
+        }
+
+        if missing:
+            write_manifest(cache_dir, download(missing, cache_dir, workers=args.workers))
 
         print(f"Models ready in cache: {cache_dir}")
 
-        # Copy only the specific models we need to models/ directory
-        print("Copying to models/ directory...")
-        
-        # Create models directory structure
-        models_dir = "models"
-        if os.path.exists(models_dir):
-            shutil.rmtree(models_dir)
-        os.makedirs(models_dir)
-        
-        # Copy only the specific model directories we need
-        # Translation model: OpenNMT/nllb-200-3.3B-ct2-int8
-        # Check both hub/ format and legacy format
-        translation_model_cache_hub = os.path.join(cache_dir, "hub", "models--OpenNMT--nllb-200-3.3B-ct2-int8")
-        translation_model_cache_legacy = os.path.join(cache_dir, "models--OpenNMT--nllb-200-3.3B-ct2-int8")
-        
-        if os.path.exists(translation_model_cache_hub):
-            print(f"Copying translation model from {translation_model_cache_hub}...")
-            os.makedirs(os.path.join(models_dir, "hub"), exist_ok=True)
-            shutil.copytree(translation_model_cache_hub, os.path.join(models_dir, "hub", "models--OpenNMT--nllb-200-3.3B-ct2-int8"))
-            print("Translation model copied successfully")
-        elif os.path.exists(translation_model_cache_legacy):
-            print(f"Copying translation model from {translation_model_cache_legacy}...")
-            shutil.copytree(translation_model_cache_legacy, os.path.join(models_dir, "models--OpenNMT--nllb-200-3.3B-ct2-int8"))
-            print("Translation model copied successfully")
-        else:
-            print(f"ERROR: Translation model not found at {translation_model_cache_hub} or {translation_model_cache_legacy}", file=sys.stderr)
-            sys.exit(1)
-        
-        # Language detection model: facebook/fasttext-language-identification
-        # Check both hub/ format and legacy format
-        lang_model_cache_hub = os.path.join(cache_dir, "hub", "models--facebook--fasttext-language-identification")
-        lang_model_cache_legacy = os.path.join(cache_dir, "models--facebook--fasttext-language-identification")
-        
-        if os.path.exists(lang_model_cache_hub):
-            print(f"Copying language detection model from {lang_model_cache_hub}...")
-            os.makedirs(os.path.join(models_dir, "hub"), exist_ok=True)
-            shutil.copytree(lang_model_cache_hub, os.path.join(models_dir, "hub", "models--facebook--fasttext-language-identification"))
-            print("Language detection model copied successfully")
-        elif os.path.exists(lang_model_cache_legacy):
-            print(f"Copying language detection model from {lang_model_cache_legacy}...")
-            shutil.copytree(lang_model_cache_legacy, os.path.join(models_dir, "models--facebook--fasttext-language-identification"))
-            print("Language detection model copied successfully")
-        else:
-            print(f"ERROR: Language detection model not found at {lang_model_cache_hub} or {lang_model_cache_legacy}", file=sys.stderr)
-            sys.exit(1)
-        
-        print("All models copied to models/ directory")
+        if not args.no_copy:
+            print("Copying to models/ directory...")
+            copy_models(list(repositories), cache_dir, Path("models"))
 
     except Exception as e:
         print(f"Error downloading models: {e}", file=sys.stderr)
@@ -105,4 +153,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
@@ -1,18 +1,51 @@
 import logging
+from typing import TYPE_CHECKING
 
-import uvicorn
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-from server.app import app
-from server.config import Config
+
+def __getattr__(name: str) -> "FastAPI":
+    """
+    Summary
+    -------
+    create the application on first access, so importing the package or its config stays cheap
+
+    Parameters
+    ----------
+    name (str)
+        the name of the attribute
+
+    Returns
+    -------
+    app (FastAPI)
+        the application instance
+    """
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from server.app import app  # noqa: PLC0415
+
+    # importing the submodule binds `server.app` to the module, so the instance takes its place
+    globals()["app"] = app
+    return app
 
 
 def main() -> None:
     """
     Summary
     -------
-    programmatically run the server with uvicorn
+    programmatically run the server with uvicorn, forking prefork workers when `worker_count` is above one
+    or when the translator runs in a separate inference process
     """
+    import uvicorn  # noqa: PLC0415
+
+    from server.config import Config  # noqa: PLC0415
+    from server.features.sizing import apply_sizing  # noqa: PLC0415
+
     config = Config()
+    # the application sizes its own config the same way and logs the plan
+    apply_sizing(config)
     
     # Create a custom log config that disables all uvicorn logging
     # This ensures only structured logging is used
@@ -58,11 +91,23 @@ def main() -> None:
     logging.getLogger("uvicorn.error").setLevel(logging.CRITICAL)
     logging.getLogger("uvicorn.access").setLevel(logging.CRITICAL)
     
+    if config.worker_count > 1 or config.inference_socket:
+        from server.prefork import run_prefork  # noqa: PLC0415
+
+        run_prefork(config, log_config=log_config)
+        return
+
+    from server.app import app  # noqa: PLC0415
+
+    if config.cpu_pinning:
+        from server.features.placement import pin, place_replicas  # noqa: PLC0415
+
+        pin(place_replicas(1)[0])
+
     uvicorn.run(
         app,
         host="0.0.0.0",
         port=config.server_port,
-        workers=config.worker_count,
         access_log=False,  # Disable uvicorn access logs - we use structured logging instead
         log_config=log_config,  # Use custom log config to suppress all uvicorn logs
     )
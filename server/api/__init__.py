@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 
-from server.api import health, language, translator
+from server.api import health, language, memory, translator
 
 monitoring = APIRouter()
 monitoring.include_router(health.router)
 
 api_router = APIRouter()
 api_router.include_router(language.router)
+api_router.include_router(memory.router)
 api_router.include_router(translator.router)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Response, status
+from fastapi import APIRouter, Request, Response, status
 
-from server.schemas import Health
+from server.features.drain import Drain
+from server.features.readiness import Component
+from server.schemas import ComponentReadiness, Health, Readiness
 from server.telemetry import get_metrics_reader
 
 router = APIRouter()
@@ -16,6 +18,38 @@ def health() -> Health:
     return Health()
 
 
+@router.get("/ready", tags=["Monitoring"], response_model=Readiness)
+def ready(request: Request, response: Response) -> Readiness:
+    """
+    Summary
+    -------
+    the `/ready` route reports the startup state of each model, responding with `503` until every model is ready
+    and again once the server is draining for a shutdown
+    """
+    components: dict[str, Component] = request.app.state.readiness
+    pending = [component for component in components.values() if component.state != "ready"]
+    drain: Drain = request.app.state.drain
+
+    if pending:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        response.headers["Retry-After"] = str(max(component.retry_after() for component in pending))
+
+    elif drain.draining:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return Readiness(
+        ready=not pending and not drain.draining,
+        components={
+            name: ComponentReadiness(
+                state=component.state,
+                progress=component.overall_progress(),
+                error=component.error,
+            )
+            for name, component in components.items()
+        },
+    )
+
+
 @router.get("/metrics", tags=["Monitoring"])
 def metrics() -> Response:
     """
@@ -2,10 +2,11 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
+from server.guards import requires_ready
 from server.schemas.v1 import LanguageResult
 from server.typedefs import get_app_state
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(requires_ready("language_detector"))])
 
 
 @router.get("/language", tags=["API"], response_model=LanguageResult)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Request
+
+from server.features.memory import get_memory_usage, get_proportional_memory, get_resident_memory, memory_footprint
+from server.guards import requires_secret
+from server.schemas.v1 import MemoryReport
+
+router = APIRouter()
+
+
+@router.get("/memory", dependencies=[Depends(requires_secret)], response_model=MemoryReport)
+def memory_report(request: Request) -> MemoryReport:
+    """
+    Summary
+    -------
+    report the memory usage of the process, broken down by component
+    """
+    # the budget is created once the translator starts loading
+    batch_budget = getattr(request.app.state, "batch_budget", None)
+
+    return MemoryReport(
+        usage=get_memory_usage(),
+        resident=get_resident_memory(),
+        proportional=get_proportional_memory(),
+        ceiling=batch_budget.ceiling if batch_budget else None,
+        max_batch_tokens=batch_budget.tokens if batch_budget else None,
+        model=memory_footprint.get("model", 0),
+        tokeniser=memory_footprint.get("tokeniser", 0),
+        language_detector=memory_footprint.get("language_detector", 0),
+        cache=memory_footprint.get("cache", 0),
+        transient_batch=batch_budget.last_transient if batch_budget else 0,
+        peak_transient_batch=batch_budget.peak_transient if batch_budget else 0,
+    )
@@ -1,13 +1,99 @@
+from collections.abc import AsyncIterator
 from typing import Annotated, get_args
 
-from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from sse_starlette.sse import EventSourceResponse
+from starlette.concurrency import run_in_threadpool
 
-from server.guards import requires_secret
-from server.schemas.v1 import Tokens, Translated, Translation, TranslationBatch, TranslationBatchItem, TranslatedBatch
+from server.config import MODEL_SIZE_PRESETS
+from server.features.hotswap import HotSwap
+from server.features.scheduler import schedule_as, translate_scheduled
+from server.features.shadow import ShadowTranslator
+from server.features.tenants import TenantBucket
+from server.features.translator import TranslatorProtocol
+from server.guards import get_tenant, requires_ready, requires_secret
+from server.schemas.v1 import (
+    Estimated,
+    ModelSwap,
+    ModelSwapStatus,
+    ShadowPair,
+    ShadowSummary,
+    Tokens,
+    Translated,
+    TranslatedBatch,
+    TranslatedFanout,
+    TranslationBatch,
+    TranslationBatchItem,
+    TranslationFanout,
+)
 from server.typedefs import Language, get_app_state
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(requires_ready("translator"))])
+
+
+def check_decoding_profile(request: Request, profile: str | None) -> None:
+    """
+    Summary
+    -------
+    reject requests that select a decoding profile that is not configured
+
+    Parameters
+    ----------
+    request (Request)
+        the FastAPI request
+
+    profile (str?)
+        the name of the requested decoding profile
+    """
+    decoding_profiles = request.app.state.config.decoding_profiles
+
+    if profile is not None and profile not in decoding_profiles:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"unknown decoding profile '{profile}', expected one of {sorted(decoding_profiles)}",
+        )
+
+
+def get_priority_class(
+    request: Request,
+    x_priority: Annotated[
+        str | None,
+        Header(description="the priority class of the request, e.g. `interactive` or `bulk`"),
+    ] = None,
+    authorization: Annotated[str, Header()] = "",
+) -> str | None:
+    """
+    Summary
+    -------
+    resolve the priority class of the request, a class mapped from the auth token overrides the `X-Priority` header
+
+    Parameters
+    ----------
+    request (Request)
+        the FastAPI request
+
+    x_priority (str?)
+        the X-Priority header value
+
+    authorization (str)
+        the Authorization header value
+
+    Returns
+    -------
+    priority_class (str?)
+        the priority class, or None for the default class
+    """
+    config = request.app.state.config
+    priority_classes = config.scheduler_priority_classes
+    priority_class = config.scheduler_token_priority_classes.get(authorization, x_priority)
+
+    if priority_class is not None and priority_class not in priority_classes:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"unknown priority class '{priority_class}', expected one of {sorted(priority_classes)}",
+        )
+
+    return priority_class
 
 
 @router.delete("/translator", dependencies=[Depends(requires_secret)], status_code=status.HTTP_204_NO_CONTENT)
@@ -42,6 +128,127 @@ def load_model(
     return Response(status_code=status.HTTP_304_NOT_MODIFIED)
 
 
+def get_hot_swap(request: Request) -> HotSwap:
+    """
+    Summary
+    -------
+    get the hot swap of the translator model, which is unavailable for the cascade and a separate inference process
+
+    Parameters
+    ----------
+    request (Request)
+        the FastAPI request
+
+    Returns
+    -------
+    hot_swap (HotSwap)
+        the hot swap of the translator model
+    """
+    if (hot_swap := getattr(request.app.state, "hot_swap", None)) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="the translator model cannot be swapped")
+
+    return hot_swap
+
+
+def get_swap_status(hot_swap: HotSwap) -> ModelSwapStatus:
+    """
+    Summary
+    -------
+    get the status of the last model swap
+
+    Parameters
+    ----------
+    hot_swap (HotSwap)
+        the hot swap of the translator model
+
+    Returns
+    -------
+    status (ModelSwapStatus)
+        the status of the last model swap
+    """
+    return ModelSwapStatus(
+        state=hot_swap.state,
+        repository=hot_swap.repository,
+        compute_type=hot_swap.compute_type,
+        required_memory=hot_swap.headroom.required if hot_swap.headroom else None,
+        available_memory=hot_swap.headroom.available if hot_swap.headroom else None,
+        error=hot_swap.error,
+    )
+
+
+@router.get("/translator/swap", dependencies=[Depends(requires_secret)], response_model=ModelSwapStatus)
+def swap_status(request: Request) -> ModelSwapStatus:
+    """
+    Summary
+    -------
+    report the current model and the progress of the last model swap
+    """
+    return get_swap_status(get_hot_swap(request))
+
+
+@router.post(
+    "/translator/swap",
+    dependencies=[Depends(requires_secret)],
+    response_model=ModelSwapStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def swap_model(data: ModelSwap, request: Request) -> ModelSwapStatus:
+    """
+    Summary
+    -------
+    swap the translator model for another repository or compute type without dropping requests
+
+    The new model is loaded and warmed up beside the current one, new requests switch to it
+    once it is ready, and the current model is released when its requests in flight have finished.
+    The swap is refused with `409` when the new model is not expected to fit in the available memory.
+    """
+    hot_swap = get_hot_swap(request)
+
+    if hot_swap.running:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="a model swap is already in progress")
+
+    repository = data.repository or (MODEL_SIZE_PRESETS[data.model_size] if data.model_size else hot_swap.repository)
+    headroom = hot_swap.start(repository, data.compute_type or hot_swap.compute_type, force=data.force)
+
+    if not headroom.sufficient and not data.force:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"the new model needs an estimated {headroom.required} bytes, "
+                f"but only {headroom.available} bytes are available, set `force` to swap anyway"
+            ),
+        )
+
+    return get_swap_status(hot_swap)
+
+
+@router.get("/translator/shadow", dependencies=[Depends(requires_secret)], response_model=ShadowSummary)
+def shadow_summary(request: Request) -> ShadowSummary:
+    """
+    Summary
+    -------
+    compare the shadow configuration with the primary one, per language pair
+
+    The chrF of each shadow translation is scored against the primary translation it mirrors,
+    so `100` means the shadow configuration translated the pair exactly like the primary one.
+    """
+    shadow: ShadowTranslator | None = getattr(request.app.state, "shadow", None)
+
+    if shadow is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="shadow traffic is not enabled")
+
+    comparison = shadow.comparison
+    pairs = [ShadowPair(**pair._asdict()) for pair in comparison.summarise()]
+
+    return ShadowSummary(
+        percentage=shadow.percentage,
+        mirrored=comparison.mirrored,
+        dropped=comparison.dropped,
+        failed=comparison.failed,
+        pairs=pairs,
+    )
+
+
 @router.get("/translator/tokens", tags=["API"], response_model=Tokens)
 def token_count(
     text: Annotated[str, Query(min_length=1, description="source text of a single language")],
@@ -55,8 +262,36 @@ def token_count(
     return Tokens(length=state.translator.count_tokens(text))
 
 
+@router.post("/translator/estimate", tags=["API"], response_model=Estimated, status_code=status.HTTP_200_OK)
+def translator_estimate(
+    data: TranslationBatchItem,
+    request: Request,
+    priority_class: str | None = Depends(get_priority_class),
+    tenant: TenantBucket | None = Depends(get_tenant),
+    state=Depends(get_app_state),
+) -> Estimated:
+    """
+    Summary
+    -------
+    predict the decode time and queue wait of a `POST /translator` request without submitting it
+
+    The decode time is fitted online from the observed decode times of previous requests
+    with the same language pair and decoding profile.
+    """
+    check_decoding_profile(request, data.profile)
+
+    if state.scheduler is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="the scheduler is disabled")
+
+    with schedule_as(priority_class, tenant):
+        tokens, cost, queue_wait = state.scheduler.estimate(data.text, data.source, data.target, profile=data.profile)
+
+    return Estimated(tokens=tokens, cost=cost, queue_wait=queue_wait)
+
+
 @router.get("/translator", tags=["API"], response_model=Translated)
-def translator_get(
+async def translator_get(
+    request: Request,
     text: Annotated[
         str,
         Query(
@@ -89,6 +324,12 @@ def translator_get(
             examples=[0.8],
         ),
     ] = 0.8,
+    profile: Annotated[
+        str | None,
+        Query(description="the name of the decoding profile, e.g. `fast`, `balanced` or `quality`"),
+    ] = None,
+    priority_class: str | None = Depends(get_priority_class),
+    tenant: TenantBucket | None = Depends(get_tenant),
     state=Depends(get_app_state),
 ) -> Translated:
     """
@@ -106,13 +347,28 @@ def translator_get(
         Defaults to 0.8 (80%). Used to prevent early stopping in NLLB models.
         See: https://huggingface.co/facebook/nllb-200-distilled-600M/discussions/6
     """
-    return Translated(result=state.translator.translate(text, source, target, min_length_percentage))
+    check_decoding_profile(request, profile)
+
+    with schedule_as(priority_class, tenant):
+        translated_text = await translate_scheduled(
+            state.translator,
+            "translate",
+            text,
+            source,
+            target,
+            min_length_percentage,
+            profile=profile,
+        )
+
+    return Translated(result=translated_text)
 
 
 @router.post("/translator/batch", tags=["API"], response_model=TranslatedBatch, status_code=status.HTTP_200_OK)
-def translator_batch(
+async def translator_batch(
     data: TranslationBatch,
     request: Request,
+    priority_class: str | None = Depends(get_priority_class),
+    tenant: TenantBucket | None = Depends(get_tenant),
     state=Depends(get_app_state),
 ) -> TranslatedBatch:
     """
@@ -161,22 +417,182 @@ def translator_batch(
         },
     )
     
-    texts = [item.text for item in data.translations]
-    source_languages = [item.source for item in data.translations]
-    target_languages = [item.target for item in data.translations]
-    # Extract min_length_percentage for each item (each defaults to 0.8)
-    min_length_percentages = [item.min_length_percentage for item in data.translations]
+    # Decoding options apply to a whole CTranslate2 call, so items are grouped by their decoding profile
+    profile_groups: dict[str | None, list[int]] = {}
+    for index, item in enumerate(data.translations):
+        profile_groups.setdefault(item.profile or data.profile, []).append(index)
+
+    for profile in profile_groups:
+        check_decoding_profile(request, profile)
+
+    # a batch split into several groups is admitted against the tenant quota as a whole by the first group,
+    # so a batch over quota is rejected before any of its groups is queued
+    admissions: list[int | None] = [None] * len(profile_groups)
 
-    translated_texts = state.translator.translate_batch(texts, source_languages, target_languages, min_length_percentages)
+    if tenant is not None and len(profile_groups) > 1:
+        admissions = [0] * len(profile_groups)
+        admissions[0] = await run_in_threadpool(
+            sum, (state.translator.count_tokens(item.text) for item in data.translations)
+        )
+
+    translated_texts = [""] * batch_size
+    for (profile, indices), admission in zip(profile_groups.items(), admissions, strict=True):
+        items = [data.translations[index] for index in indices]
+        texts = [item.text for item in items]
+        source_languages = [item.source for item in items]
+        target_languages = [item.target for item in items]
+        # Extract min_length_percentage for each item (each defaults to 0.8)
+        min_length_percentages = [item.min_length_percentage for item in items]
+
+        with schedule_as(priority_class, tenant, admission=admission):
+            group_texts = await translate_scheduled(
+                state.translator,
+                "translate_batch",
+                texts,
+                source_languages,
+                target_languages,
+                min_length_percentages,
+                profile=profile,
+            )
+
+        for index, translated_text in zip(indices, group_texts, strict=True):
+            translated_texts[index] = translated_text
 
     return TranslatedBatch(
         results=[{"result": text} for text in translated_texts],
     )
 
 
+@router.post("/translator/fanout", tags=["API"], response_model=TranslatedFanout, status_code=status.HTTP_200_OK)
+async def translator_fanout(
+    data: TranslationFanout,
+    request: Request,
+    priority_class: str | None = Depends(get_priority_class),
+    tenant: TenantBucket | None = Depends(get_tenant),
+    state=Depends(get_app_state),
+) -> TranslatedFanout:
+    """
+    Summary
+    -------
+    translate a single text into many target languages
+
+    The source text is tokenised once and all targets are decoded in a single batch,
+    which is considerably cheaper than sending one batch item per target language.
+    """
+    check_decoding_profile(request, data.profile)
+    targets = list(dict.fromkeys(data.targets))
+
+    with schedule_as(priority_class, tenant):
+        translated_texts = await translate_scheduled(
+            state.translator,
+            "translate_fanout",
+            data.text,
+            data.source,
+            targets,
+            data.min_length_percentage,
+            profile=data.profile,
+        )
+
+    return TranslatedFanout(results=dict(zip(targets, translated_texts, strict=True)))
+
+
+async def stream_fanout(
+    translator: TranslatorProtocol,
+    data: TranslationFanout,
+    targets: list[Language],
+    *,
+    chunk_size: int,
+    priority_class: str | None,
+    tenant: TenantBucket | None,
+) -> AsyncIterator[dict[str, str]]:
+    """
+    Summary
+    -------
+    decode the targets of a fan-out in chunks, yielding one Server-Sent Event per target language
+
+    Each chunk is a whole batched decode that may first wait in the scheduler queue,
+    so it waits for its slot on the event loop and is decoded in a worker thread.
+
+    Parameters
+    ----------
+    translator (TranslatorProtocol)
+        the translator
+
+    data (TranslationFanout)
+        the fan-out request
+
+    targets (list[Language])
+        the de-duplicated target languages
+
+    chunk_size (int)
+        the number of target languages decoded at once
+
+    priority_class (str?)
+        the priority class of the request
+
+    tenant (TenantBucket?)
+        the tenant of the request
+
+    Returns
+    -------
+    events (AsyncIterator[dict[str, str]])
+        the event of each target language, named after it
+    """
+    for index in range(0, len(targets), chunk_size):
+        chunk = targets[index : index + chunk_size]
+
+        with schedule_as(priority_class, tenant):
+            translated_texts = await translate_scheduled(
+                translator,
+                "translate_fanout",
+                data.text,
+                data.source,
+                chunk,
+                data.min_length_percentage,
+                profile=data.profile,
+            )
+
+        for target, translated_text in zip(chunk, translated_texts, strict=True):
+            yield {"event": target, "data": translated_text}
+
+
+@router.post("/translator/fanout/stream", tags=["API"])
+def translator_fanout_stream(
+    data: TranslationFanout,
+    request: Request,
+    priority_class: str | None = Depends(get_priority_class),
+    tenant: TenantBucket | None = Depends(get_tenant),
+    state=Depends(get_app_state),
+) -> EventSourceResponse:
+    """
+    Summary
+    -------
+    the `/translator/fanout/stream` route returns a Server-Sent Event stream with one event per target language
+
+    Targets are decoded in batches of `FANOUT_STREAM_CHUNK_SIZE`, so the first languages
+    arrive before the whole fan-out has been decoded. Each event is named after its target language.
+    """
+    check_decoding_profile(request, data.profile)
+    targets = list(dict.fromkeys(data.targets))
+
+    return EventSourceResponse(
+        stream_fanout(
+            state.translator,
+            data,
+            targets,
+            chunk_size=request.app.state.config.fanout_stream_chunk_size,
+            priority_class=priority_class,
+            tenant=tenant,
+        )
+    )
+
+
 @router.post("/translator", tags=["API"], response_model=Translated, status_code=status.HTTP_200_OK)
-def translator_post(
+async def translator_post(
     data: TranslationBatchItem,
+    request: Request,
+    priority_class: str | None = Depends(get_priority_class),
+    tenant: TenantBucket | None = Depends(get_tenant),
     state=Depends(get_app_state),
 ) -> Translated:
     """
@@ -197,7 +613,20 @@ def translator_post(
     Translated
         translated text result
     """
-    return Translated(result=state.translator.translate(data.text, data.source, data.target, data.min_length_percentage))
+    check_decoding_profile(request, data.profile)
+
+    with schedule_as(priority_class, tenant):
+        translated_text = await translate_scheduled(
+            state.translator,
+            "translate",
+            data.text,
+            data.source,
+            data.target,
+            data.min_length_percentage,
+            profile=data.profile,
+        )
+
+    return Translated(result=translated_text)
 
 
 @router.get("/translator/stream", tags=["API"])
@@ -234,7 +663,13 @@ def translator_stream(
             examples=[0.8],
         ),
     ] = 0.8,
+    profile: Annotated[
+        str | None,
+        Query(description="the name of the decoding profile, e.g. `fast`, `balanced` or `quality`"),
+    ] = None,
     event_type: Annotated[str | None, Query(description="the event that an event listener will listen for")] = None,
+    priority_class: str | None = Depends(get_priority_class),
+    tenant: TenantBucket | None = Depends(get_tenant),
     state=Depends(get_app_state),
 ) -> EventSourceResponse:
     """
@@ -249,8 +684,14 @@ def translator_stream(
         Defaults to 0.8 (80%). Used to prevent early stopping in NLLB models.
         See: https://huggingface.co/facebook/nllb-200-distilled-600M/discussions/6
     """
+    check_decoding_profile(request, profile)
+
+    # the stream is created before the response, so quota errors are returned as a status code
+    with schedule_as(priority_class, tenant):
+        chunks = state.translator.translate_stream(text, source, target, min_length_percentage, profile=profile)
+
     async def generate():
-        for chunk in state.translator.translate_stream(text, source, target, min_length_percentage):
+        for chunk in chunks:
             yield {"event": event_type, "data": chunk} if event_type else {"data": chunk}
 
     return EventSourceResponse(generate())
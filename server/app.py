@@ -1,5 +1,7 @@
-from contextlib import asynccontextmanager
+from asyncio import CancelledError, create_task, gather
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from logging import getLogger
+from math import ceil
 from os import environ
 from pathlib import Path
 from random import choice
@@ -8,16 +10,19 @@ from string import ascii_letters, digits
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 
 from server.api import api_router, monitoring
 from server.config import Config
-from server.lifespans import load_language_detector, load_translator_model
+from server.features.drain import Drain, drain_on_shutdown
+from server.features.idle import ModelReloadingError
+from server.features.readiness import Component
+from server.features.sizing import apply_sizing
+from server.features.startup import get_process_age, log_startup_profile, record_startup_phase
+from server.features.tenants import QuotaExceededError, get_tenant_buckets
+from server.lifespans import load_inference_client, load_language_detector, load_translator_model
 from server.logging_config import setup_structlog, get_logger
+from server.middleware.drain import DrainMiddleware
 from server.middleware.structured_logging import StructuredLoggingMiddleware
-from server.plugins.consul import consul_register
-from server.plugins.swagger_ui import setup_swagger_ui
-from server.telemetry import get_log_handler, setup_telemetry
 
 
 def exception_handler(request: Request, exc: Exception) -> JSONResponse:
@@ -68,6 +73,58 @@ def exception_handler(request: Request, exc: Exception) -> JSONResponse:
     )
 
 
+def quota_exceeded_handler(_: Request, exc: QuotaExceededError) -> JSONResponse:
+    """
+    Summary
+    -------
+    the handler for requests that exceed the input token quota of their tenant
+
+    Parameters
+    ----------
+    request (Request)
+        the request
+
+    exc (QuotaExceededError)
+        the exception
+
+    Returns
+    -------
+    response (JSONResponse)
+        the error response with a `Retry-After` header
+    """
+    return JSONResponse(
+        content={"detail": str(exc)},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(ceil(exc.retry_after))},
+    )
+
+
+def model_reloading_handler(_: Request, exc: ModelReloadingError) -> JSONResponse:
+    """
+    Summary
+    -------
+    the handler for requests that arrive while the idle translator model is reloading
+
+    Parameters
+    ----------
+    request (Request)
+        the request
+
+    exc (ModelReloadingError)
+        the exception
+
+    Returns
+    -------
+    response (JSONResponse)
+        the error response with a `Retry-After` header
+    """
+    return JSONResponse(
+        content={"detail": str(exc)},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(max(1, ceil(exc.retry_after)))},
+    )
+
+
 def extract_cors_values(string: str) -> list[str]:
     """
     Summary
@@ -87,12 +144,56 @@ def extract_cors_values(string: str) -> list[str]:
     return [stripped_chunk for chunk in string.split(",") if (stripped_chunk := chunk.strip())]
 
 
+async def load_models(app: FastAPI, models: AsyncExitStack) -> None:
+    """
+    Summary
+    -------
+    load the models concurrently in the background, keeping their lifespans open on the given stack
+
+    Parameters
+    ----------
+    app (FastAPI)
+        the FastAPI application instance
+
+    models (AsyncExitStack)
+        the stack that closes the model lifespans on shutdown
+    """
+    config: Config = app.state.config
+    readiness: dict[str, Component] = app.state.readiness
+    lifespans = {
+        # front-ends of an inference process forward translations to it instead of loading the model
+        "translator": load_inference_client(config.inference_socket, scheduler_enabled=config.scheduler_enabled)
+        if config.inference_socket
+        else load_translator_model(config),
+    }
+
+    if config.language_detector_enabled:
+        lifespans["language_detector"] = load_language_detector(
+            config.language_detector_repository,
+            stub=config.stub_language_detector,
+            warmup_rounds=config.warmup_rounds,
+        )
+
+    # the models share no state, so their downloads, loads and warm-ups run side by side in worker threads
+    results = await gather(
+        *(models.enter_async_context(lifespan(app)) for lifespan in lifespans.values()),
+        return_exceptions=True,
+    )
+
+    # the server keeps running so `/ready` can report the failure
+    for name, result in zip(lifespans, results, strict=True):
+        if isinstance(result, Exception):
+            readiness[name].fail(result)
+
+    log_startup_profile()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Summary
     -------
-    lifespan context manager for FastAPI
+    lifespan context manager for FastAPI, the server starts listening while the models load in the background
 
     Parameters
     ----------
@@ -105,20 +206,14 @@ async def lifespan(app: FastAPI):
 
     logger.info("Starting application", app_id=app_id, app_name=config.app_name)
 
-    # Load models
-    async with load_language_detector(
-        config.language_detector_repository,
-        stub=config.stub_language_detector,
-    )(app):
-        async with load_translator_model(
-            config.get_translator_repository(),
-            translator_threads=config.translator_threads,
-            stub=config.stub_translator,
-            testing=config.testing,
-            use_cuda=config.use_cuda,
-        )(app):
-            # Register with Consul if configured
+    async with AsyncExitStack() as models:
+        loading = create_task(load_models(app, models))
+
+        try:
+            # Register with Consul if configured, the Consul check only passes once `/ready` does
             if config.consul_http_addr and config.consul_service_address:
+                from server.plugins.consul import consul_register  # noqa: PLC0415
+
                 logger.info("Registering with Consul", consul_addr=config.consul_http_addr)
                 async with consul_register(
                     app,
@@ -130,13 +225,25 @@ async def lifespan(app: FastAPI):
                     consul_service_scheme=config.consul_service_scheme,
                     server_root_path=config.server_root_path,
                     consul_auth_token=config.consul_auth_token,
-                ):
+                ) as deregister:
+                    if config.drain_timeout:
+                        drain_on_shutdown(app.state.drain, deadline=config.drain_timeout, deregister=deregister)
+
                     logger.info("Application started successfully", app_id=app_id)
                     yield
             else:
+                if config.drain_timeout:
+                    drain_on_shutdown(app.state.drain, deadline=config.drain_timeout)
+
                 logger.info("Application started successfully", app_id=app_id)
                 yield
-    
+
+        finally:
+            loading.cancel()
+
+            with suppress(CancelledError):
+                await loading
+
     logger.info("Shutting down application", app_id=app_id)
 
 
@@ -146,6 +253,8 @@ def create_app(config: Config | None = None) -> FastAPI:
     -------
     create the FastAPI application
     """
+    # everything before the application is created is interpreter start-up and module imports
+    record_startup_phase("imports", get_process_age())
     config = config or Config()
     ascii_letters_with_digits = f"{ascii_letters}{digits}"
     app_name = config.app_name
@@ -160,6 +269,9 @@ def create_app(config: Config | None = None) -> FastAPI:
     logger = get_logger(app_name)
     std_logger = getLogger(app_name)  # Keep for OpenTelemetry integration
 
+    if (sizing := apply_sizing(config)) is not None:
+        logger.info("Sizing plan", **sizing._asdict())
+
     # Create FastAPI app
     fastapi_app = FastAPI(
         title=app_name,
@@ -177,12 +289,22 @@ def create_app(config: Config | None = None) -> FastAPI:
     # Store config and app_id in app state
     fastapi_app.state.config = config
     fastapi_app.state.app_id = app_id
+    fastapi_app.state.tenants = get_tenant_buckets(config.tenants)
+    fastapi_app.state.readiness = {"translator": Component("translator")}
+    fastapi_app.state.drain = Drain()
+
+    if config.language_detector_enabled:
+        fastapi_app.state.readiness["language_detector"] = Component("language_detector")
 
-    # Set up OpenTelemetry
+    # Set up OpenTelemetry, the SDK, exporters and instrumentation are only imported when enabled
     if config.otel_enabled:
+        from server.telemetry import setup_telemetry  # noqa: PLC0415
+
         # Set up logging handler if OTLP endpoint is configured
         # Note: OpenTelemetry handlers will still work but won't produce console output
         if config.otel_exporter_otlp_endpoint:
+            from server.telemetry.log_handler import get_log_handler  # noqa: PLC0415
+
             handler = get_log_handler(otlp_service_name=app_name, otlp_service_instance_id=app_id)
             std_logger.addHandler(handler)
             # uvicorn.access logs will go to OTLP but not console
@@ -198,6 +320,11 @@ def create_app(config: Config | None = None) -> FastAPI:
     
     # Add structured logging middleware
     fastapi_app.add_middleware(StructuredLoggingMiddleware)
+    # probes and metric scrapes keep arriving while draining, so they would hold the drain open until its deadline
+    fastapi_app.add_middleware(
+        DrainMiddleware,
+        untracked_paths=frozenset(f"{config.server_root_path}{path}" for path in ("/health", "/ready", "/metrics")),
+    )
 
     # Configure CORS
     allow_methods_dict: dict[str, bool] = {
@@ -223,6 +350,8 @@ def create_app(config: Config | None = None) -> FastAPI:
 
     # Add exception handler
     fastapi_app.add_exception_handler(Exception, exception_handler)
+    fastapi_app.add_exception_handler(QuotaExceededError, quota_exceeded_handler)
+    fastapi_app.add_exception_handler(ModelReloadingError, model_reloading_handler)
 
     # Include routers
     fastapi_app.include_router(monitoring, prefix=config.server_root_path)
@@ -232,6 +361,10 @@ def create_app(config: Config | None = None) -> FastAPI:
     home_dir = Path(environ.get("HOME", str(Path.home())))
     swagger_ui_assets_path = home_dir / "swagger-ui-assets"
     if swagger_ui_assets_path.exists():
+        from fastapi.staticfiles import StaticFiles  # noqa: PLC0415
+
+        from server.plugins.swagger_ui import setup_swagger_ui  # noqa: PLC0415
+
         fastapi_app.mount(
             f"{config.server_root_path}/swagger-ui-assets",
             StaticFiles(directory=str(swagger_ui_assets_path)),
@@ -1,7 +1,11 @@
+from typing import Literal, Self
 from uuid import uuid4
 
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings
 
+from server.typedefs.language import Language
+
 
 # Model size presets mapping to OpenNMT repositories
 MODEL_SIZE_PRESETS = {
@@ -11,6 +15,68 @@ MODEL_SIZE_PRESETS = {
 }
 
 
+class DecodingProfile(BaseModel):
+    """
+    Summary
+    -------
+    a named set of CTranslate2 decoding options
+
+    Attributes
+    ----------
+    beam_size (int)
+        the beam size, `1` selects greedy decoding
+
+    length_penalty (float)
+        the exponential length penalty applied during beam search
+
+    repetition_penalty (float)
+        the penalty applied to the score of previously generated tokens
+
+    no_repeat_ngram_size (int)
+        the size of n-grams that may not be repeated, `0` disables the blocking
+    """
+
+    beam_size: int = Field(default=1, ge=1)
+    length_penalty: float = 1.0
+    repetition_penalty: float = Field(default=1.0, gt=0.0)
+    no_repeat_ngram_size: int = Field(default=0, ge=0)
+
+
+# Decoding profile presets, selectable per request via the `profile` field
+DECODING_PROFILE_PRESETS = {
+    "fast": DecodingProfile(beam_size=1, no_repeat_ngram_size=3),
+    "balanced": DecodingProfile(beam_size=2, no_repeat_ngram_size=3),
+    "quality": DecodingProfile(beam_size=4, length_penalty=1.2, no_repeat_ngram_size=3),
+}
+
+
+class Tenant(BaseModel):
+    """
+    Summary
+    -------
+    an API key with its own input token quota and fair-share weight
+
+    Attributes
+    ----------
+    api_key (str)
+        the API key sent in the `Authorization` header
+
+    tokens_per_second (float)
+        the rate at which the quota refills, in input tokens per second
+
+    burst (float?)
+        the size of the quota, defaults to one second of `tokens_per_second`
+
+    weight (float)
+        the fair-share weight of the tenant when competing for translator slots
+    """
+
+    api_key: str
+    tokens_per_second: float = Field(gt=0.0)
+    burst: float | None = Field(default=None, gt=0.0)
+    weight: float = Field(default=1.0, gt=0.0)
+
+
 class Config(BaseSettings):
     """
     Summary
@@ -28,8 +94,20 @@ class Config(BaseSettings):
     server_root_path (str)
         the root path for the server
 
+    auto_sizing (bool)
+        whether to derive the worker, thread and batch sizes from the cgroup limits, explicit settings take precedence
+
     worker_count (int)
-        the number of workers to use
+        the number of workers to use, workers above one are forked from a master that preloads the models
+
+    inference_socket (str?)
+        the Unix socket of a separate inference process that owns the translator, the workers forward translations to it
+
+    drain_timeout (float)
+        the seconds requests in flight are given to finish after a shutdown signal, `0` shuts down immediately
+
+    swap_drain_timeout (float)
+        the seconds requests in flight on the old model are given to finish during a model swap
 
     auth_token (str)
         the auth token to use for the server
@@ -40,15 +118,121 @@ class Config(BaseSettings):
     translator_threads (int)
         the number of threads for the translator
 
+    translator_intra_threads (int)
+        the number of threads each translator thread computes a batch with, `0` uses the CTranslate2 default
+
+    compute_type (str)
+        the CTranslate2 compute type of the translator, `auto` picks the fastest type the device supports
+        and `calibrate` times every type the CPU supports on startup
+
+    calibration_cache (str)
+        the JSON file the calibrated compute types are cached in, keyed by CPU model and model
+
+    model_prefetch (str)
+        how the model files are brought into the page cache on load, `off`, `readahead` or `read` them sequentially
+
+    model_lock (bool)
+        whether to lock the loaded model and tokeniser into RAM, requires CAP_IPC_LOCK or a large RLIMIT_MEMLOCK
+
+    cpu_pinning (bool)
+        whether to pin every process that loads a translator to a core set within one NUMA node
+
     stub_translator (bool)
         whether to use a stub for the translator
 
     use_cuda (bool)
         whether to use CUDA for inference
 
+    decoding_profiles (dict[str, DecodingProfile])
+        the named decoding profiles that requests can select from
+
+    default_decoding_profile (str)
+        the decoding profile used when a request does not select one, must be one of `decoding_profiles`
+
+    cascade_repository (str?)
+        the repository of the large model, enables the small-to-large cascade when set
+
+    cascade_confidence_threshold (float)
+        the confidence below which the cascade re-translates an item with the large model
+
+    fanout_stream_chunk_size (int)
+        the number of target languages decoded together before their fan-out stream events are sent
+
+    scheduler_enabled (bool)
+        whether to order requests shortest-expected-job-first instead of serving them as they arrive
+
+    scheduler_aging (float)
+        the seconds of predicted cost forgiven for every second a request waits, prevents starvation
+
+    scheduler_seconds_per_token (float)
+        the prior decode time per input token, used until the cost model has enough observations
+
+    scheduler_short_slots (int)
+        the number of translator slots reserved for short inputs, `0` disables the partitioning
+
+    scheduler_short_token_threshold (int)
+        the number of input tokens under which a request is routed to the short pool
+
+    scheduler_priority_classes (dict[str, float])
+        the priority classes and their cost multipliers, lower multipliers are more urgent
+
+    scheduler_default_priority_class (str)
+        the priority class of requests that do not select one
+
+    scheduler_strict_priority (bool)
+        whether a priority class only runs once no more urgent class is waiting
+
+    scheduler_token_priority_classes (dict[str, str])
+        the priority class assigned to each auth token, overrides the `X-Priority` header
+
+    scheduler_preemption_batch_size (int)
+        the number of items after which preemptible batches yield their slot
+
+    tenants (dict[str, Tenant])
+        the tenants keyed by name, translation routes require a tenant API key when set, requires `scheduler_enabled`
+
+    memory_ceiling (int?)
+        the memory usage in bytes that batches adapt to stay under, enables the adaptive batch token budget
+
+    batch_min_tokens (int)
+        the smallest number of tokens the adaptive budget lets CTranslate2 decode at once
+
+    batch_max_tokens (int)
+        the largest number of tokens the adaptive budget lets CTranslate2 decode at once
+
+    warmup_rounds (int)
+        the number of times the startup warm-up translations and detections are repeated, `0` disables the warm-up
+
+    warmup_language_pairs (list[tuple[Language, Language]])
+        the source and target languages translated between during the startup warm-up
+
+    idle_timeout (float)
+        the seconds without requests after which the translator model is unloaded, `0` keeps it loaded
+
+    idle_hold_timeout (float)
+        the seconds a request waits for an unloaded model to reload before it is answered with `503`
+
+    shadow_percentage (float)
+        the percentage of requests mirrored to the shadow configuration, `0` disables the mirroring
+
+    shadow_repository (str?)
+        the repository of the shadow model, defaults to the translator repository
+
+    shadow_compute_type (str?)
+        the compute type of the shadow model, defaults to the translator compute type
+
+    shadow_profile (str?)
+        the decoding profile of the shadow translations, defaults to the profile of each request
+
+    shadow_capacity (int)
+        the number of shadow translations run at once, further sampled requests are not mirrored
+
     language_detector_repository (str)
         the repository to download the language detector from
 
+    language_detector_enabled (bool)
+        whether to load the language detector, disable when only translation is needed
+
     stub_language_detector (bool)
         whether to use a stub for the language detector
 
@@ -113,17 +297,64 @@ class Config(BaseSettings):
     app_name: str = "nllb-api"
     server_port: int = 49494
     server_root_path: str = "/api"
+    auto_sizing: bool = True
     worker_count: int = 1
+    inference_socket: str | None = None
+    drain_timeout: float = Field(default=20.0, ge=0.0)
+    swap_drain_timeout: float = Field(default=300.0, gt=0.0)
     auth_token: str = str(uuid4())
 
     model_size: str | None = None  # Can be set to "small", "medium", or "large" via MODEL_SIZE env var
     translator_repository: str | None = None  # Can be explicitly set via TRANSLATOR_REPOSITORY env var (overrides MODEL_SIZE)
     translator_threads: int = 1
+    translator_intra_threads: int = 0
+    compute_type: str = "auto"
+    calibration_cache: str = "~/.cache/nllb-api/compute-types.json"
+    model_prefetch: Literal["off", "readahead", "read"] = "off"
+    model_lock: bool = False
+    cpu_pinning: bool = False
     stub_translator: bool = False
     testing: bool = False
     use_cuda: bool = False
+    decoding_profiles: dict[str, DecodingProfile] = Field(default_factory=DECODING_PROFILE_PRESETS.copy)
+    default_decoding_profile: str = "fast"
+    cascade_repository: str | None = None
+    cascade_confidence_threshold: float = 0.5
+    fanout_stream_chunk_size: int = 8
+    scheduler_enabled: bool = True
+    scheduler_aging: float = 1.0
+    scheduler_seconds_per_token: float = 0.01
+    scheduler_short_slots: int = 0
+    scheduler_short_token_threshold: int = 64
+    scheduler_priority_classes: dict[str, float] = Field(default_factory=lambda: {"interactive": 1.0, "bulk": 4.0})
+    scheduler_default_priority_class: str = "interactive"
+    scheduler_strict_priority: bool = False
+    scheduler_token_priority_classes: dict[str, str] = Field(default_factory=dict)
+    scheduler_preemption_batch_size: int = 8
+    tenants: dict[str, Tenant] = Field(default_factory=dict)
+    memory_ceiling: int | None = None
+    batch_min_tokens: int = 256
+    batch_max_tokens: int = 8192
+    warmup_rounds: int = Field(default=1, ge=0)
+    warmup_language_pairs: list[tuple[Language, Language]] = Field(
+        default_factory=lambda: [
+            ("eng_Latn", "spa_Latn"),
+            ("eng_Latn", "fra_Latn"),
+            ("eng_Latn", "deu_Latn"),
+            ("eng_Latn", "zho_Hans"),
+            ("spa_Latn", "eng_Latn"),
+        ]
+    )
+    idle_timeout: float = Field(default=0.0, ge=0.0)
+    idle_hold_timeout: float = Field(default=5.0, ge=0.0)
+    shadow_percentage: float = Field(default=0.0, ge=0.0, le=100.0)
+    shadow_repository: str | None = None
+    shadow_compute_type: str | None = None
+    shadow_profile: str | None = None
+    shadow_capacity: int = Field(default=1, ge=1)
 
     language_detector_repository: str = "facebook/fasttext-language-identification"
+    language_detector_enabled: bool = True
     stub_language_detector: bool = False
 
     access_control_allow_origin: str = "*"
@@ -150,6 +381,43 @@ class Config(BaseSettings):
     consul_service_port: int = 443
     consul_service_scheme: str = "https"
 
+    @model_validator(mode="after")
+    def check_default_decoding_profile(self) -> Self:
+        """
+        Summary
+        -------
+        reject a default decoding profile that is not configured, instead of failing on the first request
+
+        Returns
+        -------
+        config (Config)
+            the validated config
+        """
+        if self.default_decoding_profile not in self.decoding_profiles:
+            raise ValueError(
+                f"the default decoding profile {self.default_decoding_profile!r} "
+                f"is not one of the decoding profiles {sorted(self.decoding_profiles)}"
+            )
+
+        return self
+
+    @model_validator(mode="after")
+    def check_tenants(self) -> Self:
+        """
+        Summary
+        -------
+        reject tenants without the scheduler, which is where their quotas are charged
+
+        Returns
+        -------
+        config (Config)
+            the validated config
+        """
+        if self.tenants and not self.scheduler_enabled:
+            raise ValueError("tenant quotas are charged by the scheduler, `tenants` requires `scheduler_enabled`")
+
+        return self
+
     def get_translator_repository(self) -> str:
         """
         Get the translator repository, resolving MODEL_SIZE if TRANSLATOR_REPOSITORY is not explicitly set.
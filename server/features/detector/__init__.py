@@ -1,2 +1,3 @@
 from server.features.detector.ensemble import get_language_detector as get_language_detector
+from server.features.detector.ensemble import load_language_detector_model as load_language_detector_model
 from server.features.detector.protocol import LanguageDetectorProtocol as LanguageDetectorProtocol
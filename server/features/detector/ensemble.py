@@ -1,12 +1,43 @@
+from functools import cache
+
 from fasttext_pybind import fasttext
 
 from language import LanguageDetector
 from server.features.detector.protocol import LanguageDetectorProtocol
 from server.features.detector.stub import LanguageDetectorStub
+from server.features.memory import measure_footprint
+from server.features.readiness import Component
+from server.features.startup import measure_startup
 from server.utils import huggingface_file_download
 
 
-def get_language_detector(repository: str, *, stub: bool) -> LanguageDetectorProtocol:
+@cache
+def load_language_detector_model(model_path: str) -> LanguageDetector:
+    """
+    Summary
+    -------
+    load the language detector from a fastText model file, once per process so
+    a prefork master can load it before its workers inherit it
+
+    Parameters
+    ----------
+    model_path (str)
+        the path to the fastText model
+
+    Returns
+    -------
+    language_detector (LanguageDetector)
+        the language detector
+    """
+    with measure_startup("fasttext_load"):
+        fast_model = fasttext()
+        fast_model.loadModel(model_path)
+
+    with measure_startup("lingua_build"):
+        return LanguageDetector(fast_model)
+
+
+def get_language_detector(repository: str, *, stub: bool, component: Component) -> LanguageDetectorProtocol:
     """
     Summary
     -------
@@ -20,6 +51,9 @@ def get_language_detector(repository: str, *, stub: bool) -> LanguageDetectorPro
     stub (bool)
         whether to return a stub object
 
+    component (Component)
+        the readiness component that reports the download and loading progress
+
     Returns
     -------
     language_detector (LanguageDetectorProtocol)
@@ -28,7 +62,13 @@ def get_language_detector(repository: str, *, stub: bool) -> LanguageDetectorPro
     if stub:
         return LanguageDetectorStub()
 
-    fast_model = fasttext()
-    fast_model.loadModel(huggingface_file_download(repository, "model.bin"))
+    component.advance("downloading")
+
+    with measure_startup("language_detector_resolve"):
+        model_path = huggingface_file_download(repository, "model.bin")
+
+    component.advance("loading")
 
-    return LanguageDetector(fast_model)
+    # the download is left out of the measurement, so it does not hold up the translator's
+    with measure_footprint("language_detector"):
+        return load_language_detector_model(model_path)
@@ -0,0 +1,2 @@
+from server.features.drain.drain import Drain as Drain
+from server.features.drain.shutdown import drain_on_shutdown as drain_on_shutdown
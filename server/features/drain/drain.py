@@ -0,0 +1,74 @@
+from asyncio import Event, timeout
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+
+
+class Drain:
+    """
+    Summary
+    -------
+    tracks the requests in flight, so a shutdown can wait for them after new work is turned away
+
+    Attributes
+    ----------
+    draining (bool)
+        whether new translation work is rejected
+
+    in_flight (int)
+        the number of requests being handled
+
+    rejected (int)
+        the number of requests rejected while draining
+    """
+
+    __slots__ = ("draining", "idle", "in_flight", "rejected")
+
+    def __init__(self) -> None:
+        self.draining = False
+        self.in_flight = 0
+        self.rejected = 0
+        self.idle = Event()
+        self.idle.set()
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """
+        Summary
+        -------
+        mark a request as in flight until the context exits
+        """
+        self.in_flight += 1
+        self.idle.clear()
+
+        try:
+            yield
+
+        finally:
+            self.in_flight -= 1
+
+            if not self.in_flight:
+                self.idle.set()
+
+    async def drain(self, deadline: float) -> int:
+        """
+        Summary
+        -------
+        reject new translation work and wait for the requests in flight to finish
+
+        Parameters
+        ----------
+        deadline (float)
+            the seconds to wait for the requests in flight
+
+        Returns
+        -------
+        in_flight (int)
+            the number of requests still in flight at the deadline
+        """
+        self.draining = True
+
+        with suppress(TimeoutError):
+            async with timeout(deadline):
+                await self.idle.wait()
+
+        return self.in_flight
@@ -0,0 +1,139 @@
+from asyncio import Task, get_running_loop
+from collections.abc import Awaitable, Callable
+from signal import SIG_DFL, SIGINT, SIGTERM, getsignal, raise_signal, signal
+from threading import current_thread, main_thread
+from time import perf_counter
+
+from server.features.drain.drain import Drain
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+type SignalHandler = Callable[[int, object], object] | int | None
+
+
+def forward_signal(signum: int, handler: SignalHandler) -> None:
+    """
+    Summary
+    -------
+    restore the handler a signal had before draining was set up, and deliver the signal to it
+
+    Parameters
+    ----------
+    signum (int)
+        the signal number
+
+    handler (SignalHandler)
+        the previous handler of the signal, e.g. the one uvicorn shuts the server down with
+    """
+    get_running_loop().remove_signal_handler(signum)
+    signal(signum, SIG_DFL if handler is None else handler)
+
+    if callable(handler):
+        handler(signum, None)
+
+    else:
+        raise_signal(signum)
+
+
+async def shut_down(
+    drain: Drain,
+    signum: int,
+    handler: SignalHandler,
+    *,
+    deadline: float,
+    deregister: Callable[[], Awaitable[None]] | None,
+) -> None:
+    """
+    Summary
+    -------
+    deregister from service discovery, drain the requests in flight and then let the server shut down
+
+    Parameters
+    ----------
+    drain (Drain)
+        the requests in flight
+
+    signum (int)
+        the shutdown signal received
+
+    handler (SignalHandler)
+        the previous handler of the signal
+
+    deadline (float)
+        the seconds to wait for the requests in flight
+
+    deregister (Callable[[], Awaitable[None]]?)
+        deregister the service from Consul, None when it is not registered
+    """
+    start = perf_counter()
+    logger.info("Shutdown signal received, draining", signal=signum, in_flight=drain.in_flight, deadline=deadline)
+
+    # new traffic stops being routed here before it stops being accepted
+    if deregister is not None:
+        try:
+            await deregister()
+
+        except Exception:
+            logger.exception("Consul deregistration failed")
+
+    dropped = await drain.drain(deadline)
+
+    logger.info(
+        "Drain finished",
+        duration_seconds=perf_counter() - start,
+        dropped=dropped,
+        rejected=drain.rejected,
+    )
+
+    forward_signal(signum, handler)
+
+
+def drain_on_shutdown(
+    drain: Drain,
+    *,
+    deadline: float,
+    deregister: Callable[[], Awaitable[None]] | None = None,
+) -> None:
+    """
+    Summary
+    -------
+    intercept the shutdown signals, so the server drains before it stops listening and unloads the models
+
+    A second signal skips the rest of the drain.
+
+    Parameters
+    ----------
+    drain (Drain)
+        the requests in flight
+
+    deadline (float)
+        the seconds to wait for the requests in flight
+
+    deregister (Callable[[], Awaitable[None]]?)
+        deregister the service from Consul, None when it is not registered
+    """
+    # signal handlers can only be set from the main thread, a test client runs the lifespan on another one
+    if current_thread() is not main_thread():
+        return
+
+    loop = get_running_loop()
+    shutting_down: list[Task[None]] = []
+
+    def on_signal(signum: int, handler: SignalHandler) -> None:
+        if shutting_down:
+            shutting_down[0].cancel()
+            logger.warning(
+                "Shutdown signal received again, skipping the drain",
+                signal=signum,
+                in_flight=drain.in_flight,
+            )
+            forward_signal(signum, handler)
+            return
+
+        shutting_down.append(
+            loop.create_task(shut_down(drain, signum, handler, deadline=deadline, deregister=deregister))
+        )
+
+    for signum in (SIGTERM, SIGINT):
+        loop.add_signal_handler(signum, on_signal, signum, getsignal(signum))
@@ -0,0 +1,4 @@
+from server.features.hotswap.swap import Headroom as Headroom
+from server.features.hotswap.swap import HotSwap as HotSwap
+from server.features.hotswap.swap import check_headroom as check_headroom
+from server.features.hotswap.translator import SwappableTranslator as SwappableTranslator
@@ -0,0 +1,225 @@
+from asyncio import Task, create_task, to_thread
+from collections.abc import Callable
+from typing import Literal, NamedTuple
+
+from server.features.hotswap.translator import SwappableTranslator
+from server.features.memory import get_available_memory, memory_footprint
+from server.features.readiness import Component
+from server.features.sizing import MODEL_MEMORY, get_model_size
+from server.features.translator import TranslatorProtocol
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# the weights of the preset models are int8, wider compute types widen them in memory
+COMPUTE_TYPE_MEMORY_FACTORS = {"float32": 4.0, "float16": 2.0, "bfloat16": 2.0, "int16": 2.0}
+
+type SwapState = Literal["idle", "loading", "warming", "draining", "swapped", "failed"]
+
+
+class Headroom(NamedTuple):
+    """
+    Summary
+    -------
+    the memory check made before a model is loaded beside the current one
+
+    Attributes
+    ----------
+    required (int)
+        the estimated memory of the new model in bytes
+
+    available (int)
+        the memory that can still be allocated in bytes
+
+    sufficient (bool)
+        whether the new model fits in the available memory
+    """
+
+    required: int
+    available: int
+    sufficient: bool
+
+
+def check_headroom(repository: str, compute_type: str) -> Headroom:
+    """
+    Summary
+    -------
+    check whether a model fits in the memory left beside the current one
+
+    Parameters
+    ----------
+    repository (str)
+        the repository of the new model
+
+    compute_type (str)
+        the compute type the new model is loaded with
+
+    Returns
+    -------
+    headroom (Headroom)
+        the estimated and available memory
+    """
+    model_memory = MODEL_MEMORY[get_model_size(repository)]
+    required = int(model_memory * COMPUTE_TYPE_MEMORY_FACTORS.get(compute_type, 1.0))
+    available = get_available_memory()
+
+    return Headroom(required, available, required <= available)
+
+
+class HotSwap:
+    """
+    Summary
+    -------
+    replaces the model of a swappable translator without restarting, one swap at a time
+
+    The new model is loaded and warmed up beside the current one. New requests then switch to it,
+    and the old model is released once the requests in flight on it have finished. If they do not
+    finish within `drain_timeout` seconds, the swap fails and new requests switch back to the old model.
+
+    Attributes
+    ----------
+    repository (str)
+        the repository of the current model
+
+    compute_type (str)
+        the compute type of the current model
+
+    drain_timeout (float)
+        the seconds the requests in flight on the old model are given to finish
+
+    state (SwapState)
+        the progress of the last swap
+
+    headroom (Headroom?)
+        the memory check of the last swap
+
+    error (str?)
+        the reason the last swap failed
+    """
+
+    __slots__ = (
+        "build",
+        "compute_type",
+        "drain_timeout",
+        "error",
+        "headroom",
+        "repository",
+        "state",
+        "task",
+        "translator",
+        "warm_up",
+    )
+
+    def __init__(
+        self,
+        translator: SwappableTranslator,
+        *,
+        repository: str,
+        compute_type: str,
+        drain_timeout: float,
+        build: Callable[[str, str, Component], TranslatorProtocol],
+        warm_up: Callable[[TranslatorProtocol], None],
+    ) -> None:
+        self.translator = translator
+        self.repository = repository
+        self.compute_type = compute_type
+        self.drain_timeout = drain_timeout
+        self.build = build
+        self.warm_up = warm_up
+        self.state: SwapState = "idle"
+        self.headroom: Headroom | None = None
+        self.error: str | None = None
+        self.task: Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def start(self, repository: str, compute_type: str, *, force: bool) -> Headroom:
+        """
+        Summary
+        -------
+        check the memory headroom and start swapping in a new model in the background
+
+        Parameters
+        ----------
+        repository (str)
+            the repository of the new model
+
+        compute_type (str)
+            the compute type the new model is loaded with
+
+        force (bool)
+            whether to start the swap even when the new model does not fit
+
+        Returns
+        -------
+        headroom (Headroom)
+            the memory check, the swap is only started when the new model fits unless forced
+        """
+        headroom = self.headroom = check_headroom(repository, compute_type)
+
+        logger.info(
+            "Model swap requested",
+            repository=repository,
+            compute_type=compute_type,
+            required_bytes=headroom.required,
+            available_bytes=headroom.available,
+        )
+
+        if headroom.sufficient or force:
+            self.task = create_task(self.swap(repository, compute_type))
+
+        return headroom
+
+    async def swap(self, repository: str, compute_type: str) -> None:
+        """
+        Summary
+        -------
+        load and warm up the new model, switch new requests to it and release the old model
+
+        Parameters
+        ----------
+        repository (str)
+            the repository of the new model
+
+        compute_type (str)
+            the compute type the new model is loaded with
+        """
+        self.error = None
+        # the footprint of the new model replaces the footprint of the old one once it is released
+        footprint = {component: memory_footprint.get(component, 0) for component in ("model", "tokeniser")}
+
+        try:
+            self.state = "loading"
+            translator = await to_thread(self.build, repository, compute_type, Component("translator"))
+
+            self.state = "warming"
+            await to_thread(self.warm_up, translator)
+
+            self.state = "draining"
+            translator.__enter__()
+            # on a timeout, requests may still run on the new model, so it is left to be freed with them
+            previous = await to_thread(self.translator.swap, translator, timeout=self.drain_timeout)
+            previous.__exit__(None, None, None)
+
+        except Exception as exception:
+            self.state = "failed"
+            self.error = str(exception)
+            logger.exception("Model swap failed", repository=repository, compute_type=compute_type)
+            return
+
+        for component, previous_footprint in footprint.items():
+            memory_footprint[component] = memory_footprint.get(component, 0) - previous_footprint
+
+        logger.info(
+            "Model swapped",
+            previous_repository=self.repository,
+            previous_compute_type=self.compute_type,
+            repository=repository,
+            compute_type=compute_type,
+        )
+
+        self.state = "swapped"
+        self.repository = repository
+        self.compute_type = compute_type
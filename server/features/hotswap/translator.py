@@ -0,0 +1,404 @@
+from collections import Counter
+from collections.abc import Callable, Iterator
+from threading import Condition
+from typing import Self
+
+from server.features.translator import TranslatorProtocol
+from server.typedefs import Language
+
+
+class SwappableTranslator(TranslatorProtocol):
+    """
+    Summary
+    -------
+    a translator whose model can be replaced while it serves requests
+
+    Every request runs on the translator that was current when it started, so requests
+    in flight during a swap finish on the old translator while new requests use the new one.
+
+    Methods
+    -------
+    swap(translator: TranslatorProtocol, timeout: float) -> TranslatorProtocol
+        switch new requests to another translator and wait for the requests in flight on the old one
+
+    translate(text: str, source_language: Language, target_language: Language) -> str
+        translate the input with the current translator
+
+    translate_batch(texts: list[str], source_languages: list[Language], target_languages: list[Language]) -> list[str]
+        translate multiple inputs with the current translator
+
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages with the current translator
+
+    translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
+        streams the translation with the current translator
+
+    unload_model(to_cpu: bool) -> bool
+        unload the model of the current translator
+
+    load_model(keep_cache: bool) -> bool
+        load the model of the current translator back
+
+    count_tokens(text: str) -> int
+        count the number of tokens in the input text
+    """
+
+    __slots__ = ("condition", "generation", "in_flight", "translator")
+
+    def __init__(self, translator: TranslatorProtocol) -> None:
+        self.translator = translator
+        self.generation = 0
+        self.in_flight: Counter[int] = Counter()
+        self.condition = Condition()
+
+    def __enter__(self) -> Self:
+        self.translator.__enter__()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.translator.__exit__(*args)
+
+    def swap(self, translator: TranslatorProtocol, *, timeout: float) -> TranslatorProtocol:
+        """
+        Summary
+        -------
+        switch new requests to another translator and wait for the requests in flight on the old one
+
+        Parameters
+        ----------
+        translator (TranslatorProtocol)
+            the loaded translator to switch to
+
+        timeout (float)
+            the seconds the requests in flight on the old translator are given to finish
+
+        Returns
+        -------
+        translator (TranslatorProtocol)
+            the old translator, no longer used by any request
+
+        Raises
+        ------
+        TimeoutError
+            when the requests in flight on the old translator do not finish in time,
+            new requests are then switched back to the old translator
+        """
+        with self.condition:
+            previous, previous_generation = self.translator, self.generation
+            self.translator = translator
+            self.generation += 1
+
+            if not self.condition.wait_for(lambda: not self.in_flight[previous_generation], timeout):
+                # the old translator is still in use, so it serves again under a new generation
+                self.translator = previous
+                self.generation += 1
+                raise TimeoutError(f"requests in flight on the old translator did not finish within {timeout}s")
+
+            del self.in_flight[previous_generation]
+
+        return previous
+
+    def acquire(self) -> tuple[int, TranslatorProtocol]:
+        """
+        Summary
+        -------
+        mark a request as in flight on the current translator
+
+        Returns
+        -------
+        generation (int)
+            the generation of the current translator
+
+        translator (TranslatorProtocol)
+            the current translator
+        """
+        with self.condition:
+            self.in_flight[self.generation] += 1
+            return self.generation, self.translator
+
+    def release(self, generation: int) -> None:
+        """
+        Summary
+        -------
+        mark a request on a translator generation as finished
+
+        Parameters
+        ----------
+        generation (int)
+            the generation the request ran on
+        """
+        with self.condition:
+            self.in_flight[generation] -= 1
+            self.condition.notify_all()
+
+    def run[T](self, translate: Callable[[TranslatorProtocol], T]) -> T:
+        """
+        Summary
+        -------
+        run a translation on the current translator
+
+        Parameters
+        ----------
+        translate (Callable[[TranslatorProtocol], T])
+            the translation to run on the translator
+
+        Returns
+        -------
+        result (T)
+            the result of the translation
+        """
+        generation, translator = self.acquire()
+
+        try:
+            return translate(translator)
+
+        finally:
+            self.release(generation)
+
+    def unload_model(self, *, to_cpu: bool) -> bool:
+        """
+        Summary
+        -------
+        unload the model of the current translator
+
+        Parameters
+        ----------
+        to_cpu (bool)
+            whether to unload the model to CPU
+
+        Returns
+        -------
+        success (bool)
+            whether the model unload was executed
+        """
+        return self.translator.unload_model(to_cpu=to_cpu)
+
+    def load_model(self, *, keep_cache: bool) -> bool:
+        """
+        Summary
+        -------
+        load the model of the current translator back to the initial device
+
+        Parameters
+        ----------
+        keep_cache (bool)
+            whether to keep the model cache in RAM
+
+        Returns
+        -------
+        success (bool)
+            whether the model load was executed
+        """
+        return self.translator.load_model(keep_cache=keep_cache)
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Summary
+        -------
+        count the number of tokens in the input text
+
+        Parameters
+        ----------
+        text (str)
+            the input text
+
+        Returns
+        -------
+        token_count (int)
+            the number of tokens that will be sent to the translator
+        """
+        return self.translator.count_tokens(text)
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
+        """
+        Summary
+        -------
+        translate the input with the current translator
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (str)
+            the translated text
+        """
+        return self.run(
+            lambda translator: translator.translate(
+                text,
+                source_language,
+                target_language,
+                min_length_percentage,
+                profile=profile,
+            )
+        )
+
+    def translate_batch(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate multiple inputs with the current translator
+
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile applied to the whole batch
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        return self.run(
+            lambda translator: translator.translate_batch(
+                texts,
+                source_languages,
+                target_languages,
+                min_length_percentages,
+                profile=profile,
+            )
+        )
+
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages with the current translator
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        return self.run(
+            lambda translator: translator.translate_fanout(
+                text,
+                source_language,
+                target_languages,
+                min_length_percentage,
+                profile=profile,
+            )
+        )
+
+    def translate_stream(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Summary
+        -------
+        streams the translation with the translator that is current when the stream starts,
+        which is kept until the stream is exhausted or closed
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (Iterator[str])
+            the translated text
+        """
+
+        # the translator is acquired on the first chunk, so a stream that is never iterated holds no translator
+        def stream() -> Iterator[str]:
+            generation, translator = self.acquire()
+
+            try:
+                yield from translator.translate_stream(
+                    text,
+                    source_language,
+                    target_language,
+                    min_length_percentage,
+                    profile=profile,
+                )
+
+            finally:
+                self.release(generation)
+
+        return stream()
@@ -0,0 +1,3 @@
+from server.features.idle.monitor import offload_when_idle as offload_when_idle
+from server.features.idle.translator import IdleTranslator as IdleTranslator
+from server.features.idle.translator import ModelReloadingError as ModelReloadingError
@@ -0,0 +1,22 @@
+from asyncio import sleep, to_thread
+
+from server.features.idle.translator import IdleTranslator
+
+
+async def offload_when_idle(translator: IdleTranslator) -> None:
+    """
+    Summary
+    -------
+    periodically unload the model of the translator once it has been idle for its idle timeout
+
+    Parameters
+    ----------
+    translator (IdleTranslator)
+        the translator to watch
+    """
+    # checking ten times per timeout keeps the model resident at most 10% longer than configured
+    interval = max(1.0, translator.idle_timeout / 10)
+
+    while True:
+        await sleep(interval)
+        await to_thread(translator.offload_if_idle)
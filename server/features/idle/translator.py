@@ -0,0 +1,495 @@
+from collections.abc import Callable, Iterator
+from threading import Event, Lock, Thread
+from time import monotonic, perf_counter
+from typing import Self
+
+from opentelemetry import metrics
+
+from server.features.translator import TranslatorProtocol
+from server.logging_config import get_logger
+from server.typedefs import Language
+
+logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+# the Retry-After of requests that arrive before the first reload was timed
+DEFAULT_RELOAD_SECONDS = 10.0
+
+idle_transition_histogram = meter.create_histogram(
+    name="nllb_api_idle_transition_duration",
+    description="Time taken to offload an idle model or to reload it for the next request",
+    unit="s",
+)
+idle_rejected_counter = meter.create_counter(
+    name="nllb_api_idle_rejected",
+    description="Number of requests answered with 503 because the model was still reloading",
+    unit="1",
+)
+
+
+class ModelReloadingError(Exception):
+    """
+    Summary
+    -------
+    raised when a request arrives while the idle model is reloading and cannot be held until it is loaded
+
+    Attributes
+    ----------
+    retry_after (float)
+        the number of seconds until the model is expected to be loaded
+    """
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"the model is reloading after being idle, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class IdleTranslator(TranslatorProtocol):
+    """
+    Summary
+    -------
+    a translator that unloads its model once no request has used it for a while and reloads it on the next request
+
+    The request that finds the model unloaded starts the reload. Requests wait up to `hold_timeout`
+    seconds for the model, and are rejected with `ModelReloadingError` if it is still not loaded.
+
+    Methods
+    -------
+    offload_if_idle() -> bool
+        unload the model if no request has used it for `idle_timeout` seconds
+
+    translate(text: str, source_language: Language, target_language: Language) -> str
+        translate the input once the model is loaded
+
+    translate_batch(texts: list[str], source_languages: list[Language], target_languages: list[Language]) -> list[str]
+        translate multiple inputs once the model is loaded
+
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages once the model is loaded
+
+    translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
+        streams the translation once the model is loaded
+
+    unload_model(to_cpu: bool) -> bool
+        unload the model from the current device
+
+    load_model(keep_cache: bool) -> bool
+        load the model back to the initial device
+
+    count_tokens(text: str) -> int
+        count the number of tokens in the input text
+    """
+
+    __slots__ = (
+        "hold_timeout",
+        "idle_timeout",
+        "in_flight",
+        "last_used",
+        "loaded",
+        "lock",
+        "reload_seconds",
+        "reloaded",
+        "translator",
+    )
+
+    def __init__(self, translator: TranslatorProtocol, *, idle_timeout: float, hold_timeout: float) -> None:
+        self.translator = translator
+        self.idle_timeout = idle_timeout
+        self.hold_timeout = hold_timeout
+        self.in_flight = 0
+        self.last_used = monotonic()
+        self.loaded = True
+        self.reload_seconds = DEFAULT_RELOAD_SECONDS
+        self.reloaded: Event | None = None
+        self.lock = Lock()
+
+    def __enter__(self) -> Self:
+        self.translator.__enter__()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.translator.__exit__(*args)
+
+    def offload_if_idle(self) -> bool:
+        """
+        Summary
+        -------
+        unload the model if no request has used it for `idle_timeout` seconds
+
+        Returns
+        -------
+        success (bool)
+            whether the model was unloaded
+        """
+        # requests wait on the lock while the model is unloaded, so none can start on a model being unloaded
+        with self.lock:
+            if not self.loaded or self.in_flight or monotonic() - self.last_used < self.idle_timeout:
+                return False
+
+            start = perf_counter()
+            self.translator.unload_model(to_cpu=False)
+            self.loaded = False
+            duration = perf_counter() - start
+
+        idle_transition_histogram.record(duration, {"transition": "offload"})
+        logger.info("Idle model offloaded", idle_timeout=self.idle_timeout, duration_seconds=duration)
+
+        return True
+
+    def reload(self, reloaded: Event) -> None:
+        """
+        Summary
+        -------
+        reload the model and wake up the requests waiting for it
+
+        Parameters
+        ----------
+        reloaded (Event)
+            the event the waiting requests wait on
+        """
+        start = perf_counter()
+
+        try:
+            self.translator.load_model(keep_cache=False)
+
+        except Exception:
+            logger.exception("Idle model reload failed")
+
+        else:
+            duration = perf_counter() - start
+            idle_transition_histogram.record(duration, {"transition": "reload"})
+            logger.info("Idle model reloaded", duration_seconds=duration)
+
+            with self.lock:
+                self.loaded = True
+                self.reload_seconds = duration
+
+        finally:
+            with self.lock:
+                self.reloaded = None
+
+            reloaded.set()
+
+    def acquire(self) -> None:
+        """
+        Summary
+        -------
+        mark a request as in flight, reloading the model first if it was offloaded
+
+        Raises
+        ------
+        ModelReloadingError
+            when the model is not loaded within `hold_timeout` seconds
+        """
+        with self.lock:
+            self.in_flight += 1
+            self.last_used = monotonic()
+
+            if self.loaded:
+                return
+
+            if (reloaded := self.reloaded) is None:
+                reloaded = self.reloaded = Event()
+                Thread(target=self.reload, args=(reloaded,), name="idle-reload", daemon=True).start()
+
+            started = monotonic()
+
+        if reloaded.wait(self.hold_timeout) and self.loaded:
+            return
+
+        self.release()
+        idle_rejected_counter.add(1)
+
+        raise ModelReloadingError(max(0.0, self.reload_seconds - (monotonic() - started)))
+
+    def release(self) -> None:
+        """
+        Summary
+        -------
+        mark a request as finished
+        """
+        with self.lock:
+            self.in_flight -= 1
+            self.last_used = monotonic()
+
+    def run[T](self, translate: Callable[[], T]) -> T:
+        """
+        Summary
+        -------
+        run a translation once the model is loaded
+
+        Parameters
+        ----------
+        translate (Callable[[], T])
+            the translation to run
+
+        Returns
+        -------
+        result (T)
+            the result of the translation
+        """
+        self.acquire()
+
+        try:
+            return translate()
+
+        finally:
+            self.release()
+
+    def unload_model(self, *, to_cpu: bool) -> bool:
+        """
+        Summary
+        -------
+        unload the model from the current device, the next request reloads it
+
+        Parameters
+        ----------
+        to_cpu (bool)
+            whether to unload the model to CPU
+
+        Returns
+        -------
+        success (bool)
+            whether the model unload was executed
+        """
+        with self.lock:
+            if unloaded := self.translator.unload_model(to_cpu=to_cpu):
+                self.loaded = False
+
+        return unloaded
+
+    def load_model(self, *, keep_cache: bool) -> bool:
+        """
+        Summary
+        -------
+        load the model back to the initial device
+
+        Parameters
+        ----------
+        keep_cache (bool)
+            whether to keep the model cache in RAM
+
+        Returns
+        -------
+        success (bool)
+            whether the model load was executed
+        """
+        with self.lock:
+            if loaded := self.translator.load_model(keep_cache=keep_cache):
+                self.loaded = True
+
+        return loaded
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Summary
+        -------
+        count the number of tokens in the input text
+
+        Parameters
+        ----------
+        text (str)
+            the input text
+
+        Returns
+        -------
+        token_count (int)
+            the number of tokens that will be sent to the translator
+        """
+        return self.translator.count_tokens(text)
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
+        """
+        Summary
+        -------
+        translate the input once the model is loaded
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (str)
+            the translated text
+        """
+        return self.run(
+            lambda: self.translator.translate(
+                text,
+                source_language,
+                target_language,
+                min_length_percentage,
+                profile=profile,
+            )
+        )
+
+    def translate_batch(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate multiple inputs once the model is loaded
+
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile applied to the whole batch
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        return self.run(
+            lambda: self.translator.translate_batch(
+                texts,
+                source_languages,
+                target_languages,
+                min_length_percentages,
+                profile=profile,
+            )
+        )
+
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages once the model is loaded
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        return self.run(
+            lambda: self.translator.translate_fanout(
+                text,
+                source_language,
+                target_languages,
+                min_length_percentage,
+                profile=profile,
+            )
+        )
+
+    def translate_stream(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Summary
+        -------
+        streams the translation once the model is loaded, the model stays loaded until the stream is exhausted
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (Iterator[str])
+            the translated text
+        """
+        # the model is checked before the stream is returned, so a reload in progress is reported as a status code
+        self.acquire()
+        self.release()
+
+        # the request is only in flight once the stream starts, so a stream that is never iterated holds no model
+        def stream() -> Iterator[str]:
+            self.acquire()
+
+            try:
+                yield from self.translator.translate_stream(
+                    text,
+                    source_language,
+                    target_language,
+                    min_length_percentage,
+                    profile=profile,
+                )
+
+            finally:
+                self.release()
+
+        return stream()
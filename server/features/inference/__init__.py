@@ -0,0 +1,3 @@
+from server.features.inference.client import InferenceClient as InferenceClient
+from server.features.inference.client import InferenceError as InferenceError
+from server.features.inference.server import handle_connection as handle_connection
@@ -0,0 +1,507 @@
+from collections.abc import Iterator
+from contextlib import suppress
+from itertools import count
+from queue import SimpleQueue
+from socket import AF_UNIX, SHUT_RDWR, SOCK_STREAM, socket
+from threading import Lock, Thread
+from typing import Any, Self
+
+from server.features.idle import ModelReloadingError
+from server.features.inference.framing import CHUNK, END, ERROR, HEADER, OPERATIONS, decode_payload, encode_frame
+from server.features.scheduler.context import current_admission, current_priority_class, current_tenant
+from server.features.tenants import QuotaExceededError
+from server.features.translator import TranslatorProtocol
+from server.typedefs import Language
+
+
+class InferenceError(Exception):
+    """
+    Summary
+    -------
+    raised when the inference process fails a request or the connection to it is lost
+    """
+
+
+class InferenceClient(TranslatorProtocol):
+    """
+    Summary
+    -------
+    a translator that forwards every call to the inference process over a Unix socket
+
+    Requests of all threads are multiplexed over a single connection, each tagged with an ID
+    that a background thread uses to route the response frames back to the waiting caller.
+    The priority class and tenant of the calling context are sent along, so the scheduler
+    of the inference process orders requests across every front-end.
+
+    Methods
+    -------
+    translate(text: str, source_language: Language, target_language: Language) -> str
+        translate the input from the source language to the target language
+
+    translate_batch(texts: list[str], source_languages: list[Language], target_languages: list[Language]) -> list[str]
+        translate multiple inputs from source languages to target languages in batch
+
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages
+
+    translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
+        streams the translation input from the source language to the target language
+
+    estimate(text: str, source_language: Language, target_language: Language) -> tuple[int, float, float]
+        predict the token count, decode time and queue wait of a request without submitting it
+
+    unload_model(to_cpu: bool) -> bool
+        unload the model from the current device
+
+    load_model(keep_cache: bool) -> bool
+        load the model back to the initial device
+
+    count_tokens(text: str) -> int
+        count the number of tokens in the input text
+    """
+
+    __slots__ = ("connected", "connection", "path", "pending", "request_ids", "send_lock")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.request_ids = count(1)
+        self.send_lock = Lock()
+        self.connect()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_) -> None:
+        with self.send_lock, suppress(OSError):
+            self.connection.shutdown(SHUT_RDWR)
+
+        self.connection.close()
+
+    def connect(self) -> None:
+        """
+        Summary
+        -------
+        connect to the inference process and start routing its responses
+        """
+        connection = socket(AF_UNIX, SOCK_STREAM)
+
+        try:
+            connection.connect(self.path)
+
+        except OSError:
+            connection.close()
+            raise
+
+        self.connection = connection
+        self.pending: dict[int, SimpleQueue[tuple[int, Any]]] = {}
+        self.connected = True
+        Thread(target=self.receive, args=(connection, self.pending), name="inference-client", daemon=True).start()
+
+    def receive(self, connection: socket, pending: dict[int, SimpleQueue[tuple[int, Any]]]) -> None:
+        """
+        Summary
+        -------
+        route the response frames to their callers until the connection closes
+
+        Parameters
+        ----------
+        connection (socket)
+            the connection to read from
+
+        pending (dict[int, SimpleQueue[tuple[int, Any]]])
+            the queues of the requests sent over the connection, keyed by request ID
+        """
+        with connection.makefile("rb") as frames:
+            while len(header := frames.read(HEADER.size)) == HEADER.size:
+                request_id, kind, length = HEADER.unpack(header)
+                payload = decode_payload(frames.read(length))
+                queue = pending.get(request_id) if kind == CHUNK else pending.pop(request_id, None)
+
+                if queue is not None:
+                    queue.put((kind, payload))
+
+        # the next request reconnects, e.g. to a restarted inference process
+        with self.send_lock:
+            if pending is self.pending:
+                self.connected = False
+
+            while pending:
+                _, queue = pending.popitem()
+                queue.put((ERROR, ("the connection to the inference process was lost", None, None)))
+
+    def submit(self, operation: str, *arguments: Any, **keyword_arguments: Any) -> SimpleQueue[tuple[int, Any]]:
+        """
+        Summary
+        -------
+        send a request to the inference process
+
+        Parameters
+        ----------
+        operation (str)
+            the name of the translator method to call
+
+        *arguments (Any)
+            the positional arguments of the call
+
+        **keyword_arguments (Any)
+            the keyword arguments of the call
+
+        Returns
+        -------
+        responses (SimpleQueue[tuple[int, Any]])
+            the queue the kind and payload of every response frame are put into
+        """
+        tenant = current_tenant.get()
+        frame = (
+            current_priority_class.get(),
+            tenant and tenant.name,
+            current_admission.get(),
+            arguments,
+            keyword_arguments,
+        )
+        responses: SimpleQueue[tuple[int, Any]] = SimpleQueue()
+
+        with self.send_lock:
+            request_id = next(self.request_ids) & 0xFFFFFFFF
+
+            try:
+                if not self.connected:
+                    self.connect()
+
+                self.pending[request_id] = responses
+                self.connection.sendall(encode_frame(request_id, OPERATIONS.index(operation), frame))
+
+            except OSError as exception:
+                self.pending.pop(request_id, None)
+                raise InferenceError("the inference process is unavailable") from exception
+
+        return responses
+
+    def wait(self, responses: SimpleQueue[tuple[int, Any]]) -> tuple[int, Any]:
+        """
+        Summary
+        -------
+        wait for the next response frame of a request, raising the error it reports
+
+        Parameters
+        ----------
+        responses (SimpleQueue[tuple[int, Any]])
+            the queue of the request
+
+        Returns
+        -------
+        response (tuple[int, Any])
+            the kind and payload of the frame
+        """
+        kind, payload = responses.get()
+
+        if kind != ERROR:
+            return kind, payload
+
+        message, tenant, retry_after = payload
+
+        if tenant is not None:
+            raise QuotaExceededError(tenant, retry_after)
+
+        if retry_after is not None:
+            raise ModelReloadingError(retry_after)
+
+        raise InferenceError(message)
+
+    def call(self, operation: str, *arguments: Any, **keyword_arguments: Any) -> Any:
+        """
+        Summary
+        -------
+        call a translator method in the inference process and wait for its result
+
+        Parameters
+        ----------
+        operation (str)
+            the name of the translator method to call
+
+        *arguments (Any)
+            the positional arguments of the call
+
+        **keyword_arguments (Any)
+            the keyword arguments of the call
+
+        Returns
+        -------
+        result (Any)
+            the result of the call
+        """
+        _, result = self.wait(self.submit(operation, *arguments, **keyword_arguments))
+        return result
+
+    def unload_model(self, *, to_cpu: bool) -> bool:
+        """
+        Summary
+        -------
+        unload the model from the current device
+
+        Parameters
+        ----------
+        to_cpu (bool)
+            whether to unload the model to CPU
+
+        Returns
+        -------
+        success (bool)
+            whether the model unload was executed
+        """
+        return self.call("unload_model", to_cpu=to_cpu)
+
+    def load_model(self, *, keep_cache: bool) -> bool:
+        """
+        Summary
+        -------
+        load the model back to the initial device
+
+        Parameters
+        ----------
+        keep_cache (bool)
+            whether to keep the model cache in RAM
+
+        Returns
+        -------
+        success (bool)
+            whether the model load was executed
+        """
+        return self.call("load_model", keep_cache=keep_cache)
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Summary
+        -------
+        count the number of tokens in the input text
+
+        Parameters
+        ----------
+        text (str)
+            the input text
+
+        Returns
+        -------
+        token_count (int)
+            the number of tokens that will be sent to the translator
+        """
+        return self.call("count_tokens", text)
+
+    def estimate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        *,
+        profile: str | None = None,
+    ) -> tuple[int, float, float]:
+        """
+        Summary
+        -------
+        predict the token count, decode time and queue wait of a request without submitting it
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        estimate (tuple[int, float, float])
+            the number of input tokens, the predicted decode time and the predicted queue wait in seconds
+        """
+        return self.call("estimate", text, source_language, target_language, profile=profile)
+
+    def translate_batch(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate multiple inputs from source languages to target languages in batch
+
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile applied to the whole batch
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        return self.call(
+            "translate_batch",
+            texts,
+            source_languages,
+            target_languages,
+            min_length_percentages,
+            profile=profile,
+        )
+
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        return self.call(
+            "translate_fanout",
+            text,
+            source_language,
+            target_languages,
+            min_length_percentage,
+            profile=profile,
+        )
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
+        """
+        Summary
+        -------
+        translate the input from the source language to the target language
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Languages)
+            the source language
+
+        target_language (Languages)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (str)
+            the translated text
+        """
+        return self.call("translate", text, source_language, target_language, min_length_percentage, profile=profile)
+
+    def translate_stream(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Summary
+        -------
+        streams the translation input from the source language to the target language
+
+        The first frame is awaited before returning, so a rejected request raises at the call site.
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Languages)
+            the source language
+
+        target_language (Languages)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (Iterator[str])
+            the translated text
+        """
+        responses = self.submit(
+            "translate_stream",
+            text,
+            source_language,
+            target_language,
+            min_length_percentage,
+            profile=profile,
+        )
+        first = self.wait(responses)
+
+        def chunks() -> Iterator[str]:
+            kind, chunk = first
+
+            while kind != END:
+                yield chunk
+                kind, chunk = self.wait(responses)
+
+        return chunks()
@@ -0,0 +1,70 @@
+from marshal import dumps, loads
+from struct import Struct
+from typing import Any
+
+# the request ID, the frame kind and the payload length, followed by the payload
+HEADER = Struct("!IBI")
+
+# requests name the translator method they call by its index
+OPERATIONS = (
+    "translate",
+    "translate_batch",
+    "translate_fanout",
+    "translate_stream",
+    "count_tokens",
+    "estimate",
+    "unload_model",
+    "load_model",
+)
+
+RESULT = 0x80
+CHUNK = 0x81
+END = 0x82
+ERROR = 0x83
+
+
+def encode_frame(request_id: int, kind: int, payload: Any) -> bytes:
+    """
+    Summary
+    -------
+    encode a frame, the payload is serialised with `marshal`, which only round-trips plain
+    values and is only ever read by a process of the same interpreter on the same node
+
+    Parameters
+    ----------
+    request_id (int)
+        the ID that pairs responses with their request
+
+    kind (int)
+        the index of the operation of a request, or the kind of response
+
+    payload (Any)
+        the arguments or result, made of strings, numbers, booleans, None, lists, tuples and dicts
+
+    Returns
+    -------
+    frame (bytes)
+        the encoded frame
+    """
+    body = dumps(payload)
+    return HEADER.pack(request_id, kind, len(body)) + body
+
+
+def decode_payload(body: bytes) -> Any:
+    """
+    Summary
+    -------
+    decode the payload of a frame
+
+    Parameters
+    ----------
+    body (bytes)
+        the payload that follows the header
+
+    Returns
+    -------
+    payload (Any)
+        the arguments or result
+    """
+    # the socket is only accessible to processes of the same user, which are trusted
+    return loads(body)  # noqa: S302
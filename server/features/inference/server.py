@@ -0,0 +1,135 @@
+from asyncio import IncompleteReadError, StreamReader, StreamWriter, Task, create_task, to_thread
+from typing import Any
+
+from server.features.idle import ModelReloadingError
+from server.features.inference.framing import (
+    CHUNK,
+    END,
+    ERROR,
+    HEADER,
+    OPERATIONS,
+    RESULT,
+    decode_payload,
+    encode_frame,
+)
+from server.features.scheduler.context import schedule_as
+from server.features.scheduler.translator import translate_scheduled
+from server.features.tenants import QuotaExceededError, TenantBucket
+from server.features.translator import TranslatorProtocol
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def respond(
+    writer: StreamWriter,
+    request_id: int,
+    operation: str,
+    payload: tuple[str | None, str | None, int | None, tuple[Any, ...], dict[str, Any]],
+    *,
+    translator: TranslatorProtocol,
+    tenants: dict[str, TenantBucket],
+) -> None:
+    """
+    Summary
+    -------
+    run a single request and write its response frames, decoding in a worker thread
+
+    Parameters
+    ----------
+    writer (StreamWriter)
+        the connection to the front-end
+
+    request_id (int)
+        the ID of the request
+
+    operation (str)
+        the name of the translator method to call
+
+    payload (tuple[str?, str?, int?, tuple[Any, ...], dict[str, Any]])
+        the priority class, the tenant name, the quota admission and the arguments of the call
+
+    translator (TranslatorProtocol)
+        the translator that owns the model
+
+    tenants (dict[str, TenantBucket])
+        the tenant buckets keyed by name
+    """
+    priority_class, tenant_name, admission, arguments, keyword_arguments = payload
+    tenant = tenants.get(tenant_name) if tenant_name else None
+
+    try:
+        # the scheduler reads the priority class and tenant from the context, which `to_thread` copies
+        with schedule_as(priority_class, tenant, admission=admission):
+            if operation != "translate_stream":
+                result = await translate_scheduled(translator, operation, *arguments, **keyword_arguments)
+                writer.write(encode_frame(request_id, RESULT, result))
+
+            else:
+                result = await to_thread(translator.translate_stream, *arguments, **keyword_arguments)
+
+                while (chunk := await to_thread(next, result, None)) is not None:
+                    writer.write(encode_frame(request_id, CHUNK, chunk))
+                    await writer.drain()
+
+                writer.write(encode_frame(request_id, END, None))
+
+    except QuotaExceededError as exception:
+        writer.write(encode_frame(request_id, ERROR, (str(exception), exception.tenant, exception.retry_after)))
+
+    except ModelReloadingError as exception:
+        writer.write(encode_frame(request_id, ERROR, (str(exception), None, exception.retry_after)))
+
+    except Exception as exception:
+        logger.exception("Inference request failed", operation=operation)
+        writer.write(encode_frame(request_id, ERROR, (str(exception), None, None)))
+
+    await writer.drain()
+
+
+async def handle_connection(
+    reader: StreamReader,
+    writer: StreamWriter,
+    *,
+    translator: TranslatorProtocol,
+    tenants: dict[str, TenantBucket],
+) -> None:
+    """
+    Summary
+    -------
+    serve the requests multiplexed over the connection of a front-end until it disconnects
+
+    Parameters
+    ----------
+    reader (StreamReader)
+        the incoming frames
+
+    writer (StreamWriter)
+        the outgoing frames
+
+    translator (TranslatorProtocol)
+        the translator that owns the model
+
+    tenants (dict[str, TenantBucket])
+        the tenant buckets keyed by name
+    """
+    requests: set[Task[None]] = set()
+
+    try:
+        while True:
+            request_id, kind, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+            payload = decode_payload(await reader.readexactly(length))
+            request = create_task(
+                respond(writer, request_id, OPERATIONS[kind], payload, translator=translator, tenants=tenants)
+            )
+            requests.add(request)
+            request.add_done_callback(requests.discard)
+
+    except (IncompleteReadError, ConnectionError):
+        pass
+
+    finally:
+        for request in requests:
+            request.cancel()
+
+        writer.close()
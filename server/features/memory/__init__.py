@@ -0,0 +1,12 @@
+from server.features.memory.budget import BatchTokenBudget as BatchTokenBudget
+from server.features.memory.footprint import measure_footprint as measure_footprint
+from server.features.memory.footprint import memory_footprint as memory_footprint
+from server.features.memory.residency import get_locked_memory as get_locked_memory
+from server.features.memory.residency import get_model_files as get_model_files
+from server.features.memory.residency import lock_memory as lock_memory
+from server.features.memory.residency import prefetch_model as prefetch_model
+from server.features.memory.usage import get_available_memory as get_available_memory
+from server.features.memory.usage import get_major_page_faults as get_major_page_faults
+from server.features.memory.usage import get_memory_usage as get_memory_usage
+from server.features.memory.usage import get_proportional_memory as get_proportional_memory
+from server.features.memory.usage import get_resident_memory as get_resident_memory
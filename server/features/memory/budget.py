@@ -0,0 +1,197 @@
+from collections.abc import Iterable
+from threading import Lock
+from weakref import WeakSet
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+batch_memory_histogram = meter.create_histogram(
+    name="nllb_api_batch_transient_memory",
+    description="Growth of memory usage across a single translation batch",
+    unit="By",
+)
+
+# the weight of each batch in the moving average of the memory growth per token
+TOKEN_MEMORY_SMOOTHING = 0.25
+# a batch can be inflated by allocations of concurrent batches, so no sample may exceed this multiple of the estimate
+TOKEN_MEMORY_SAMPLE_CLAMP = 4
+
+
+class BatchTokenBudget:
+    """
+    Summary
+    -------
+    an adaptive limit on the number of tokens CTranslate2 decodes at once, kept under a memory ceiling
+
+    Before a batch is decoded, the budget is halved until the batch is predicted to keep memory usage
+    under the high watermark, from a moving average of the growth of memory usage per token.
+    After the batch, it is still halved if memory usage ended above the high watermark,
+    and grows additively while usage stays below the low watermark.
+
+    Attributes
+    ----------
+    tokens (int)
+        the current maximum number of tokens per batch
+
+    token_memory (float)
+        the predicted growth of memory usage per decoded token in bytes
+
+    peak_transient (int)
+        the largest growth of memory usage seen across a single batch
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "ceiling",
+        "high_watermark",
+        "last_transient",
+        "lock",
+        "low_watermark",
+        "maximum",
+        "minimum",
+        "peak_transient",
+        "step",
+        "token_memory",
+        "tokens",
+    )
+
+    def __init__(self, *, ceiling: int, minimum: int, maximum: int, token_memory: float) -> None:
+        self.ceiling = ceiling
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tokens = maximum
+        self.token_memory = token_memory
+        self.step = max(1, maximum // 16)
+        self.high_watermark = int(ceiling * 0.9)
+        self.low_watermark = int(ceiling * 0.75)
+        self.last_transient = 0
+        self.peak_transient = 0
+        self.lock = Lock()
+        batch_token_budgets.add(self)
+
+    def reduce(self, previous_tokens: int, usage: int) -> None:
+        """
+        Summary
+        -------
+        log a reduction of the budget
+
+        Parameters
+        ----------
+        previous_tokens (int)
+            the budget before the reduction
+
+        usage (int)
+            the memory usage in bytes that caused the reduction
+        """
+        if self.tokens < previous_tokens:
+            logger.warning(
+                "Batch token budget reduced",
+                usage_bytes=usage,
+                ceiling_bytes=self.ceiling,
+                max_batch_tokens=self.tokens,
+            )
+
+    def limit(self, usage: int, tokens: int) -> int:
+        """
+        Summary
+        -------
+        get the number of tokens a batch may decode at once, halving the budget beforehand
+        while the batch is predicted to take memory usage above the high watermark
+
+        Parameters
+        ----------
+        usage (int)
+            the memory usage in bytes before the batch
+
+        tokens (int)
+            the number of tokens in the batch
+
+        Returns
+        -------
+        max_batch_tokens (int)
+            the maximum number of tokens to decode at once
+        """
+        with self.lock:
+            previous_tokens = self.tokens
+
+            while (
+                self.tokens > self.minimum
+                and usage + self.token_memory * min(tokens, self.tokens) > self.high_watermark
+            ):
+                self.tokens = max(self.minimum, self.tokens // 2)
+
+            max_batch_tokens = self.tokens
+
+        self.reduce(previous_tokens, usage)
+        return max_batch_tokens
+
+    def update(self, usage_before: int, usage_after: int, *, tokens: int) -> None:
+        """
+        Summary
+        -------
+        adapt the budget to the memory usage measured around a batch
+
+        Parameters
+        ----------
+        usage_before (int)
+            the memory usage in bytes before the batch
+
+        usage_after (int)
+            the memory usage in bytes after the batch
+
+        tokens (int)
+            the largest number of tokens decoded at once in the batch
+        """
+        transient = max(0, usage_after - usage_before)
+        batch_memory_histogram.record(transient)
+
+        with self.lock:
+            self.last_transient = transient
+            self.peak_transient = max(self.peak_transient, transient)
+            sample = min(transient / max(1, tokens), TOKEN_MEMORY_SAMPLE_CLAMP * max(1.0, self.token_memory))
+            self.token_memory += TOKEN_MEMORY_SMOOTHING * (sample - self.token_memory)
+            previous_tokens = self.tokens
+
+            if usage_after > self.high_watermark:
+                self.tokens = max(self.minimum, self.tokens // 2)
+
+            elif usage_after < self.low_watermark:
+                self.tokens = min(self.maximum, self.tokens + self.step)
+
+        self.reduce(previous_tokens, usage_after)
+
+
+batch_token_budgets: WeakSet[BatchTokenBudget] = WeakSet()
+
+
+def observe_batch_token_budgets(_: CallbackOptions) -> Iterable[Observation]:
+    """
+    Summary
+    -------
+    callback function to observe the batch token budget of every translator
+
+    Parameters
+    ----------
+    options (CallbackOptions)
+        callback options
+
+    Yields
+    ------
+    observation (Observation)
+        the current batch token budget
+    """
+    for budget in list(batch_token_budgets):
+        yield Observation(budget.tokens)
+
+
+meter.create_observable_gauge(
+    "nllb_api_batch_token_budget",
+    [observe_batch_token_budgets],
+    "1",
+    "Maximum number of tokens CTranslate2 decodes at once",
+)
@@ -0,0 +1,35 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Lock
+
+from server.features.memory.usage import get_resident_memory
+
+memory_footprint: dict[str, int] = {}
+footprint_lock = Lock()
+
+
+@contextmanager
+def measure_footprint(component: str) -> Iterator[None]:
+    """
+    Summary
+    -------
+    attribute the growth of the resident set size within the context to a component
+
+    The resident set size belongs to the whole process, so measurements are taken one at a time:
+    a component loaded concurrently with another waits for the other measurement to finish
+    instead of being credited with its growth. Measurements of the same component accumulate,
+    e.g. for both models of the cascade.
+
+    Parameters
+    ----------
+    component (str)
+        the name of the component
+    """
+    with footprint_lock:
+        start = get_resident_memory()
+
+        try:
+            yield
+
+        finally:
+            memory_footprint[component] = memory_footprint.get(component, 0) + max(0, get_resident_memory() - start)
@@ -0,0 +1,172 @@
+from collections.abc import Iterable
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from os import POSIX_FADV_WILLNEED, posix_fadvise, strerror
+from pathlib import Path
+from resource import RLIMIT_MEMLOCK, getrlimit
+from threading import Thread
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+MCL_CURRENT = 1
+PREFETCH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def get_model_files(model_path: str) -> list[Path]:
+    """
+    Summary
+    -------
+    get the files of a model, resolving the symbolic links of the Hugging Face cache
+
+    Parameters
+    ----------
+    model_path (str)
+        the path to the model
+
+    Returns
+    -------
+    model_files (list[Path])
+        the model files, largest first
+    """
+    files = (path.resolve() for path in Path(model_path).iterdir())
+    return sorted((path for path in files if path.is_file()), key=lambda path: path.stat().st_size, reverse=True)
+
+
+def prefetch_file(path: Path, *, mode: str) -> None:
+    """
+    Summary
+    -------
+    bring a file into the page cache
+
+    Parameters
+    ----------
+    path (Path)
+        the path to the file
+
+    mode (str)
+        `readahead` asks the kernel to read the file asynchronously, `read` reads it sequentially
+    """
+    with path.open("rb", buffering=0) as file:
+        if mode == "readahead":
+            posix_fadvise(file.fileno(), 0, 0, POSIX_FADV_WILLNEED)
+            return
+
+        buffer = bytearray(PREFETCH_CHUNK_SIZE)
+
+        while file.readinto(buffer):
+            pass
+
+
+def prefetch_model(model_path: str, *, mode: str) -> list[Thread]:
+    """
+    Summary
+    -------
+    prefetch the model files into the page cache in background threads, one per file
+
+    Parameters
+    ----------
+    model_path (str)
+        the path to the model
+
+    mode (str)
+        `readahead` asks the kernel to read the files asynchronously, `read` reads them sequentially
+
+    Returns
+    -------
+    threads (list[Thread])
+        the started prefetch threads
+    """
+    files = get_model_files(model_path)
+    threads = [
+        Thread(target=prefetch_file, args=(path,), kwargs={"mode": mode}, name=f"prefetch-{path.name}", daemon=True)
+        for path in files
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    logger.info(
+        "Model prefetch started",
+        model_path=model_path,
+        mode=mode,
+        files=len(files),
+        bytes=sum(path.stat().st_size for path in files),
+    )
+
+    return threads
+
+
+def lock_memory() -> bool:
+    """
+    Summary
+    -------
+    lock every page the process currently maps into RAM, so the loaded weights and tokeniser are never paged out
+
+    Pages allocated afterwards, e.g. by batches, stay swappable.
+
+    Returns
+    -------
+    success (bool)
+        whether the memory was locked, fails without CAP_IPC_LOCK when RLIMIT_MEMLOCK is too small
+    """
+    libc = CDLL(find_library("c"), use_errno=True)
+
+    if libc.mlockall(MCL_CURRENT) == 0:
+        return True
+
+    soft_limit, _ = getrlimit(RLIMIT_MEMLOCK)
+    logger.warning("Memory could not be locked", error=strerror(get_errno()), memlock_limit_bytes=soft_limit)
+
+    return False
+
+
+def get_locked_memory() -> int:
+    """
+    Summary
+    -------
+    get the memory the current process has locked into RAM
+
+    Returns
+    -------
+    locked_bytes (int)
+        the locked memory in bytes
+    """
+    with Path("/proc/self/status").open() as status:
+        for line in status:
+            if line.startswith("VmLck:"):
+                return int(line.split()[1]) * 1024
+
+    return 0
+
+
+def observe_locked_memory(_: CallbackOptions) -> Iterable[Observation]:
+    """
+    Summary
+    -------
+    callback function to observe the locked memory
+
+    Parameters
+    ----------
+    options (CallbackOptions)
+        callback options
+
+    Yields
+    ------
+    observation (Observation)
+        the locked memory in bytes
+    """
+    yield Observation(get_locked_memory())
+
+
+meter.create_observable_gauge(
+    "nllb_api_locked_memory",
+    [observe_locked_memory],
+    "By",
+    "Memory locked into RAM by the process",
+)
@@ -0,0 +1,122 @@
+from os import sysconf
+from pathlib import Path
+from resource import RUSAGE_SELF, getrusage
+
+CGROUP_MEMORY_CURRENT_PATHS = (
+    Path("/sys/fs/cgroup/memory.current"),
+    Path("/sys/fs/cgroup/memory/memory.usage_in_bytes"),
+)
+CGROUP_MEMORY_MAX_PATHS = (
+    Path("/sys/fs/cgroup/memory.max"),
+    Path("/sys/fs/cgroup/memory/memory.limit_in_bytes"),
+)
+
+
+def get_resident_memory(pid: int | None = None) -> int:
+    """
+    Summary
+    -------
+    get the resident set size of a process
+
+    Parameters
+    ----------
+    pid (int?)
+        the process ID, defaults to the current process
+
+    Returns
+    -------
+    resident_bytes (int)
+        the resident set size in bytes
+    """
+    with Path(f"/proc/{pid or 'self'}/statm").open() as statm:
+        resident_pages = int(statm.read().split()[1])
+
+    return resident_pages * sysconf("SC_PAGE_SIZE")
+
+
+def get_proportional_memory(pid: int | None = None) -> int:
+    """
+    Summary
+    -------
+    get the proportional set size of a process, which splits shared pages evenly between the processes mapping them
+
+    Parameters
+    ----------
+    pid (int?)
+        the process ID, defaults to the current process
+
+    Returns
+    -------
+    proportional_bytes (int)
+        the proportional set size in bytes, or the resident set size when the kernel does not report it
+    """
+    try:
+        with Path(f"/proc/{pid or 'self'}/smaps_rollup").open() as smaps:
+            for line in smaps:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+
+    except OSError:
+        pass
+
+    return get_resident_memory(pid)
+
+
+def get_memory_usage() -> int:
+    """
+    Summary
+    -------
+    get the memory usage that counts against the OOM killer, the cgroup usage when available or the process RSS
+
+    Returns
+    -------
+    usage_bytes (int)
+        the memory usage in bytes
+    """
+    for path in CGROUP_MEMORY_CURRENT_PATHS:
+        try:
+            return int(path.read_text())
+
+        except (OSError, ValueError):
+            continue
+
+    return get_resident_memory()
+
+
+def get_available_memory() -> int:
+    """
+    Summary
+    -------
+    get the memory that can still be allocated, the lower of the cgroup headroom and the memory available on the host
+
+    Returns
+    -------
+    available_bytes (int)
+        the available memory in bytes
+    """
+    with Path("/proc/meminfo").open() as meminfo:
+        available = next(int(line.split()[1]) * 1024 for line in meminfo if line.startswith("MemAvailable:"))
+
+    for path in CGROUP_MEMORY_MAX_PATHS:
+        try:
+            # `max` when the cgroup is unlimited
+            return min(available, max(0, int(path.read_text()) - get_memory_usage()))
+
+        except (OSError, ValueError):
+            continue
+
+    return available
+
+
+def get_major_page_faults() -> int:
+    """
+    Summary
+    -------
+    get the number of major page faults of the current process, the faults that had to wait for a disk read
+
+    Returns
+    -------
+    major_page_faults (int)
+        the number of major page faults since the process started
+    """
+    return getrusage(RUSAGE_SELF).ru_majflt
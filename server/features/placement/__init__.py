@@ -0,0 +1,6 @@
+from server.features.placement.placement import Placement as Placement
+from server.features.placement.placement import pin as pin
+from server.features.placement.placement import place_replicas as place_replicas
+from server.features.placement.placement import plan_placement as plan_placement
+from server.features.placement.topology import parse_cpu_list as parse_cpu_list
+from server.features.placement.topology import read_numa_nodes as read_numa_nodes
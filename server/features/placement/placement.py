@@ -0,0 +1,119 @@
+from os import sched_setaffinity
+from typing import NamedTuple
+
+from server.features.placement.topology import read_node_free_memory, read_numa_nodes
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class Placement(NamedTuple):
+    """
+    Summary
+    -------
+    the CPUs a replica is pinned to
+
+    Attributes
+    ----------
+    replica (int)
+        the index of the replica
+
+    node (int)
+        the NUMA node the CPUs belong to
+
+    cpus (list[int])
+        the CPUs the replica may run on
+    """
+
+    replica: int
+    node: int
+    cpus: list[int]
+
+
+def plan_placement(nodes: dict[int, list[int]], *, replicas: int) -> list[Placement]:
+    """
+    Summary
+    -------
+    spread the replicas across the NUMA nodes and split the CPUs of each node between its replicas
+
+    Replicas are dealt to the nodes in turn, so a replica never spans two nodes and the
+    memory it allocates after pinning stays local. A node with more replicas than CPUs
+    shares its CPUs between them.
+
+    Parameters
+    ----------
+    nodes (dict[int, list[int]])
+        the CPUs of every NUMA node
+
+    replicas (int)
+        the number of replicas to place
+
+    Returns
+    -------
+    placements (list[Placement])
+        the placement of every replica, in replica order
+    """
+    node_ids = list(nodes)
+    assigned = [node_ids[replica % len(node_ids)] for replica in range(replicas)]
+    placements: list[Placement] = []
+
+    for replica, node in enumerate(assigned):
+        cpus = nodes[node]
+        siblings = assigned.count(node)
+        position = assigned[:replica].count(node)
+
+        if siblings > len(cpus):
+            placements.append(Placement(replica, node, [cpus[position % len(cpus)]]))
+            continue
+
+        size = len(cpus) // siblings
+        # the first replicas of a node absorb the remainder, one CPU each
+        remainder = len(cpus) % siblings
+        start = position * size + min(position, remainder)
+        placements.append(Placement(replica, node, cpus[start : start + size + (position < remainder)]))
+
+    return placements
+
+
+def place_replicas(replicas: int) -> list[Placement]:
+    """
+    Summary
+    -------
+    plan the placement of the replicas on the CPU topology of the node and log it
+
+    Parameters
+    ----------
+    replicas (int)
+        the number of processes that load a translator
+
+    Returns
+    -------
+    placements (list[Placement])
+        the placement of every replica, in replica order
+    """
+    nodes = read_numa_nodes()
+    placements = plan_placement(nodes, replicas=replicas)
+    logger.info(
+        "CPU placement",
+        nodes={node: {"cpus": cpus, "free_memory": read_node_free_memory(node)} for node, cpus in nodes.items()},
+        replicas=[placement._asdict() for placement in placements],
+    )
+
+    return placements
+
+
+def pin(placement: Placement) -> None:
+    """
+    Summary
+    -------
+    pin the current process, and every thread it starts afterwards, to the CPUs of a placement
+
+    The kernel allocates pages on the node of the CPU that first touches them,
+    so a translator loaded after pinning keeps its weights on the local node.
+
+    Parameters
+    ----------
+    placement (Placement)
+        the placement of the replica
+    """
+    sched_setaffinity(0, placement.cpus)
@@ -0,0 +1,91 @@
+from os import sched_getaffinity
+from pathlib import Path
+
+NODE_ROOT = Path("/sys/devices/system/node")
+
+
+def parse_cpu_list(cpu_list: str) -> list[int]:
+    """
+    Summary
+    -------
+    parse a kernel CPU list, e.g. `0-3,8-11`
+
+    Parameters
+    ----------
+    cpu_list (str)
+        the CPU list
+
+    Returns
+    -------
+    cpus (list[int])
+        the CPU IDs in ascending order
+    """
+    cpus: set[int] = set()
+
+    for chunk in cpu_list.strip().split(","):
+        if not chunk:
+            continue
+
+        start, _, end = chunk.partition("-")
+        cpus.update(range(int(start), int(end or start) + 1))
+
+    return sorted(cpus)
+
+
+def read_numa_nodes(root: Path = NODE_ROOT) -> dict[int, list[int]]:
+    """
+    Summary
+    -------
+    read the CPUs of every NUMA node that the process may run on
+
+    Parameters
+    ----------
+    root (Path)
+        the sysfs directory of the NUMA nodes
+
+    Returns
+    -------
+    nodes (dict[int, list[int]])
+        the allowed CPUs keyed by NUMA node, a single node holding every allowed CPU when the topology is unknown
+    """
+    allowed = sched_getaffinity(0)
+    nodes = {
+        int(path.parent.name.removeprefix("node")): cpus
+        for path in root.glob("node[0-9]*/cpulist")
+        if (cpus := [cpu for cpu in parse_cpu_list(path.read_text()) if cpu in allowed])
+    }
+
+    return dict(sorted(nodes.items())) or {0: sorted(allowed)}
+
+
+def read_node_free_memory(node: int, root: Path = NODE_ROOT) -> int | None:
+    """
+    Summary
+    -------
+    read the free memory of a NUMA node
+
+    Parameters
+    ----------
+    node (int)
+        the NUMA node
+
+    root (Path)
+        the sysfs directory of the NUMA nodes
+
+    Returns
+    -------
+    free_memory (int?)
+        the free memory in bytes, None when the node does not report it
+    """
+    try:
+        meminfo = (root / f"node{node}" / "meminfo").read_text()
+
+    except OSError:
+        return None
+
+    for line in meminfo.splitlines():
+        # e.g. `Node 0 MemFree:        1234 kB`
+        if "MemFree:" in line:
+            return int(line.split()[-2]) * 1024
+
+    return None
@@ -0,0 +1,2 @@
+from server.features.readiness.component import Component as Component
+from server.features.readiness.component import ComponentState as ComponentState
@@ -0,0 +1,174 @@
+from math import ceil
+from threading import Lock
+from time import monotonic
+from typing import Literal
+
+from opentelemetry import metrics
+
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+startup_phase_duration_histogram = meter.create_histogram(
+    name="nllb_api_startup_phase_duration",
+    description="Time each model spent in each startup phase, with `total` covering the whole startup",
+    unit="s",
+)
+
+type ComponentState = Literal["pending", "downloading", "loading", "warming", "ready", "failed"]
+
+STAGES: tuple[ComponentState, ...] = ("downloading", "loading", "warming")
+DEFAULT_RETRY_AFTER = 10
+MAX_RETRY_AFTER = 300
+
+
+class Component:
+    """
+    Summary
+    -------
+    the startup state of a model that is loaded in the background
+
+    A component moves from `pending` through `downloading`, `loading` and `warming` to `ready`,
+    or to `failed` if any stage raises. Stages may be skipped, e.g. when the model is already cached.
+    The time spent in each stage is recorded when the component leaves it.
+
+    Methods
+    -------
+    advance(state: ComponentState) -> None
+        move the component to the given state
+
+    update(progress: float) -> None
+        report the progress within the current stage
+
+    fail(error: BaseException) -> None
+        mark the component as failed
+
+    overall_progress() -> float
+        get the progress across all stages
+
+    retry_after() -> int
+        estimate the number of seconds until the component is ready
+    """
+
+    __slots__ = ("entered_at", "error", "lock", "name", "progress", "started_at", "state", "timings")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state: ComponentState = "pending"
+        self.progress = 0.0
+        self.started_at: float | None = None
+        self.entered_at: float | None = None
+        self.timings: dict[str, float] = {}
+        self.error: str | None = None
+        self.lock = Lock()
+
+    def advance(self, state: ComponentState) -> None:
+        """
+        Summary
+        -------
+        move the component to the given state, resetting the progress within the stage
+
+        Parameters
+        ----------
+        state (ComponentState)
+            the new state
+        """
+        now = monotonic()
+
+        with self.lock:
+            previous_state = self.state
+            entered_at = self.entered_at
+            self.state = state
+            self.progress = 0.0
+            self.entered_at = now
+
+            if self.started_at is None:
+                self.started_at = now
+
+        if entered_at is not None:
+            duration = now - entered_at
+            # a cascade passes through the stages once per tier
+            self.timings[previous_state] = self.timings.get(previous_state, 0.0) + duration
+            startup_phase_duration_histogram.record(duration, {"component": self.name, "phase": previous_state})
+
+        if state == "ready":
+            self.timings["total"] = now - self.started_at
+            startup_phase_duration_histogram.record(self.timings["total"], {"component": self.name, "phase": "total"})
+            logger.info("Component ready", component=self.name, timings=self.timings)
+
+        else:
+            logger.info("Component state changed", component=self.name, state=state)
+
+    def update(self, progress: float) -> None:
+        """
+        Summary
+        -------
+        report the progress within the current stage
+
+        Parameters
+        ----------
+        progress (float)
+            the completed share of the current stage between 0.0 and 1.0
+        """
+        with self.lock:
+            self.progress = min(1.0, max(0.0, progress))
+
+    def fail(self, error: BaseException) -> None:
+        """
+        Summary
+        -------
+        mark the component as failed
+
+        Parameters
+        ----------
+        error (BaseException)
+            the error that stopped the component from loading
+        """
+        with self.lock:
+            self.state = "failed"
+            self.error = str(error)
+
+        logger.error("Component failed to load", component=self.name, exc_info=error)
+
+    def overall_progress(self) -> float:
+        """
+        Summary
+        -------
+        get the progress across all stages
+
+        Returns
+        -------
+        progress (float)
+            the completed share of the startup between 0.0 and 1.0
+        """
+        with self.lock:
+            state = self.state
+            progress = self.progress
+
+        if state == "ready":
+            return 1.0
+
+        if state not in STAGES:
+            return 0.0
+
+        return (STAGES.index(state) + progress) / len(STAGES)
+
+    def retry_after(self) -> int:
+        """
+        Summary
+        -------
+        estimate the number of seconds until the component is ready by extrapolating its progress so far
+
+        Returns
+        -------
+        seconds (int)
+            the estimated number of seconds, at least one
+        """
+        progress = self.overall_progress()
+
+        if self.started_at is None or self.state == "failed" or progress == 0.0:
+            return DEFAULT_RETRY_AFTER
+
+        elapsed = monotonic() - self.started_at
+        return min(MAX_RETRY_AFTER, max(1, ceil(elapsed * (1.0 - progress) / progress)))
@@ -0,0 +1,5 @@
+from server.features.scheduler.context import schedule_as as schedule_as
+from server.features.scheduler.cost_model import CostModel as CostModel
+from server.features.scheduler.scheduler import Scheduler as Scheduler
+from server.features.scheduler.translator import ScheduledTranslator as ScheduledTranslator
+from server.features.scheduler.translator import translate_scheduled as translate_scheduled
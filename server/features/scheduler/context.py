@@ -0,0 +1,46 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from server.features.tenants import TenantBucket
+
+current_priority_class: ContextVar[str | None] = ContextVar("current_priority_class", default=None)
+current_tenant: ContextVar[TenantBucket | None] = ContextVar("current_tenant", default=None)
+current_admission: ContextVar[int | None] = ContextVar("current_admission", default=None)
+
+
+@contextmanager
+def schedule_as(
+    priority_class: str | None,
+    tenant: TenantBucket | None,
+    *,
+    admission: int | None = None,
+) -> Iterator[None]:
+    """
+    Summary
+    -------
+    schedule every translation started within the context with the given priority class and tenant
+
+    Parameters
+    ----------
+    priority_class (str?)
+        the priority class, or None for the default class
+
+    tenant (TenantBucket?)
+        the tenant whose quota and fair share the translations count against
+
+    admission (int?)
+        the input tokens admitted against the quota in place of those of each translation,
+        `0` when the request was already admitted, None admits each translation by its own tokens
+    """
+    priority_class_token = current_priority_class.set(priority_class)
+    tenant_token = current_tenant.set(tenant)
+    admission_token = current_admission.set(admission)
+
+    try:
+        yield
+
+    finally:
+        current_admission.reset(admission_token)
+        current_tenant.reset(tenant_token)
+        current_priority_class.reset(priority_class_token)
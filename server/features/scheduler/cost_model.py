@@ -0,0 +1,152 @@
+from collections.abc import Hashable, Sequence
+from threading import Lock
+
+
+class LinearFit:
+    """
+    Summary
+    -------
+    an exponentially decayed online least-squares fit of `seconds = intercept + slope * tokens`
+
+    Attributes
+    ----------
+    observations (int)
+        the number of observations seen so far
+    """
+
+    __slots__ = ("decay", "observations", "weight", "x", "xx", "xy", "y")
+
+    def __init__(self, decay: float) -> None:
+        self.decay = decay
+        self.observations = 0
+        self.weight = 0.0
+        self.x = 0.0
+        self.y = 0.0
+        self.xx = 0.0
+        self.xy = 0.0
+
+    def observe(self, tokens: float, seconds: float) -> None:
+        """
+        Summary
+        -------
+        add an observation, decaying the weight of older observations
+
+        Parameters
+        ----------
+        tokens (float)
+            the number of input tokens
+
+        seconds (float)
+            the observed decode time
+        """
+        self.observations += 1
+        self.weight = self.weight * self.decay + 1
+        self.x = self.x * self.decay + tokens
+        self.y = self.y * self.decay + seconds
+        self.xx = self.xx * self.decay + tokens * tokens
+        self.xy = self.xy * self.decay + tokens * seconds
+
+    def predict(self, tokens: float) -> float:
+        """
+        Summary
+        -------
+        predict the decode time for the given number of tokens
+
+        Parameters
+        ----------
+        tokens (float)
+            the number of input tokens
+
+        Returns
+        -------
+        seconds (float)
+            the predicted decode time
+        """
+        denominator = self.weight * self.xx - self.x * self.x
+
+        # All observations share the same token count, so fall back to a line through the origin
+        if denominator <= 1e-9 * max(1.0, self.weight * self.xx):
+            return self.y / self.x * tokens if self.x else self.y / self.weight
+
+        slope = max(0.0, (self.weight * self.xy - self.x * self.y) / denominator)
+        intercept = (self.y - slope * self.x) / self.weight
+
+        return max(0.0, intercept + slope * tokens)
+
+
+class CostModel:
+    """
+    Summary
+    -------
+    an online model of the decode time of a request, fitted from observed decode times
+
+    Predictions use the most specific key with enough observations,
+    e.g. the language pair first and the decoding profile as a fallback.
+
+    Methods
+    -------
+    observe(keys: Sequence[Hashable], tokens: int, seconds: float) -> None
+        record an observed decode time for every key
+
+    predict(keys: Sequence[Hashable], tokens: int) -> float
+        predict the decode time of a request
+    """
+
+    __slots__ = ("decay", "fits", "lock", "min_observations", "seconds_per_token")
+
+    def __init__(self, *, seconds_per_token: float, min_observations: int = 5, decay: float = 0.99) -> None:
+        self.seconds_per_token = seconds_per_token
+        self.min_observations = min_observations
+        self.decay = decay
+        self.fits: dict[Hashable, LinearFit] = {}
+        self.lock = Lock()
+
+    def observe(self, keys: Sequence[Hashable], tokens: int, seconds: float) -> None:
+        """
+        Summary
+        -------
+        record an observed decode time for every key
+
+        Parameters
+        ----------
+        keys (Sequence[Hashable])
+            the keys of the request, from the most to the least specific
+
+        tokens (int)
+            the number of input tokens
+
+        seconds (float)
+            the observed decode time
+        """
+        with self.lock:
+            for key in keys:
+                if (fit := self.fits.get(key)) is None:
+                    fit = self.fits[key] = LinearFit(self.decay)
+
+                fit.observe(tokens, seconds)
+
+    def predict(self, keys: Sequence[Hashable], tokens: int) -> float:
+        """
+        Summary
+        -------
+        predict the decode time of a request
+
+        Parameters
+        ----------
+        keys (Sequence[Hashable])
+            the keys of the request, from the most to the least specific
+
+        tokens (int)
+            the number of input tokens
+
+        Returns
+        -------
+        seconds (float)
+            the predicted decode time, or a per-token prior when no key has enough observations
+        """
+        with self.lock:
+            for key in keys:
+                if (fit := self.fits.get(key)) is not None and fit.observations >= self.min_observations:
+                    return fit.predict(tokens)
+
+        return self.seconds_per_token * tokens
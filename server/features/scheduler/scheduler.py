@@ -0,0 +1,663 @@
+from asyncio import CancelledError, Future, get_running_loop
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Condition
+from time import monotonic
+from weakref import WeakSet
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+meter = metrics.get_meter(__name__)
+
+queue_wait_histogram = meter.create_histogram(
+    name="nllb_api_scheduler_queue_wait",
+    description="Time requests spend waiting for a translator slot",
+    unit="s",
+)
+queue_depth_counter = meter.create_up_down_counter(
+    name="nllb_api_scheduler_queue_depth",
+    description="Number of requests waiting for a translator slot",
+    unit="1",
+)
+pool_latency_histogram = meter.create_histogram(
+    name="nllb_api_scheduler_pool_latency",
+    description="Time from submission to completion of requests routed to each pool",
+    unit="s",
+)
+
+
+class Job:
+    """
+    Summary
+    -------
+    a request waiting for, or holding, a translator slot
+
+    Attributes
+    ----------
+    cost (float)
+        the predicted decode time in seconds
+
+    pool (str)
+        the pool the job was routed to
+
+    priority_class (str)
+        the priority class of the job
+
+    tenant (str?)
+        the tenant that submitted the job
+
+    finish_tag (float)
+        the virtual time at which the job would finish under weighted fair queuing
+
+    enqueued_at (float)
+        the monotonic time at which the job was submitted
+
+    started_at (float?)
+        the monotonic time at which the job acquired a slot
+
+    slot_pool (str?)
+        the pool whose slot the job holds, which differs from `pool` when the job spilled over
+
+    wake (Callable[[], None]?)
+        called with the condition held once the job has been handed a slot
+    """
+
+    __slots__ = (
+        "cost",
+        "enqueued_at",
+        "finish_tag",
+        "pool",
+        "priority_class",
+        "slot_pool",
+        "started_at",
+        "tenant",
+        "wake",
+    )
+
+    def __init__(
+        self,
+        cost: float,
+        pool: str,
+        priority_class: str,
+        tenant: str | None,
+        finish_tag: float,
+        enqueued_at: float,
+    ) -> None:
+        self.cost = cost
+        self.pool = pool
+        self.priority_class = priority_class
+        self.tenant = tenant
+        self.finish_tag = finish_tag
+        self.enqueued_at = enqueued_at
+        self.started_at: float | None = None
+        self.slot_pool: str | None = None
+        self.wake: Callable[[], None] | None = None
+
+    @property
+    def attributes(self) -> dict[str, str]:
+        return {"pool": self.pool, "priority": self.priority_class, "tenant": self.tenant or ""}
+
+
+class Scheduler:
+    """
+    Summary
+    -------
+    a shortest-expected-job-first scheduler that hands out a fixed number of translator slots
+
+    Jobs are ordered by `cost - aging * waited`. As every waiting job ages at the same rate,
+    this equals the static key `cost + aging * enqueued_at`, so a heap keeps the order exact
+    while long jobs still overtake newer short jobs once they have waited long enough.
+
+    When `short_slots` is set, the slots are partitioned into a `short` pool for inputs under
+    `short_token_threshold` tokens and a `long` pool for the rest. A job may spill over into
+    the other pool when that pool has a free slot and nothing waiting, although one short slot
+    is always kept free of long jobs.
+
+    Every job belongs to a priority class with a cost multiplier. With weighted priorities the
+    predicted cost is scaled by the multiplier, so urgent classes run first while other classes
+    still age into a slot. With strict priorities a class only runs once no class with a lower
+    multiplier is waiting in the same pool.
+
+    Within a class, jobs are ordered by their self-clocked weighted fair queuing finish tag,
+    `max(virtual time, previous finish tag of the tenant) + cost / weight`. The virtual time is
+    the finish tag of the last job to start, so a tenant with a deep backlog queues behind its
+    own work while other tenants interleave. Jobs without a tenant are not chained, which keeps
+    them in shortest-expected-job-first order.
+
+    Slots are handed to the next job in line whenever one is freed or a job is submitted. Threads
+    wait for their slot with `schedule`, while requests on the event loop await it with `schedule_async`,
+    so queued requests do not occupy a worker thread each.
+
+    Methods
+    -------
+    schedule(cost: float, tokens: int, priority_class: str | None, tenant: str | None, weight: float) -> Iterator[None]
+        wait for a translator slot and hold it for the duration of the context
+
+    schedule_async(cost: float, tokens: int, priority_class: str | None, tenant: str | None, weight: float)
+        await a translator slot on the event loop and hold it for the duration of the context
+
+    estimate_wait(cost: float, tokens: int, priority_class: str | None, tenant: str | None, weight: float) -> float
+        estimate how long a job of the given cost would wait for a slot
+
+    is_preemptible(priority_class: str | None) -> bool
+        check whether work of a priority class should yield its slot between batches
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "aging",
+        "capacity",
+        "condition",
+        "default_priority_class",
+        "finish_tags",
+        "priority_classes",
+        "priority_ranks",
+        "running",
+        "sequence",
+        "short_token_threshold",
+        "strict_priority",
+        "virtual_time",
+        "waiting",
+    )
+
+    def __init__(
+        self,
+        *,
+        slots: int,
+        aging: float,
+        short_slots: int = 0,
+        short_token_threshold: int = 0,
+        priority_classes: dict[str, float] | None = None,
+        default_priority_class: str = "interactive",
+        strict_priority: bool = False,
+    ) -> None:
+        if short_slots and not 0 < short_slots < slots:
+            raise ValueError(f"short_slots must leave at least one of the {slots} slots to the long pool")
+
+        self.priority_classes = priority_classes or {default_priority_class: 1.0}
+
+        if default_priority_class not in self.priority_classes:
+            raise ValueError(f"the default priority class '{default_priority_class}' is not configured")
+
+        self.default_priority_class = default_priority_class
+        self.strict_priority = strict_priority
+        self.priority_ranks = {
+            name: rank for rank, name in enumerate(sorted(self.priority_classes, key=self.priority_classes.__getitem__))
+        }
+        self.aging = aging
+        self.short_token_threshold = short_token_threshold
+        self.capacity = {"short": short_slots, "long": slots - short_slots} if short_slots else {"shared": slots}
+        self.condition = Condition()
+        self.sequence = count()
+        self.waiting: dict[str, list[tuple[float, int, Job]]] = {pool: [] for pool in self.capacity}
+        self.running: dict[str, set[Job]] = {pool: set() for pool in self.capacity}
+        self.virtual_time = 0.0
+        self.finish_tags: dict[str, float] = {}
+        schedulers.add(self)
+
+    def observe_utilisation(self, _: CallbackOptions) -> Iterable[Observation]:
+        """
+        Summary
+        -------
+        callback function to observe the utilisation of each pool
+
+        Parameters
+        ----------
+        options (CallbackOptions)
+            callback options
+
+        Yields
+        ------
+        observation (Observation)
+            the share of busy slots in a pool
+        """
+        with self.condition:
+            utilisation = {pool: len(self.running[pool]) / capacity for pool, capacity in self.capacity.items()}
+
+        for pool, value in utilisation.items():
+            yield Observation(value, {"pool": pool})
+
+    def route(self, tokens: int) -> str:
+        """
+        Summary
+        -------
+        get the pool a job with the given number of input tokens is routed to
+
+        Parameters
+        ----------
+        tokens (int)
+            the number of input tokens
+
+        Returns
+        -------
+        pool (str)
+            the name of the pool
+        """
+        if "shared" in self.capacity:
+            return "shared"
+
+        return "short" if tokens < self.short_token_threshold else "long"
+
+    def is_preemptible(self, priority_class: str | None) -> bool:
+        """
+        Summary
+        -------
+        check whether work of a priority class should yield its slot between batches
+
+        Parameters
+        ----------
+        priority_class (str?)
+            the priority class, or None for the default class
+
+        Returns
+        -------
+        preemptible (bool)
+            whether the class is less urgent than the most urgent class
+        """
+        return self.priority_ranks[priority_class or self.default_priority_class] > 0
+
+    def create_job(
+        self,
+        cost: float,
+        tokens: int,
+        priority_class: str | None,
+        tenant: str | None,
+        weight: float,
+    ) -> Job:
+        """
+        Summary
+        -------
+        create a job with its weighted fair queuing finish tag, the condition must be held
+
+        Parameters
+        ----------
+        cost (float)
+            the predicted decode time of the job in seconds
+
+        tokens (int)
+            the number of input tokens, used to route the job to a pool
+
+        priority_class (str?)
+            the priority class of the job, or None for the default class
+
+        tenant (str?)
+            the tenant that submitted the job
+
+        weight (float)
+            the fair-share weight of the tenant
+
+        Returns
+        -------
+        job (Job)
+            the job
+        """
+        priority_class = priority_class or self.default_priority_class
+        scaled_cost = cost if self.strict_priority else cost * self.priority_classes[priority_class]
+        start_tag = max(self.virtual_time, self.finish_tags.get(tenant, 0.0)) if tenant else self.virtual_time
+
+        return Job(cost, self.route(tokens), priority_class, tenant, start_tag + scaled_cost / weight, monotonic())
+
+    def priority(self, job: Job) -> tuple[int, float]:
+        """
+        Summary
+        -------
+        get the static ordering key of a job, lower keys run first
+
+        Parameters
+        ----------
+        job (Job)
+            the job
+
+        Returns
+        -------
+        key (tuple[int, float])
+            the ordering key
+        """
+        rank = self.priority_ranks[job.priority_class] if self.strict_priority else 0
+        return rank, job.finish_tag + self.aging * job.enqueued_at
+
+    def free_pool(self, pool: str) -> str | None:
+        """
+        Summary
+        -------
+        get the pool whose slot a job routed to the given pool can take, the condition must be held
+
+        Parameters
+        ----------
+        pool (str)
+            the pool the job was routed to
+
+        Returns
+        -------
+        pool (str?)
+            the pool with a free slot, or None if the job has to wait
+        """
+        if len(self.running[pool]) < self.capacity[pool]:
+            return pool
+
+        for other_pool, capacity in self.capacity.items():
+            # long jobs never take the last free short slot, so short inputs always find one quickly
+            reserved = 1 if other_pool == "short" else 0
+
+            if len(self.running[other_pool]) + reserved < capacity and not self.waiting[other_pool]:
+                return other_pool
+
+        return None
+
+    def dispatch(self) -> None:
+        """
+        Summary
+        -------
+        hand the free slots to the jobs at the head of each pool, the condition must be held
+        """
+        for pool, waiting in self.waiting.items():
+            while waiting and (slot_pool := self.free_pool(pool)) is not None:
+                _, _, job = heappop(waiting)
+                queue_depth_counter.add(-1, job.attributes)
+                job.started_at = monotonic()
+                job.slot_pool = slot_pool
+                self.running[slot_pool].add(job)
+                self.virtual_time = max(self.virtual_time, job.finish_tag)
+
+                if job.wake is not None:
+                    job.wake()
+
+    def submit(
+        self,
+        cost: float,
+        tokens: int,
+        priority_class: str | None,
+        tenant: str | None,
+        weight: float,
+        *,
+        wake: Callable[[], None],
+    ) -> Job:
+        """
+        Summary
+        -------
+        queue a job and hand out any free slot, the condition must be held
+
+        Parameters
+        ----------
+        cost (float)
+            the predicted decode time of the job in seconds
+
+        tokens (int)
+            the number of input tokens, used to route the job to a pool
+
+        priority_class (str?)
+            the priority class of the job, or None for the default class
+
+        tenant (str?)
+            the tenant that submitted the job
+
+        weight (float)
+            the fair-share weight of the tenant
+
+        wake (Callable[[], None])
+            called with the condition held once the job has been handed a slot
+
+        Returns
+        -------
+        job (Job)
+            the queued job, which holds a slot once `slot_pool` is set
+        """
+        job = self.create_job(cost, tokens, priority_class, tenant, weight)
+        job.wake = wake
+
+        if tenant:
+            self.finish_tags[tenant] = job.finish_tag
+
+        heappush(self.waiting[job.pool], (self.priority(job), next(self.sequence), job))
+        queue_depth_counter.add(1, job.attributes)
+        self.dispatch()
+
+        return job
+
+    def withdraw(self, job: Job) -> None:
+        """
+        Summary
+        -------
+        remove a job that stopped waiting, releasing its slot if it was handed one in the meantime
+
+        Parameters
+        ----------
+        job (Job)
+            the job
+        """
+        with self.condition:
+            if job.slot_pool is not None:
+                self.running[job.slot_pool].discard(job)
+
+            else:
+                waiting = self.waiting[job.pool]
+                waiting[:] = [entry for entry in waiting if entry[2] is not job]
+                heapify(waiting)
+                queue_depth_counter.add(-1, job.attributes)
+
+            self.dispatch()
+
+    def finish(self, job: Job) -> None:
+        """
+        Summary
+        -------
+        release the slot of a job and hand it to the next job in line
+
+        Parameters
+        ----------
+        job (Job)
+            the job holding a slot
+        """
+        with self.condition:
+            if job.slot_pool is not None:
+                self.running[job.slot_pool].discard(job)
+
+            self.dispatch()
+
+        pool_latency_histogram.record(
+            monotonic() - job.enqueued_at,
+            job.attributes,
+        )
+
+    @contextmanager
+    def schedule(
+        self,
+        cost: float,
+        tokens: int,
+        priority_class: str | None = None,
+        tenant: str | None = None,
+        weight: float = 1.0,
+    ) -> Iterator[None]:
+        """
+        Summary
+        -------
+        wait for a translator slot and hold it for the duration of the context
+
+        Parameters
+        ----------
+        cost (float)
+            the predicted decode time of the job in seconds
+
+        tokens (int)
+            the number of input tokens, used to route the job to a pool
+
+        priority_class (str?)
+            the priority class of the job, or None for the default class
+
+        tenant (str?)
+            the tenant that submitted the job
+
+        weight (float)
+            the fair-share weight of the tenant
+        """
+        with self.condition:
+            job = self.submit(cost, tokens, priority_class, tenant, weight, wake=self.condition.notify_all)
+
+            while job.slot_pool is None:
+                self.condition.wait()
+
+        self.record_wait(job)
+
+        try:
+            yield
+
+        finally:
+            self.finish(job)
+
+    @asynccontextmanager
+    async def schedule_async(
+        self,
+        cost: float,
+        tokens: int,
+        priority_class: str | None = None,
+        tenant: str | None = None,
+        weight: float = 1.0,
+    ) -> AsyncIterator[None]:
+        """
+        Summary
+        -------
+        await a translator slot on the event loop and hold it for the duration of the context
+
+        Parameters
+        ----------
+        cost (float)
+            the predicted decode time of the job in seconds
+
+        tokens (int)
+            the number of input tokens, used to route the job to a pool
+
+        priority_class (str?)
+            the priority class of the job, or None for the default class
+
+        tenant (str?)
+            the tenant that submitted the job
+
+        weight (float)
+            the fair-share weight of the tenant
+        """
+        loop = get_running_loop()
+        granted: Future[None] = loop.create_future()
+
+        def resolve() -> None:
+            if not granted.done():
+                granted.set_result(None)
+
+        with self.condition:
+            # slots are freed by worker threads, so the future is resolved on the loop it belongs to
+            job = self.submit(
+                cost, tokens, priority_class, tenant, weight, wake=lambda: loop.call_soon_threadsafe(resolve)
+            )
+
+        try:
+            await granted
+
+        except CancelledError:
+            self.withdraw(job)
+            raise
+
+        self.record_wait(job)
+
+        try:
+            yield
+
+        finally:
+            self.finish(job)
+
+    def record_wait(self, job: Job) -> None:
+        """
+        Summary
+        -------
+        record the time a job waited for its slot
+
+        Parameters
+        ----------
+        job (Job)
+            the job holding a slot
+        """
+        queue_wait_histogram.record(
+            (job.started_at or job.enqueued_at) - job.enqueued_at,
+            job.attributes,
+        )
+
+    def estimate_wait(
+        self,
+        cost: float,
+        tokens: int,
+        priority_class: str | None = None,
+        tenant: str | None = None,
+        weight: float = 1.0,
+    ) -> float:
+        """
+        Summary
+        -------
+        estimate how long a job of the given cost would wait for a slot if it was submitted now
+
+        Parameters
+        ----------
+        cost (float)
+            the predicted decode time of the job in seconds
+
+        tokens (int)
+            the number of input tokens, used to route the job to a pool
+
+        priority_class (str?)
+            the priority class of the job, or None for the default class
+
+        tenant (str?)
+            the tenant that would submit the job
+
+        weight (float)
+            the fair-share weight of the tenant
+
+        Returns
+        -------
+        seconds (float)
+            the estimated queue wait
+        """
+        with self.condition:
+            candidate = self.create_job(cost, tokens, priority_class, tenant, weight)
+            now = candidate.enqueued_at
+            pool = candidate.pool
+            key = self.priority(candidate)
+
+            if not self.waiting[pool] and self.free_pool(pool) is not None:
+                return 0.0
+
+            remaining = sum(max(0.0, job.cost - (now - (job.started_at or now))) for job in self.running[pool])
+            ahead = sum(job.cost for priority, _, job in self.waiting[pool] if priority <= key)
+
+        return (remaining + ahead) / self.capacity[pool]
+
+
+schedulers: WeakSet[Scheduler] = WeakSet()
+
+
+def observe_pool_utilisation(options: CallbackOptions) -> Iterable[Observation]:
+    """
+    Summary
+    -------
+    callback function to observe the utilisation of each pool of every scheduler
+
+    Parameters
+    ----------
+    options (CallbackOptions)
+        callback options
+
+    Yields
+    ------
+    observation (Observation)
+        the share of busy slots in a pool
+    """
+    for scheduler in list(schedulers):
+        yield from scheduler.observe_utilisation(options)
+
+
+meter.create_observable_gauge(
+    "nllb_api_scheduler_pool_utilisation",
+    [observe_pool_utilisation],
+    "1",
+    "Share of the slots in each pool that are busy",
+)
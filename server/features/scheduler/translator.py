@@ -0,0 +1,837 @@
+from asyncio import to_thread
+from collections.abc import Callable, Hashable, Iterator, Sequence
+from time import perf_counter
+from typing import Any, Self
+
+from server.features.scheduler.context import current_admission, current_priority_class, current_tenant
+from server.features.scheduler.cost_model import CostModel
+from server.features.scheduler.scheduler import Scheduler
+from server.features.translator import TranslatorProtocol
+from server.typedefs import Language
+
+# the cost model keys, the input tokens and the decode of a request that is scheduled as one job
+type Work[T] = tuple[Sequence[Hashable], int, Callable[[], T]]
+
+
+class ScheduledTranslator(TranslatorProtocol):
+    """
+    Summary
+    -------
+    a translator that orders requests by their predicted decode time before handing them to the inner translator
+
+    Batches and fan-outs of preemptible priority classes are split into chunks of `preemption_batch_size`
+    that are scheduled one after another, so urgent requests can take the slot between chunks.
+    Requests of a tenant are admitted against its input token quota before they are queued.
+
+    The `_async` variants wait for their slot on the event loop and only move to a worker thread
+    to decode, so requests queued behind a busy translator do not occupy the threadpool.
+
+    Methods
+    -------
+    estimate(text: str, source_language: Language, target_language: Language) -> tuple[int, float, float]
+        predict the token count, decode time and queue wait of a request
+
+    translate(text: str, source_language: Language, target_language: Language) -> str
+        translate the input once the request is scheduled
+
+    translate_batch(texts: list[str], source_languages: list[Language], target_languages: list[Language]) -> list[str]
+        translate multiple inputs once the batch is scheduled
+
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages once the fan-out is scheduled
+
+    translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
+        streams the translation without queueing
+
+    translate_async(text: str, source_language: Language, target_language: Language) -> str
+        translate the input once the request is scheduled, waiting on the event loop
+
+    translate_batch_async(texts: list[str], source_languages: list[Language], target_languages: list[Language])
+        translate multiple inputs once the batch is scheduled, waiting on the event loop
+
+    translate_fanout_async(text: str, source_language: Language, target_languages: list[Language])
+        translate a single input into many target languages once the fan-out is scheduled, waiting on the event loop
+
+    unload_model(to_cpu: bool) -> bool
+        unload the model from the current device
+
+    load_model(keep_cache: bool) -> bool
+        load the model back to the initial device
+
+    count_tokens(text: str) -> int
+        count the number of tokens in the input text
+    """
+
+    __slots__ = ("cost_model", "default_decoding_profile", "preemption_batch_size", "scheduler", "translator")
+
+    def __init__(
+        self,
+        translator: TranslatorProtocol,
+        *,
+        scheduler: Scheduler,
+        cost_model: CostModel,
+        default_decoding_profile: str,
+        preemption_batch_size: int,
+    ) -> None:
+        self.translator = translator
+        self.scheduler = scheduler
+        self.cost_model = cost_model
+        self.default_decoding_profile = default_decoding_profile
+        self.preemption_batch_size = preemption_batch_size
+
+    def __enter__(self) -> Self:
+        self.translator.__enter__()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.translator.__exit__(*args)
+
+    def unload_model(self, *, to_cpu: bool) -> bool:
+        """
+        Summary
+        -------
+        unload the model from the current device
+
+        Parameters
+        ----------
+        to_cpu (bool)
+            whether to unload the model to CPU
+
+        Returns
+        -------
+        success (bool)
+            whether the model unload was executed
+        """
+        return self.translator.unload_model(to_cpu=to_cpu)
+
+    def load_model(self, *, keep_cache: bool) -> bool:
+        """
+        Summary
+        -------
+        load the model back to the initial device
+
+        Parameters
+        ----------
+        keep_cache (bool)
+            whether to keep the model cache in RAM
+
+        Returns
+        -------
+        success (bool)
+            whether the model load was executed
+        """
+        return self.translator.load_model(keep_cache=keep_cache)
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Summary
+        -------
+        count the number of tokens in the input text
+
+        Parameters
+        ----------
+        text (str)
+            the input text
+
+        Returns
+        -------
+        token_count (int)
+            the number of tokens that will be sent to the translator
+        """
+        return self.translator.count_tokens(text)
+
+    def cost_keys(
+        self,
+        source_language: Language,
+        target_language: Language,
+        profile: str | None,
+    ) -> tuple[Hashable, ...]:
+        """
+        Summary
+        -------
+        get the cost model keys of a single translation, from the most to the least specific
+
+        Parameters
+        ----------
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        keys (tuple[Hashable, ...])
+            the cost model keys
+        """
+        profile = profile or self.default_decoding_profile
+        return ("pair", profile, source_language, target_language), ("profile", profile)
+
+    def scheduling(self) -> tuple[str | None, str | None, float]:
+        """
+        Summary
+        -------
+        get the priority class, tenant and fair-share weight of the current context
+
+        Returns
+        -------
+        scheduling (tuple[str?, str?, float])
+            the priority class, the tenant name and the weight of the tenant
+        """
+        priority_class = current_priority_class.get()
+
+        if (tenant := current_tenant.get()) is None:
+            return priority_class, None, 1.0
+
+        return priority_class, tenant.name, tenant.weight
+
+    def run[T](self, keys: Sequence[Hashable], tokens: int, translate: Callable[[], T]) -> T:
+        """
+        Summary
+        -------
+        wait for the request to be scheduled, run it and feed its decode time back into the cost model
+
+        Parameters
+        ----------
+        keys (Sequence[Hashable])
+            the cost model keys of the request
+
+        tokens (int)
+            the number of input tokens
+
+        translate (Callable[[], T])
+            the translation to run
+
+        Returns
+        -------
+        result (T)
+            the result of the translation
+        """
+        cost = self.cost_model.predict(keys, tokens)
+
+        with self.scheduler.schedule(cost, tokens, *self.scheduling()):
+            start = perf_counter()
+            result = translate()
+            self.cost_model.observe(keys, tokens, perf_counter() - start)
+
+        return result
+
+    async def run_async[T](self, keys: Sequence[Hashable], tokens: int, translate: Callable[[], T]) -> T:
+        """
+        Summary
+        -------
+        await the request being scheduled, run it in a worker thread and feed its decode time back into the cost model
+
+        Parameters
+        ----------
+        keys (Sequence[Hashable])
+            the cost model keys of the request
+
+        tokens (int)
+            the number of input tokens
+
+        translate (Callable[[], T])
+            the translation to run
+
+        Returns
+        -------
+        result (T)
+            the result of the translation
+        """
+        cost = self.cost_model.predict(keys, tokens)
+
+        async with self.scheduler.schedule_async(cost, tokens, *self.scheduling()):
+            start = perf_counter()
+            result = await to_thread(translate)
+            self.cost_model.observe(keys, tokens, perf_counter() - start)
+
+        return result
+
+    def admit(self, tokens: int) -> None:
+        """
+        Summary
+        -------
+        consume the input tokens from the quota of the current tenant, if any
+
+        A request split into several translations sets the admission of the context instead,
+        so it is admitted once as a whole rather than translation by translation.
+
+        Parameters
+        ----------
+        tokens (int)
+            the number of input tokens of the translation
+        """
+        if (tenant := current_tenant.get()) is None:
+            return
+
+        if (admission := current_admission.get()) is not None:
+            tokens = admission
+
+        if tokens:
+            tenant.consume(tokens)
+
+    def chunks(self, size: int) -> list[slice]:
+        """
+        Summary
+        -------
+        split a batch into the chunks that are scheduled separately
+
+        Parameters
+        ----------
+        size (int)
+            the number of items in the batch
+
+        Returns
+        -------
+        chunks (list[slice])
+            a single chunk, or chunks of `preemption_batch_size` when the current priority class is preemptible
+        """
+        if not self.scheduler.is_preemptible(current_priority_class.get()):
+            return [slice(0, size)]
+
+        step = self.preemption_batch_size
+        return [slice(start, start + step) for start in range(0, size, step)]
+
+    def estimate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        *,
+        profile: str | None = None,
+    ) -> tuple[int, float, float]:
+        """
+        Summary
+        -------
+        predict the token count, decode time and queue wait of a request without submitting it
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        estimate (tuple[int, float, float])
+            the number of input tokens, the predicted decode time and the predicted queue wait in seconds
+        """
+        tokens = self.count_tokens(text)
+        cost = self.cost_model.predict(self.cost_keys(source_language, target_language, profile), tokens)
+
+        return tokens, cost, self.scheduler.estimate_wait(cost, tokens, *self.scheduling())
+
+    def translation_work(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Work[str]:
+        """
+        Summary
+        -------
+        admit a single translation and plan it as one job
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        work (Work[str])
+            the cost model keys, the input tokens and the decode of the translation
+        """
+        tokens = self.count_tokens(text)
+        self.admit(tokens)
+
+        return (
+            self.cost_keys(source_language, target_language, profile),
+            tokens,
+            lambda: self.translator.translate(
+                text,
+                source_language,
+                target_language,
+                min_length_percentage,
+                profile=profile,
+            ),
+        )
+
+    def batch_work(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[Work[list[str]]]:
+        """
+        Summary
+        -------
+        admit a batch and plan a job for each of its chunks
+
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        work (list[Work[list[str]]])
+            the cost model keys, the input tokens and the decode of each chunk
+        """
+        if min_length_percentages is None:
+            min_length_percentages = [0.8] * len(texts)
+
+        keys = (("batch", profile or self.default_decoding_profile),)
+        token_counts = [self.count_tokens(text) for text in texts]
+        self.admit(sum(token_counts))
+
+        return [
+            (
+                keys,
+                sum(token_counts[chunk]),
+                lambda chunk=chunk: self.translator.translate_batch(
+                    texts[chunk],
+                    source_languages[chunk],
+                    target_languages[chunk],
+                    min_length_percentages[chunk],
+                    profile=profile,
+                ),
+            )
+            for chunk in self.chunks(len(texts))
+        ]
+
+    def fanout_work(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[Work[list[str]]]:
+        """
+        Summary
+        -------
+        admit a fan-out and plan a job for each of its chunks
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        work (list[Work[list[str]]])
+            the cost model keys, the input tokens and the decode of each chunk
+        """
+        keys = (("fanout", profile or self.default_decoding_profile),)
+        tokens = self.count_tokens(text)
+        self.admit(tokens * len(target_languages))
+
+        return [
+            (
+                keys,
+                tokens * len(target_languages[chunk]),
+                lambda chunk=chunk: self.translator.translate_fanout(
+                    text,
+                    source_language,
+                    target_languages[chunk],
+                    min_length_percentage,
+                    profile=profile,
+                ),
+            )
+            for chunk in self.chunks(len(target_languages))
+        ]
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
+        """
+        Summary
+        -------
+        translate the input once the request is scheduled
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (str)
+            the translated text
+        """
+        return self.run(
+            *self.translation_work(text, source_language, target_language, min_length_percentage, profile=profile)
+        )
+
+    def translate_batch(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate multiple inputs once the batch is scheduled
+
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        return [
+            translated_text
+            for work in self.batch_work(
+                texts, source_languages, target_languages, min_length_percentages, profile=profile
+            )
+            for translated_text in self.run(*work)
+        ]
+
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages once the fan-out is scheduled
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        return [
+            translated_text
+            for work in self.fanout_work(
+                text, source_language, target_languages, min_length_percentage, profile=profile
+            )
+            for translated_text in self.run(*work)
+        ]
+
+    async def translate_async(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
+        """
+        Summary
+        -------
+        translate the input once the request is scheduled, waiting on the event loop
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (str)
+            the translated text
+        """
+        work = await to_thread(
+            self.translation_work, text, source_language, target_language, min_length_percentage, profile=profile
+        )
+        return await self.run_async(*work)
+
+    async def translate_batch_async(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate multiple inputs once the batch is scheduled, waiting on the event loop
+
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        works = await to_thread(
+            self.batch_work, texts, source_languages, target_languages, min_length_percentages, profile=profile
+        )
+        return [translated_text for work in works for translated_text in await self.run_async(*work)]
+
+    async def translate_fanout_async(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages once the fan-out is scheduled, waiting on the event loop
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        works = await to_thread(
+            self.fanout_work, text, source_language, target_languages, min_length_percentage, profile=profile
+        )
+        return [translated_text for work in works for translated_text in await self.run_async(*work)]
+
+    def translate_stream(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Summary
+        -------
+        streams the translation without queueing, as a stream holding a slot
+        across event loop turns could block every other stream waiting for one,
+        although the input is still admitted against the quota of the tenant
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (Iterator[str])
+            the translated text
+        """
+        self.admit(self.count_tokens(text))
+
+        return self.translator.translate_stream(
+            text,
+            source_language,
+            target_language,
+            min_length_percentage,
+            profile=profile,
+        )
+
+
+async def translate_scheduled(
+    translator: TranslatorProtocol,
+    operation: str,
+    *arguments: Any,
+    **keyword_arguments: Any,
+) -> Any:
+    """
+    Summary
+    -------
+    run a translator operation from the event loop, the translations of a scheduled translator
+    wait for their slot on the loop rather than in a worker thread
+
+    Parameters
+    ----------
+    translator (TranslatorProtocol)
+        the translator to run the operation on
+
+    operation (str)
+        the name of the translator method to call
+
+    arguments (Any)
+        the positional arguments of the operation
+
+    keyword_arguments (Any)
+        the keyword arguments of the operation
+
+    Returns
+    -------
+    result (Any)
+        the result of the operation
+    """
+    if isinstance(translator, ScheduledTranslator) and operation in {
+        "translate",
+        "translate_batch",
+        "translate_fanout",
+    }:
+        return await getattr(translator, f"{operation}_async")(*arguments, **keyword_arguments)
+
+    return await to_thread(getattr(translator, operation), *arguments, **keyword_arguments)
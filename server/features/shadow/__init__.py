@@ -0,0 +1,3 @@
+from server.features.shadow.comparison import PairComparison as PairComparison
+from server.features.shadow.comparison import ShadowComparison as ShadowComparison
+from server.features.shadow.translator import ShadowTranslator as ShadowTranslator
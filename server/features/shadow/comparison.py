@@ -0,0 +1,158 @@
+from threading import Lock
+from typing import NamedTuple
+
+from opentelemetry import metrics
+
+from server.typedefs import Language
+from server.utils import chrf
+
+meter = metrics.get_meter(__name__)
+
+shadow_latency_histogram = meter.create_histogram(
+    name="nllb_api_shadow_latency",
+    description="Latency of mirrored translations on the primary and the shadow configuration",
+    unit="s",
+)
+shadow_chrf_histogram = meter.create_histogram(
+    name="nllb_api_shadow_chrf",
+    description="chrF of the shadow translation against the primary translation",
+    unit="1",
+)
+
+
+class PairComparison(NamedTuple):
+    """
+    Summary
+    -------
+    the aggregated comparison of the primary and shadow configurations for one language pair
+
+    Attributes
+    ----------
+    source (Language)
+        the source language
+
+    target (Language)
+        the target language
+
+    count (int)
+        the number of compared translations
+
+    chrf (float)
+        the mean chrF of the shadow translations against the primary translations
+
+    primary_latency (float)
+        the mean latency of the primary configuration in seconds
+
+    shadow_latency (float)
+        the mean latency of the shadow configuration in seconds
+    """
+
+    source: Language
+    target: Language
+    count: int
+    chrf: float
+    primary_latency: float
+    shadow_latency: float
+
+
+class ShadowComparison:
+    """
+    Summary
+    -------
+    the running comparison of the primary and shadow configurations, per language pair
+
+    Attributes
+    ----------
+    mirrored (int)
+        the number of requests mirrored to the shadow configuration
+
+    dropped (int)
+        the number of sampled requests that were not mirrored because the shadow capacity was exhausted
+
+    failed (int)
+        the number of mirrored requests that failed on the shadow configuration
+    """
+
+    __slots__ = ("dropped", "failed", "lock", "mirrored", "totals")
+
+    def __init__(self) -> None:
+        self.mirrored = 0
+        self.dropped = 0
+        self.failed = 0
+        # count, chrF, primary latency and shadow latency sums per language pair
+        self.totals: dict[tuple[Language, Language], list[float]] = {}
+        self.lock = Lock()
+
+    def record(
+        self,
+        source_languages: list[Language],
+        target_languages: list[Language],
+        primary: list[str],
+        shadow: list[str],
+        *,
+        primary_latency: float,
+        shadow_latency: float,
+    ) -> None:
+        """
+        Summary
+        -------
+        record the translations and latencies of a mirrored request
+
+        The latencies of a request are attributed to each of its items, so batches weigh in by size.
+
+        Parameters
+        ----------
+        source_languages (list[Language])
+            the source language of each item
+
+        target_languages (list[Language])
+            the target language of each item
+
+        primary (list[str])
+            the primary translation of each item
+
+        shadow (list[str])
+            the shadow translation of each item
+
+        primary_latency (float)
+            the latency of the request on the primary configuration in seconds
+
+        shadow_latency (float)
+            the latency of the request on the shadow configuration in seconds
+        """
+        scores = [chrf(hypothesis, reference) for hypothesis, reference in zip(shadow, primary, strict=True)]
+
+        for source, target, score in zip(source_languages, target_languages, scores, strict=True):
+            attributes = {"source": source, "target": target}
+            shadow_chrf_histogram.record(score, attributes)
+            shadow_latency_histogram.record(primary_latency, {**attributes, "configuration": "primary"})
+            shadow_latency_histogram.record(shadow_latency, {**attributes, "configuration": "shadow"})
+
+        with self.lock:
+            self.mirrored += 1
+
+            for source, target, score in zip(source_languages, target_languages, scores, strict=True):
+                totals = self.totals.setdefault((source, target), [0, 0.0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += score
+                totals[2] += primary_latency
+                totals[3] += shadow_latency
+
+    def summarise(self) -> list[PairComparison]:
+        """
+        Summary
+        -------
+        get the comparison of every language pair seen so far
+
+        Returns
+        -------
+        comparisons (list[PairComparison])
+            the comparisons, most compared language pairs first
+        """
+        with self.lock:
+            comparisons = [
+                PairComparison(source, target, int(count), chrf_sum / count, primary / count, shadow / count)
+                for (source, target), (count, chrf_sum, primary, shadow) in self.totals.items()
+            ]
+
+        return sorted(comparisons, key=lambda comparison: comparison.count, reverse=True)
@@ -0,0 +1,438 @@
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from random import random
+from threading import BoundedSemaphore
+from time import perf_counter
+from typing import Self
+
+from opentelemetry import metrics
+
+from server.features.shadow.comparison import ShadowComparison
+from server.features.translator import TranslatorProtocol
+from server.logging_config import get_logger
+from server.typedefs import Language
+
+logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+shadow_dropped_counter = meter.create_counter(
+    name="nllb_api_shadow_dropped",
+    description="Number of sampled requests not mirrored because the shadow capacity was exhausted",
+    unit="1",
+)
+
+
+class ShadowTranslator(TranslatorProtocol):
+    """
+    Summary
+    -------
+    a translator that mirrors a share of its requests to a shadow configuration and compares the results
+
+    Responses always come from the primary translator. Sampled requests are translated again
+    by the shadow translator in a pool of `capacity` threads after the primary response is ready,
+    and requests sampled while every shadow thread is busy are dropped instead of queued.
+
+    Methods
+    -------
+    translate(text: str, source_language: Language, target_language: Language) -> str
+        translate the input, mirroring it when sampled
+
+    translate_batch(texts: list[str], source_languages: list[Language], target_languages: list[Language]) -> list[str]
+        translate multiple inputs, mirroring them when sampled
+
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages, mirroring it when sampled
+
+    translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
+        streams the translation without mirroring
+
+    unload_model(to_cpu: bool) -> bool
+        unload the model of the primary translator
+
+    load_model(keep_cache: bool) -> bool
+        load the model of the primary translator back
+
+    count_tokens(text: str) -> int
+        count the number of tokens in the input text
+    """
+
+    __slots__ = ("capacity", "comparison", "executor", "percentage", "profile", "shadow", "translator")
+
+    def __init__(
+        self,
+        translator: TranslatorProtocol,
+        shadow: TranslatorProtocol,
+        *,
+        percentage: float,
+        capacity: int,
+        profile: str | None,
+    ) -> None:
+        self.translator = translator
+        self.shadow = shadow
+        self.percentage = percentage
+        self.profile = profile
+        self.capacity = BoundedSemaphore(capacity)
+        self.executor = ThreadPoolExecutor(capacity, thread_name_prefix="shadow")
+        self.comparison = ShadowComparison()
+
+    def __enter__(self) -> Self:
+        self.translator.__enter__()
+
+        if self.shadow is not self.translator:
+            self.shadow.__enter__()
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.translator.__exit__(*args)
+
+        if self.shadow is not self.translator:
+            self.shadow.__exit__(*args)
+
+    def sample(self) -> bool:
+        """
+        Summary
+        -------
+        decide whether to mirror a request, reserving a shadow thread for it
+
+        Returns
+        -------
+        mirrored (bool)
+            whether the request is mirrored
+        """
+        if random() * 100 >= self.percentage:  # noqa: S311
+            return False
+
+        if self.capacity.acquire(blocking=False):
+            return True
+
+        shadow_dropped_counter.add(1)
+
+        with self.comparison.lock:
+            self.comparison.dropped += 1
+
+        return False
+
+    def mirror[T](
+        self,
+        translate: Callable[[TranslatorProtocol, str | None], T],
+        profile: str | None,
+        source_languages: list[Language],
+        target_languages: list[Language],
+        unpack: Callable[[T], list[str]],
+    ) -> T:
+        """
+        Summary
+        -------
+        run a translation on the primary translator and mirror it to the shadow translator when sampled
+
+        Parameters
+        ----------
+        translate (Callable[[TranslatorProtocol, str?], T])
+            the translation to run, given the translator and the decoding profile
+
+        profile (str?)
+            the decoding profile of the request
+
+        source_languages (list[Language])
+            the source language of each item
+
+        target_languages (list[Language])
+            the target language of each item
+
+        unpack (Callable[[T], list[str]])
+            get the translation of each item from the result
+
+        Returns
+        -------
+        result (T)
+            the result of the primary translator
+        """
+        if not self.sample():
+            return translate(self.translator, profile)
+
+        try:
+            start = perf_counter()
+            result = translate(self.translator, profile)
+            primary_latency = perf_counter() - start
+
+        except Exception:
+            self.capacity.release()
+            raise
+
+        def compare() -> None:
+            try:
+                start = perf_counter()
+                shadow_result = translate(self.shadow, self.profile or profile)
+                shadow_latency = perf_counter() - start
+
+                self.comparison.record(
+                    source_languages,
+                    target_languages,
+                    unpack(result),
+                    unpack(shadow_result),
+                    primary_latency=primary_latency,
+                    shadow_latency=shadow_latency,
+                )
+
+            except Exception:
+                logger.exception("Shadow translation failed")
+
+                with self.comparison.lock:
+                    self.comparison.failed += 1
+
+            finally:
+                self.capacity.release()
+
+        self.executor.submit(compare)
+
+        return result
+
+    def unload_model(self, *, to_cpu: bool) -> bool:
+        """
+        Summary
+        -------
+        unload the model of the primary translator
+
+        Parameters
+        ----------
+        to_cpu (bool)
+            whether to unload the model to CPU
+
+        Returns
+        -------
+        success (bool)
+            whether the model unload was executed
+        """
+        return self.translator.unload_model(to_cpu=to_cpu)
+
+    def load_model(self, *, keep_cache: bool) -> bool:
+        """
+        Summary
+        -------
+        load the model of the primary translator back to the initial device
+
+        Parameters
+        ----------
+        keep_cache (bool)
+            whether to keep the model cache in RAM
+
+        Returns
+        -------
+        success (bool)
+            whether the model load was executed
+        """
+        return self.translator.load_model(keep_cache=keep_cache)
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Summary
+        -------
+        count the number of tokens in the input text
+
+        Parameters
+        ----------
+        text (str)
+            the input text
+
+        Returns
+        -------
+        token_count (int)
+            the number of tokens that will be sent to the translator
+        """
+        return self.translator.count_tokens(text)
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
+        """
+        Summary
+        -------
+        translate the input, mirroring it when sampled
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (str)
+            the translated text
+        """
+        return self.mirror(
+            lambda translator, profile: translator.translate(
+                text,
+                source_language,
+                target_language,
+                min_length_percentage,
+                profile=profile,
+            ),
+            profile,
+            [source_language],
+            [target_language],
+            lambda translated_text: [translated_text],
+        )
+
+    def translate_batch(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate multiple inputs, mirroring them when sampled
+
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile applied to the whole batch
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        return self.mirror(
+            lambda translator, profile: translator.translate_batch(
+                texts,
+                source_languages,
+                target_languages,
+                min_length_percentages,
+                profile=profile,
+            ),
+            profile,
+            source_languages,
+            target_languages,
+            lambda translated_texts: translated_texts,
+        )
+
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages, mirroring it when sampled
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        return self.mirror(
+            lambda translator, profile: translator.translate_fanout(
+                text,
+                source_language,
+                target_languages,
+                min_length_percentage,
+                profile=profile,
+            ),
+            profile,
+            [source_language] * len(target_languages),
+            target_languages,
+            lambda translated_texts: translated_texts,
+        )
+
+    def translate_stream(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Summary
+        -------
+        streams the translation without mirroring, as a stream has no single latency to compare
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_language (Language)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (Iterator[str])
+            the translated text
+        """
+        return self.translator.translate_stream(
+            text,
+            source_language,
+            target_language,
+            min_length_percentage,
+            profile=profile,
+        )
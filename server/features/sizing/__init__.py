@@ -0,0 +1,8 @@
+from server.features.sizing.cgroup import CgroupLimits as CgroupLimits
+from server.features.sizing.cgroup import read_cgroup_limits as read_cgroup_limits
+from server.features.sizing.plan import BATCH_TOKEN_MEMORY as BATCH_TOKEN_MEMORY
+from server.features.sizing.plan import MODEL_MEMORY as MODEL_MEMORY
+from server.features.sizing.plan import SizingPlan as SizingPlan
+from server.features.sizing.plan import apply_sizing as apply_sizing
+from server.features.sizing.plan import get_model_size as get_model_size
+from server.features.sizing.plan import plan_sizing as plan_sizing
@@ -0,0 +1,87 @@
+from os import sched_getaffinity
+from pathlib import Path
+from typing import NamedTuple
+
+from server.features.placement import parse_cpu_list
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+class CgroupLimits(NamedTuple):
+    """
+    Summary
+    -------
+    the CPU and memory limits of the cgroup the process runs in
+
+    Attributes
+    ----------
+    cpus (float)
+        the CPU capacity, the smaller of the `cpu.max` quota and the number of CPUs in the cpuset
+
+    cpuset (list[int])
+        the CPUs the process may run on
+
+    memory (int?)
+        the memory limit in bytes, None when unlimited
+    """
+
+    cpus: float
+    cpuset: list[int]
+    memory: int | None
+
+
+def read_limit(path: Path) -> str | None:
+    """
+    Summary
+    -------
+    read a cgroup interface file
+
+    Parameters
+    ----------
+    path (Path)
+        the path of the file
+
+    Returns
+    -------
+    value (str?)
+        the stripped contents, None when the file does not exist or the value is `max`
+    """
+    try:
+        value = path.read_text().strip()
+
+    except OSError:
+        return None
+
+    return None if value == "max" else value
+
+
+def read_cgroup_limits(root: Path = CGROUP_ROOT) -> CgroupLimits:
+    """
+    Summary
+    -------
+    read the cgroup v2 limits, falling back to the CPU affinity and no memory limit outside of a cgroup
+
+    Parameters
+    ----------
+    root (Path)
+        the cgroup v2 directory of the process, which is the root of its cgroup namespace in a container
+
+    Returns
+    -------
+    limits (CgroupLimits)
+        the CPU and memory limits
+    """
+    allowed = sched_getaffinity(0)
+    cpus_effective = read_limit(root / "cpuset.cpus.effective")
+    cpuset = [cpu for cpu in parse_cpu_list(cpus_effective) if cpu in allowed] if cpus_effective else []
+    cpuset = cpuset or sorted(allowed)
+    cpus = float(len(cpuset))
+
+    # e.g. `200000 100000` for two CPUs, or `max 100000` without a quota
+    if (cpu_max := read_limit(root / "cpu.max")) and not cpu_max.startswith("max"):
+        quota, _, period = cpu_max.partition(" ")
+        cpus = min(cpus, int(quota) / int(period or 100000))
+
+    memory_max = read_limit(root / "memory.max")
+
+    return CgroupLimits(cpus, cpuset, int(memory_max) if memory_max else None)
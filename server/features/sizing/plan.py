@@ -0,0 +1,221 @@
+from math import floor
+from typing import NamedTuple
+
+from server.config import MODEL_SIZE_PRESETS, Config
+from server.features.sizing.cgroup import CgroupLimits, read_cgroup_limits
+
+GIB = 1024**3
+
+# the resident memory of an int8 CTranslate2 replica, including its tokeniser and runtime
+MODEL_MEMORY = {"small": int(1.2 * GIB), "medium": int(2.2 * GIB), "large": int(4.8 * GIB)}
+
+# the transient memory of a single decoded token across the layers and beams of a batch
+BATCH_TOKEN_MEMORY = {"small": 96 * 1024, "medium": 160 * 1024, "large": 320 * 1024}
+
+# a worker per this many cores, fewer workers share one copy of the weights between more translator threads
+CORES_PER_WORKER = 8
+
+# the share of the memory limit that batches adapt to stay under
+MEMORY_CEILING_SHARE = 0.9
+
+SIZED_FIELDS = ("worker_count", "translator_threads", "translator_intra_threads", "batch_max_tokens", "memory_ceiling")
+
+
+class SizingPlan(NamedTuple):
+    """
+    Summary
+    -------
+    the process, thread and batch sizes derived from the cgroup limits
+
+    Attributes
+    ----------
+    cpus (float)
+        the CPU capacity of the cgroup
+
+    memory (int?)
+        the memory limit of the cgroup in bytes
+
+    model_memory (int)
+        the estimated memory of a single replica of the models in bytes
+
+    worker_count (int)
+        the number of workers
+
+    translator_threads (int)
+        the number of batches each replica decodes in parallel
+
+    translator_intra_threads (int)
+        the number of threads each batch is computed with
+
+    batch_max_tokens (int)
+        the largest number of tokens decoded at once
+
+    memory_ceiling (int?)
+        the memory usage in bytes that batches adapt to stay under
+    """
+
+    cpus: float
+    memory: int | None
+    model_memory: int
+    worker_count: int
+    translator_threads: int
+    translator_intra_threads: int
+    batch_max_tokens: int
+    memory_ceiling: int | None
+
+
+def get_model_size(repository: str) -> str:
+    """
+    Summary
+    -------
+    get the size preset of a model repository
+
+    Parameters
+    ----------
+    repository (str)
+        the model repository
+
+    Returns
+    -------
+    model_size (str)
+        the size preset, `large` for repositories that are not a preset so the estimates err on the safe side
+    """
+    return next((size for size, preset in MODEL_SIZE_PRESETS.items() if preset == repository), "large")
+
+
+def plan_sizing(
+    limits: CgroupLimits,
+    *,
+    model_sizes: list[str],
+    inference_process: bool,
+    batch_min_tokens: int,
+    batch_max_tokens: int,
+    worker_count: int | None = None,
+    translator_threads: int | None = None,
+    translator_intra_threads: int | None = None,
+    memory_ceiling: int | None = None,
+) -> SizingPlan:
+    """
+    Summary
+    -------
+    derive the process, thread and batch sizes that fit within the cgroup limits
+
+    Parameters
+    ----------
+    limits (CgroupLimits)
+        the CPU and memory limits
+
+    model_sizes (list[str])
+        the size presets of the models every replica loads
+
+    inference_process (bool)
+        whether a single inference process loads the models for every worker
+
+    batch_min_tokens (int)
+        the smallest number of tokens decoded at once
+
+    batch_max_tokens (int)
+        the largest number of tokens decoded at once
+
+    worker_count (int?)
+        the explicitly configured number of workers
+
+    translator_threads (int?)
+        the explicitly configured number of translator threads
+
+    translator_intra_threads (int?)
+        the explicitly configured number of threads each batch is computed with
+
+    memory_ceiling (int?)
+        the explicitly configured memory ceiling in bytes
+
+    Returns
+    -------
+    plan (SizingPlan)
+        the sizing plan
+    """
+    cores = max(1, floor(limits.cpus))
+    model_memory = sum(MODEL_MEMORY[size] for size in model_sizes)
+    token_memory = max(BATCH_TOKEN_MEMORY[size] for size in model_sizes)
+    memory_ceiling = memory_ceiling or (int(limits.memory * MEMORY_CEILING_SHARE) if limits.memory else None)
+    # every worker holds its own copy of the weights and room for a full batch,
+    # unless the inference process holds the only copy
+    replica_memory = model_memory + token_memory * batch_max_tokens
+    fitting_replicas = max(1, memory_ceiling // replica_memory) if memory_ceiling else cores
+
+    if worker_count is None:
+        worker_count = max(1, cores // CORES_PER_WORKER)
+        worker_count = worker_count if inference_process else min(worker_count, fitting_replicas)
+
+    replicas = 1 if inference_process else worker_count
+    replica_cores = max(1, cores // replicas)
+
+    if translator_threads is None:
+        if translator_intra_threads is None:
+            # two threads per batch once there are enough cores, so single requests still decode quickly
+            translator_intra_threads = 1 if replica_cores < 4 else 2  # noqa: PLR2004
+
+        translator_threads = max(1, replica_cores // translator_intra_threads)
+
+    elif translator_intra_threads is None:
+        translator_intra_threads = max(1, replica_cores // translator_threads)
+
+    if memory_ceiling:
+        headroom = memory_ceiling // replicas - model_memory
+        # the translator threads decode their batches at the same time
+        batch_max_tokens = min(batch_max_tokens, max(batch_min_tokens, headroom // (token_memory * translator_threads)))
+
+    return SizingPlan(
+        limits.cpus,
+        limits.memory,
+        model_memory,
+        worker_count,
+        translator_threads,
+        translator_intra_threads,
+        batch_max_tokens,
+        memory_ceiling,
+    )
+
+
+def apply_sizing(config: Config) -> SizingPlan | None:
+    """
+    Summary
+    -------
+    size the workers, threads and batches of the config from the cgroup limits, keeping any value set explicitly
+
+    Parameters
+    ----------
+    config (Config)
+        the application config, updated in place
+
+    Returns
+    -------
+    plan (SizingPlan?)
+        the sizing plan, None when automatic sizing is disabled
+    """
+    if not config.auto_sizing:
+        return None
+
+    explicit = config.model_fields_set
+    repositories = [config.get_translator_repository()]
+
+    if config.cascade_repository:
+        repositories.append(config.cascade_repository)
+
+    plan = plan_sizing(
+        read_cgroup_limits(),
+        model_sizes=[get_model_size(repository) for repository in repositories],
+        inference_process=bool(config.inference_socket),
+        batch_min_tokens=config.batch_min_tokens,
+        batch_max_tokens=config.batch_max_tokens,
+        worker_count=config.worker_count if "worker_count" in explicit else None,
+        translator_threads=config.translator_threads if "translator_threads" in explicit else None,
+        translator_intra_threads=config.translator_intra_threads if "translator_intra_threads" in explicit else None,
+        memory_ceiling=config.memory_ceiling if "memory_ceiling" in explicit else None,
+    )
+
+    for field in SIZED_FIELDS:
+        if field not in explicit:
+            setattr(config, field, getattr(plan, field))
+
+    return plan
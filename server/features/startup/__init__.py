@@ -0,0 +1,5 @@
+from server.features.startup.profiler import get_process_age as get_process_age
+from server.features.startup.profiler import log_startup_profile as log_startup_profile
+from server.features.startup.profiler import measure_startup as measure_startup
+from server.features.startup.profiler import record_startup_phase as record_startup_phase
+from server.features.startup.profiler import startup_phases as startup_phases
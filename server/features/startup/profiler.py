@@ -0,0 +1,125 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from os import sysconf
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+startup_phases: dict[str, float] = {}
+startup_phases_lock = Lock()
+
+
+def get_process_age() -> float:
+    """
+    Summary
+    -------
+    get the time since the current process was started, which includes the interpreter start-up and imports
+
+    Returns
+    -------
+    seconds (float)
+        the age of the process, or 0.0 when it cannot be read
+    """
+    try:
+        uptime = float(Path("/proc/uptime").read_text().split()[0])
+        # the command name may contain spaces, so the fields are counted from its closing parenthesis
+        stat_fields = Path("/proc/self/stat").read_text().rpartition(")")[2].split()
+
+    except OSError:
+        return 0.0
+
+    return max(0.0, uptime - int(stat_fields[19]) / sysconf("SC_CLK_TCK"))
+
+
+def record_startup_phase(phase: str, seconds: float) -> None:
+    """
+    Summary
+    -------
+    record the duration of a startup phase, accumulating repeated measurements, e.g. for both models of the cascade
+
+    Parameters
+    ----------
+    phase (str)
+        the name of the phase
+
+    seconds (float)
+        the duration of the phase
+    """
+    with startup_phases_lock:
+        startup_phases[phase] = startup_phases.get(phase, 0.0) + seconds
+
+    logger.debug("Startup phase complete", phase=phase, duration_seconds=seconds)
+
+
+@contextmanager
+def measure_startup(phase: str) -> Iterator[None]:
+    """
+    Summary
+    -------
+    record the time spent within the context as a startup phase
+
+    Parameters
+    ----------
+    phase (str)
+        the name of the phase
+    """
+    start = perf_counter()
+
+    try:
+        yield
+
+    finally:
+        record_startup_phase(phase, perf_counter() - start)
+
+
+def log_startup_profile() -> None:
+    """
+    Summary
+    -------
+    record the time from process start until every model is ready and log the duration of every startup phase
+    """
+    record_startup_phase("time_to_ready", get_process_age())
+
+    with startup_phases_lock:
+        phases = dict(startup_phases)
+
+    logger.info("Startup profile", phases=phases, time_to_ready_seconds=phases["time_to_ready"])
+
+
+def observe_startup_phases(_: CallbackOptions) -> Iterable[Observation]:
+    """
+    Summary
+    -------
+    callback function to observe the duration of each startup phase
+
+    Parameters
+    ----------
+    options (CallbackOptions)
+        callback options
+
+    Yields
+    ------
+    observation (Observation)
+        the duration of a startup phase
+    """
+    with startup_phases_lock:
+        phases = list(startup_phases.items())
+
+    for phase, seconds in phases:
+        yield Observation(seconds, {"phase": phase})
+
+
+meter.create_observable_gauge(
+    "nllb_api_startup_phase_seconds",
+    [observe_startup_phases],
+    "s",
+    "Time spent in each startup phase, phases of concurrently loaded models overlap",
+)
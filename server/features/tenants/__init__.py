@@ -0,0 +1,3 @@
+from server.features.tenants.bucket import QuotaExceededError as QuotaExceededError
+from server.features.tenants.bucket import TenantBucket as TenantBucket
+from server.features.tenants.registry import get_tenant_buckets as get_tenant_buckets
@@ -0,0 +1,90 @@
+from threading import Lock
+from time import monotonic
+
+from opentelemetry import metrics
+
+meter = metrics.get_meter(__name__)
+
+tenant_input_tokens_counter = meter.create_counter(
+    name="nllb_api_tenant_input_tokens",
+    description="Number of input tokens admitted for each tenant",
+    unit="1",
+)
+tenant_throttled_counter = meter.create_counter(
+    name="nllb_api_tenant_throttled",
+    description="Number of requests rejected because the tenant exceeded its quota",
+    unit="1",
+)
+
+
+class QuotaExceededError(Exception):
+    """
+    Summary
+    -------
+    raised when a tenant has exhausted its input token quota
+
+    Attributes
+    ----------
+    tenant (str)
+        the name of the tenant
+
+    retry_after (float)
+        the number of seconds until the request would be admitted
+    """
+
+    def __init__(self, tenant: str, retry_after: float) -> None:
+        super().__init__(f"tenant '{tenant}' exceeded its input token quota, retry after {retry_after:.2f}s")
+        self.tenant = tenant
+        self.retry_after = retry_after
+
+
+class TenantBucket:
+    """
+    Summary
+    -------
+    the in-process quota and fair-share weight of a tenant, with a token bucket refilled in input tokens per second
+
+    Methods
+    -------
+    consume(tokens: int) -> None
+        admit a request with the given number of input tokens or raise `QuotaExceededError`
+    """
+
+    __slots__ = ("capacity", "lock", "name", "rate", "tokens", "updated_at", "weight")
+
+    def __init__(self, name: str, *, rate: float, capacity: float, weight: float) -> None:
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.weight = weight
+        self.tokens = capacity
+        self.updated_at = monotonic()
+        self.lock = Lock()
+
+    def consume(self, tokens: int) -> None:
+        """
+        Summary
+        -------
+        admit a request with the given number of input tokens or raise `QuotaExceededError`
+
+        Requests larger than the bucket are admitted once the bucket is full and leave it in debt,
+        so they are throttled rather than rejected forever.
+
+        Parameters
+        ----------
+        tokens (int)
+            the number of input tokens of the request
+        """
+        with self.lock:
+            now = monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            deficit = min(tokens, self.capacity) - self.tokens
+
+            if deficit > 0:
+                tenant_throttled_counter.add(1, {"tenant": self.name})
+                raise QuotaExceededError(self.name, deficit / self.rate)
+
+            self.tokens -= tokens
+
+        tenant_input_tokens_counter.add(tokens, {"tenant": self.name})
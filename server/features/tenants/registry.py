@@ -0,0 +1,29 @@
+from server.config import Tenant
+from server.features.tenants.bucket import TenantBucket
+
+
+def get_tenant_buckets(tenants: dict[str, Tenant]) -> dict[str, TenantBucket]:
+    """
+    Summary
+    -------
+    get the tenant buckets keyed by their API key, so each request resolves its tenant in O(1)
+
+    Parameters
+    ----------
+    tenants (dict[str, Tenant])
+        the configured tenants keyed by name
+
+    Returns
+    -------
+    tenant_buckets (dict[str, TenantBucket])
+        the tenant buckets keyed by API key
+    """
+    return {
+        tenant.api_key: TenantBucket(
+            name,
+            rate=tenant.tokens_per_second,
+            capacity=tenant.burst or tenant.tokens_per_second,
+            weight=tenant.weight,
+        )
+        for name, tenant in tenants.items()
+    }
@@ -1,2 +1,5 @@
+from server.features.translator.calibration import calibrate_compute_type as calibrate_compute_type
+from server.features.translator.cascade import get_cascade_translator as get_cascade_translator
 from server.features.translator.nllb import get_translator as get_translator
+from server.features.translator.nllb import load_tokeniser as load_tokeniser
 from server.features.translator.protocol import TranslatorProtocol as TranslatorProtocol
@@ -0,0 +1,185 @@
+from collections.abc import Callable
+from hashlib import sha256
+from json import JSONDecodeError, dumps, loads
+from os import getpid
+from pathlib import Path
+from platform import processor
+from statistics import fmean
+from time import perf_counter
+
+from ctranslate2 import get_supported_compute_types
+
+from server.features.translator.protocol import TranslatorProtocol
+from server.logging_config import get_logger
+from server.typedefs import Language
+from server.utils import chrf
+
+logger = get_logger(__name__)
+
+# a UI string, a sentence and a paragraph, translated into languages of three scripts
+CALIBRATION_TEXTS = [
+    "Please enter your password to continue.",
+    "The quick brown fox jumps over the lazy dog while the farmer watches from the porch.",
+    (
+        "Machine translation has improved considerably over the last decade. Modern models translate "
+        "between hundreds of languages, yet long documents still take noticeably longer to decode."
+    ),
+]
+CALIBRATION_TARGETS: list[Language] = ["spa_Latn", "rus_Cyrl", "zho_Hans"]
+CALIBRATION_ROUNDS = 3
+
+# the mean chrF against the reference output below which a compute type is rejected
+MIN_CHRF = 90.0
+
+
+def get_cpu_model() -> str:
+    """
+    Summary
+    -------
+    get the model name of the CPU, which determines the instructions and speed of each compute type
+
+    Returns
+    -------
+    cpu_model (str)
+        the CPU model name
+    """
+    try:
+        for line in Path("/proc/cpuinfo").read_text().splitlines():
+            if line.startswith("model name"):
+                return line.partition(":")[2].strip()
+
+    except OSError:
+        pass
+
+    return processor() or "unknown"
+
+
+def get_model_hash(model_path: str) -> str:
+    """
+    Summary
+    -------
+    get a hash that identifies the model, without reading its weights
+
+    Parameters
+    ----------
+    model_path (str)
+        the path to the model
+
+    Returns
+    -------
+    model_hash (str)
+        the hash of the model config, file names and file sizes
+    """
+    digest = sha256()
+    path = Path(model_path)
+
+    for file in sorted(path.iterdir()):
+        if file.is_file():
+            digest.update(f"{file.name}:{file.stat().st_size}\n".encode())
+
+    if (config := path / "config.json").is_file():
+        digest.update(config.read_bytes())
+
+    return digest.hexdigest()[:16]
+
+
+def measure_compute_type(translator: TranslatorProtocol) -> tuple[float, list[str]]:
+    """
+    Summary
+    -------
+    time the calibration workload
+
+    Parameters
+    ----------
+    translator (TranslatorProtocol)
+        the translator built with the compute type
+
+    Returns
+    -------
+    measurement (tuple[float, list[str]])
+        the fastest round in seconds and the translations
+    """
+    texts = [text for text in CALIBRATION_TEXTS for _ in CALIBRATION_TARGETS]
+    sources: list[Language] = ["eng_Latn"] * len(texts)
+    targets = CALIBRATION_TARGETS * len(CALIBRATION_TEXTS)
+    # the first round pays for the allocations of the compute type
+    translations = translator.translate_batch(texts, sources, targets)
+    durations: list[float] = []
+
+    for _ in range(CALIBRATION_ROUNDS):
+        start = perf_counter()
+        translator.translate_batch(texts, sources, targets)
+        durations.append(perf_counter() - start)
+
+    return min(durations), translations
+
+
+def calibrate_compute_type(
+    model_path: str,
+    *,
+    build: Callable[[str], TranslatorProtocol],
+    cache_path: Path,
+) -> str:
+    """
+    Summary
+    -------
+    pick the fastest CPU compute type whose translations match those of the most precise one,
+    caching the choice on disk for the CPU model and model
+
+    Parameters
+    ----------
+    model_path (str)
+        the path to the model
+
+    build (Callable[[str], TranslatorProtocol])
+        builds a translator of the model with the given compute type
+
+    cache_path (Path)
+        the JSON file the calibrated compute types are cached in
+
+    Returns
+    -------
+    compute_type (str)
+        the calibrated compute type
+    """
+    key = f"{get_cpu_model()}:{get_model_hash(model_path)}"
+
+    try:
+        cache = loads(cache_path.read_text())
+
+    except (OSError, JSONDecodeError):
+        cache = {}
+
+    if key in cache:
+        logger.info("Compute type calibration cached", compute_type=cache[key]["compute_type"], cache_key=key)
+        return cache[key]["compute_type"]
+
+    supported = sorted(get_supported_compute_types("cpu"))
+    reference_type = "float32" if "float32" in supported else supported[0]
+    durations: dict[str, float] = {}
+    scores: dict[str, float] = {}
+    reference: list[str] = []
+
+    candidates = [reference_type, *(candidate for candidate in supported if candidate != reference_type)]
+
+    for compute_type in candidates:
+        with build(compute_type) as translator:
+            durations[compute_type], translations = measure_compute_type(translator)
+
+        reference = reference or translations
+        scores[compute_type] = fmean(
+            chrf(translation, expected) for translation, expected in zip(translations, reference, strict=True)
+        )
+
+    # the reference always passes, as it is compared against itself
+    passing = [candidate for candidate in candidates if scores[candidate] >= MIN_CHRF]
+    compute_type = min(passing, key=durations.__getitem__)
+    cache[key] = {"compute_type": compute_type, "durations": durations, "chrf": scores}
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # replace the cache in one step, so concurrent workers never read a partial file
+    temporary_path = cache_path.with_suffix(f".{getpid()}.tmp")
+    temporary_path.write_text(dumps(cache, indent=2))
+    temporary_path.replace(cache_path)
+    logger.info("Compute type calibrated", compute_type=compute_type, durations=durations, chrf=scores, cache_key=key)
+
+    return compute_type
@@ -0,0 +1,528 @@
+from collections.abc import Callable, Iterator
+from math import exp
+from time import perf_counter
+from typing import Self
+
+from opentelemetry import metrics
+
+from server.config import DecodingProfile
+from server.features.memory import BatchTokenBudget
+from server.features.readiness import Component
+from server.features.translator.nllb import Translator, get_translator
+from server.features.translator.protocol import TranslatorProtocol
+from server.logging_config import get_logger
+from server.typedefs import Language, ScoredTranslation
+
+logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+cascade_items_counter = meter.create_counter(
+    name="nllb_api_cascade_items",
+    description="Number of items translated by the cascade, labelled by whether they were escalated",
+    unit="1",
+)
+cascade_tier_duration_histogram = meter.create_histogram(
+    name="nllb_api_cascade_tier_duration",
+    description="Time spent translating in each tier of the cascade",
+    unit="s",
+)
+
+
+def estimate_confidence(translation: ScoredTranslation) -> float:
+    """
+    Summary
+    -------
+    estimate the confidence of a translation from its normalised log-probability,
+    its length ratio against the source and how repetitive its output is
+
+    Parameters
+    ----------
+    translation (ScoredTranslation)
+        the scored translation
+
+    Returns
+    -------
+    confidence (float)
+        the confidence between 0.0 and 1.0
+    """
+    confidence = exp(min(translation.score, 0.0))
+    target_length = len(translation.tokens)
+    length_ratio = target_length / max(1, translation.source_length)
+
+    if not 0.5 <= length_ratio <= 2.0:  # noqa: PLR2004
+        confidence *= 0.5
+
+    trigrams = [tuple(translation.tokens[index : index + 3]) for index in range(target_length - 2)]
+
+    if trigrams:
+        confidence *= len(set(trigrams)) / len(trigrams)
+
+    return confidence
+
+
+class CascadeTranslator(TranslatorProtocol):
+    """
+    Summary
+    -------
+    a translator that serves requests with a small model and re-translates
+    low-confidence items with a large model
+
+    Methods
+    -------
+    translate(text: str, source_language: Language, target_language: Language) -> str
+        translate the input, escalating to the large model when the confidence is low
+
+    translate_batch(texts: list[str], source_languages: list[Language], target_languages: list[Language]) -> list[str]
+        translate multiple inputs, escalating only the low-confidence items
+
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages, escalating only the low-confidence targets
+
+    translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
+        streams the translation from the small model
+
+    unload_model(to_cpu: bool) -> bool
+        unload both models from the current device
+
+    load_model(keep_cache: bool) -> bool
+        load both models back to the initial device
+
+    count_tokens(text: str) -> int
+        count the number of tokens in the input text
+    """
+
+    __slots__ = ("confidence_threshold", "large", "small")
+
+    def __init__(self, small: Translator, large: Translator, *, confidence_threshold: float) -> None:
+        self.small = small
+        self.large = large
+        self.confidence_threshold = confidence_threshold
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.small.__exit__(*args)
+        self.large.__exit__(*args)
+
+    def unload_model(self, *, to_cpu: bool) -> bool:
+        """
+        Summary
+        -------
+        unload both models from the current device
+
+        Parameters
+        ----------
+        to_cpu (bool)
+            whether to unload the models to CPU
+
+        Returns
+        -------
+        success (bool)
+            whether any model unload was executed
+        """
+        small_unloaded = self.small.unload_model(to_cpu=to_cpu)
+        large_unloaded = self.large.unload_model(to_cpu=to_cpu)
+        return small_unloaded or large_unloaded
+
+    def load_model(self, *, keep_cache: bool) -> bool:
+        """
+        Summary
+        -------
+        load both models back to the initial device
+
+        Parameters
+        ----------
+        keep_cache (bool)
+            whether to keep the model cache in RAM
+
+        Returns
+        -------
+        success (bool)
+            whether any model load was executed
+        """
+        small_loaded = self.small.load_model(keep_cache=keep_cache)
+        large_loaded = self.large.load_model(keep_cache=keep_cache)
+        return small_loaded or large_loaded
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Summary
+        -------
+        count the number of tokens in the input text
+
+        Parameters
+        ----------
+        text (str)
+            the input text
+
+        Returns
+        -------
+        token_count (int)
+            the number of tokens that will be sent to the translator
+        """
+        return self.small.count_tokens(text)
+
+    def translate_batch(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate multiple inputs with the small model and re-translate low-confidence items with the large model
+
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile applied to both tiers
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        if not texts:
+            return []
+
+        if min_length_percentages is None:
+            min_length_percentages = [0.8] * len(texts)
+
+        start = perf_counter()
+        translations = self.small.translate_batch_scored(
+            texts,
+            source_languages,
+            target_languages,
+            min_length_percentages,
+            profile=profile,
+        )
+        cascade_tier_duration_histogram.record(perf_counter() - start, {"tier": "small"})
+
+        return self.escalate(
+            translations,
+            lambda escalated: self.large.translate_batch(
+                [texts[index] for index in escalated],
+                [source_languages[index] for index in escalated],
+                [target_languages[index] for index in escalated],
+                [min_length_percentages[index] for index in escalated],
+                profile=profile,
+            ),
+        )
+
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages with the small model and
+        re-translate the low-confidence targets with the large model
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile applied to both tiers
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        start = perf_counter()
+        translations = self.small.translate_fanout_scored(
+            text,
+            source_language,
+            target_languages,
+            min_length_percentage,
+            profile=profile,
+        )
+        cascade_tier_duration_histogram.record(perf_counter() - start, {"tier": "small"})
+
+        return self.escalate(
+            translations,
+            lambda escalated: self.large.translate_fanout(
+                text,
+                source_language,
+                [target_languages[index] for index in escalated],
+                min_length_percentage,
+                profile=profile,
+            ),
+        )
+
+    def escalate(
+        self,
+        translations: list[ScoredTranslation],
+        retranslate: Callable[[list[int]], list[str]],
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        replace the low-confidence translations of the small model with translations from the large model
+
+        Parameters
+        ----------
+        translations (list[ScoredTranslation])
+            the scored translations of the small model
+
+        retranslate (Callable[[list[int]], list[str]])
+            a function that translates the items at the given indices with the large model
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        translated_texts = [translation.text for translation in translations]
+        escalated = [
+            index
+            for index, translation in enumerate(translations)
+            if estimate_confidence(translation) < self.confidence_threshold
+        ]
+
+        cascade_items_counter.add(len(translations) - len(escalated), {"escalated": False})
+
+        if not escalated:
+            return translated_texts
+
+        start = perf_counter()
+        escalated_texts = retranslate(escalated)
+        cascade_tier_duration_histogram.record(perf_counter() - start, {"tier": "large"})
+        cascade_items_counter.add(len(escalated), {"escalated": True})
+
+        logger.debug("Escalated low-confidence items", batch_size=len(translations), escalated=len(escalated))
+
+        for index, escalated_text in zip(escalated, escalated_texts, strict=True):
+            translated_texts[index] = escalated_text
+
+        return translated_texts
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
+        """
+        Summary
+        -------
+        translate the input with the small model, escalating to the large model when the confidence is low
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Languages)
+            the source language
+
+        target_language (Languages)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (str)
+            the translated text
+        """
+        return self.translate_batch(
+            [text],
+            [source_language],
+            [target_language],
+            [min_length_percentage],
+            profile=profile,
+        )[0]
+
+    def translate_stream(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Iterator[str]:
+        """
+        Summary
+        -------
+        streams the translation from the small model, as tokens sent to the client cannot be escalated
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Languages)
+            the source language
+
+        target_language (Languages)
+            the target language
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_text (Iterator[str])
+            the translated text
+        """
+        return self.small.translate_stream(
+            text,
+            source_language,
+            target_language,
+            min_length_percentage,
+            profile=profile,
+        )
+
+
+def get_cascade_translator(
+    small_repository: str,
+    large_repository: str,
+    *,
+    confidence_threshold: float,
+    translator_threads: int,
+    translator_intra_threads: int,
+    compute_type: str,
+    calibration_cache: str,
+    model_prefetch: str,
+    model_lock: bool,
+    testing: bool,
+    use_cuda: bool,
+    decoding_profiles: dict[str, DecodingProfile],
+    default_decoding_profile: str,
+    batch_budget: BatchTokenBudget | None,
+    component: Component,
+) -> TranslatorProtocol:
+    """
+    Summary
+    -------
+    get a translator that cascades from a small model to a large model
+
+    Parameters
+    ----------
+    small_repository (str)
+        the repository to download the small model from
+
+    large_repository (str)
+        the repository to download the large model from
+
+    confidence_threshold (float)
+        the confidence below which items are re-translated with the large model
+
+    translator_threads (int)
+        the number of threads to use for each translator
+
+    translator_intra_threads (int)
+        the number of threads each translator thread computes a batch with, `0` uses the CTranslate2 default
+
+    compute_type (str)
+        the CTranslate2 compute type of both tiers, `calibrate` calibrates each tier
+
+    calibration_cache (str)
+        the JSON file the calibrated compute types are cached in
+
+    model_prefetch (str)
+        how the model files of each tier are brought into the page cache, `off`, `readahead` or `read`
+
+    model_lock (bool)
+        whether to lock the loaded models and tokenisers into RAM
+
+    testing (bool)
+        whether the application is running in testing mode
+
+    use_cuda (bool)
+        whether to use CUDA for inference
+
+    decoding_profiles (dict[str, DecodingProfile])
+        the named decoding profiles that requests can select from
+
+    default_decoding_profile (str)
+        the decoding profile used when a request does not select one
+
+    batch_budget (BatchTokenBudget?)
+        the adaptive limit on the number of tokens decoded at once, shared by both tiers
+
+    component (Component)
+        the readiness component that reports the download and loading progress of both tiers
+
+    Returns
+    -------
+    translator (TranslatorProtocol)
+        the cascade translator
+    """
+    small, large = (
+        get_translator(
+            repository,
+            translator_threads=translator_threads,
+            translator_intra_threads=translator_intra_threads,
+            compute_type=compute_type,
+            calibration_cache=calibration_cache,
+            model_prefetch=model_prefetch,
+            model_lock=model_lock,
+            stub=False,
+            testing=testing,
+            use_cuda=use_cuda,
+            decoding_profiles=decoding_profiles,
+            default_decoding_profile=default_decoding_profile,
+            batch_budget=batch_budget,
+            component=component,
+        )
+        for repository in (small_repository, large_repository)
+    )
+
+    if not isinstance(small, Translator) or not isinstance(large, Translator):
+        raise TypeError("the cascade requires CTranslate2 translators for both tiers")
+
+    logger.info(
+        "Cascade translator initialised",
+        small_repository=small_repository,
+        large_repository=large_repository,
+        confidence_threshold=confidence_threshold,
+    )
+
+    return CascadeTranslator(small, large, confidence_threshold=confidence_threshold)
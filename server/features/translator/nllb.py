@@ -1,14 +1,30 @@
 from collections.abc import Iterator
+from functools import cache
 from pathlib import Path
 from typing import Self
 
 from ctranslate2 import Translator as CTranslator
 from tokenizers import Tokenizer
 
+from server.config import DecodingProfile
+from server.features.memory import (
+    BatchTokenBudget,
+    get_locked_memory,
+    get_memory_usage,
+    get_model_files,
+    get_resident_memory,
+    lock_memory,
+    measure_footprint,
+    memory_footprint,
+    prefetch_model,
+)
+from server.features.readiness import Component
+from server.features.startup import measure_startup
+from server.features.translator.calibration import calibrate_compute_type
 from server.features.translator.protocol import TranslatorProtocol
 from server.features.translator.stub import TranslatorStub
 from server.logging_config import get_logger
-from server.typedefs import Language
+from server.typedefs import Language, ScoredTranslation
 from server.utils import huggingface_download
 
 logger = get_logger(__name__)
@@ -28,6 +44,12 @@ class Translator(TranslatorProtocol):
     translate(text: str, source_language: Language, target_language: Language) -> str
         translate the input from the source language to the target language
 
+    translate_batch_scored(texts: list[str], source_languages: list[Language], target_languages: list[Language])
+        translate multiple inputs in batch, keeping the hypothesis scores
+
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages with one batched decode
+
     translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
         streams the translation input from the source language to the target language
 
@@ -39,14 +61,29 @@ class Translator(TranslatorProtocol):
 
     count_tokens(text: str) -> int
         count the number of tokens in the input text
+
+    get_decoding_profile(name: str | None) -> DecodingProfile
+        get a decoding profile by name, falling back to the default profile
     """
 
-    __slots__ = ("tokeniser", "translator", "use_cuda")
+    __slots__ = ("batch_budget", "decoding_profiles", "default_decoding_profile", "tokeniser", "translator", "use_cuda")
 
-    def __init__(self, translator: CTranslator, tokeniser: Tokenizer, *, use_cuda: bool) -> None:
+    def __init__(
+        self,
+        translator: CTranslator,
+        tokeniser: Tokenizer,
+        *,
+        use_cuda: bool,
+        decoding_profiles: dict[str, DecodingProfile],
+        default_decoding_profile: str,
+        batch_budget: BatchTokenBudget | None,
+    ) -> None:
         self.tokeniser = tokeniser
         self.translator = translator
         self.use_cuda = use_cuda
+        self.decoding_profiles = decoding_profiles
+        self.default_decoding_profile = default_decoding_profile
+        self.batch_budget = batch_budget
 
     def __enter__(self) -> Self:
         return self
@@ -74,7 +111,14 @@ class Translator(TranslatorProtocol):
         if not self.translator.model_is_loaded:
             return False
 
-        self.translator.unload_model(to_cpu=self.use_cuda and to_cpu)
+        if self.use_cuda and to_cpu:
+            # the weights moved back to RAM are reported as the model cache
+            with measure_footprint("cache"):
+                self.translator.unload_model(to_cpu=True)
+
+        else:
+            self.translator.unload_model(to_cpu=False)
+
         return True
 
     def load_model(self, *, keep_cache: bool) -> bool:
@@ -97,6 +141,10 @@ class Translator(TranslatorProtocol):
             return False
 
         self.translator.load_model(keep_cache=self.use_cuda and keep_cache)
+
+        if not keep_cache:
+            memory_footprint.pop("cache", None)
+
         return True
 
     def count_tokens(self, text: str) -> int:
@@ -117,8 +165,32 @@ class Translator(TranslatorProtocol):
         """
         return len(self.tokeniser.encode(text)) + 1
 
+    def get_decoding_profile(self, name: str | None) -> DecodingProfile:
+        """
+        Summary
+        -------
+        get a decoding profile by name, falling back to the default profile
+
+        Parameters
+        ----------
+        name (str?)
+            the name of the decoding profile
+
+        Returns
+        -------
+        decoding_profile (DecodingProfile)
+            the decoding profile
+        """
+        return self.decoding_profiles[name or self.default_decoding_profile]
+
     def translate_generator(
-        self, text: str, source_language: Language, target_language: Language, min_length_percentage: float = 0.8
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
     ) -> Iterator[int]:
         """
         Summary
@@ -141,10 +213,14 @@ class Translator(TranslatorProtocol):
             Defaults to 0.8 (80%). Used to prevent early stopping in NLLB models.
             See: https://huggingface.co/facebook/nllb-200-distilled-600M/discussions/6
 
+        profile (str?)
+            the decoding profile, token generation is always greedy so only its penalties apply
+
         Returns
         -------
         token_indices (Iterator[int]) : the translated tokens indices
         """
+        decoding_profile = self.get_decoding_profile(profile)
         input_length = len(text)
         logger.debug(
             "Starting translation generation",
@@ -152,6 +228,7 @@ class Translator(TranslatorProtocol):
             source_language=source_language,
             target_language=target_language,
             min_length_percentage=min_length_percentage,
+            profile=profile,
             text_preview=text[:100] + "..." if len(text) > 100 else text,
         )
         
@@ -168,7 +245,8 @@ class Translator(TranslatorProtocol):
             max_decoding_length=4096,
             min_decoding_length=min_decoding_length,
             sampling_temperature=0,
-            no_repeat_ngram_size=3,
+            repetition_penalty=decoding_profile.repetition_penalty,
+            no_repeat_ngram_size=decoding_profile.no_repeat_ngram_size,
             suppress_sequences=(target_prefix,),
         )
 
@@ -209,12 +287,61 @@ class Translator(TranslatorProtocol):
         source_languages: list[Language],
         target_languages: list[Language],
         min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
     ) -> list[str]:
         """
         Summary
         -------
         translate multiple inputs from source languages to target languages in batch
 
+        Parameters
+        ----------
+        texts (list[str])
+            list of input texts to translate
+
+        source_languages (list[Language])
+            list of source languages corresponding to each text
+
+        target_languages (list[Language])
+            list of target languages corresponding to each text
+
+        min_length_percentages (list[float] | None)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile applied to the whole batch
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as input
+        """
+        return [
+            translation.text
+            for translation in self.translate_batch_scored(
+                texts,
+                source_languages,
+                target_languages,
+                min_length_percentages,
+                profile=profile,
+            )
+        ]
+
+    def translate_batch_scored(
+        self,
+        texts: list[str],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
+    ) -> list[ScoredTranslation]:
+        """
+        Summary
+        -------
+        translate multiple inputs in batch, keeping the hypothesis scores
+
         Parameters
         ----------
         texts (list[str])
@@ -233,10 +360,13 @@ class Translator(TranslatorProtocol):
             Used to prevent early stopping in NLLB models.
             See: https://huggingface.co/facebook/nllb-200-distilled-600M/discussions/6
 
+        profile (str?)
+            the decoding profile applied to the whole batch
+
         Returns
         -------
-        translated_texts (list[str])
-            list of translated texts in the same order as input
+        translations (list[ScoredTranslation])
+            list of scored translations in the same order as input
         """
         if not texts:
             return []
@@ -257,12 +387,59 @@ class Translator(TranslatorProtocol):
             batch_size=len(texts),
             text_lengths=[len(t) for t in texts],
             min_length_percentages=min_length_percentages,
+            profile=profile,
         )
 
-        # Encode all texts and calculate token counts
-        encoded_texts = [self.tokeniser.encode(text) for text in texts]
-        token_counts = [len(encoded.tokens) for encoded in encoded_texts]
-        
+        # Encode all texts
+        encoded_texts = [self.tokeniser.encode(text).tokens for text in texts]
+
+        return self.translate_tokens_scored(
+            encoded_texts,
+            source_languages,
+            target_languages,
+            min_length_percentages,
+            profile=profile,
+        )
+
+    def translate_tokens_scored(
+        self,
+        encoded_texts: list[list[str]],
+        source_languages: list[Language],
+        target_languages: list[Language],
+        min_length_percentages: list[float],
+        *,
+        profile: str | None = None,
+    ) -> list[ScoredTranslation]:
+        """
+        Summary
+        -------
+        translate multiple already tokenised inputs in batch, keeping the hypothesis scores
+
+        Parameters
+        ----------
+        encoded_texts (list[list[str]])
+            list of tokenised inputs, the same token list may be shared by several items
+
+        source_languages (list[Language])
+            list of source languages corresponding to each input
+
+        target_languages (list[Language])
+            list of target languages corresponding to each input
+
+        min_length_percentages (list[float])
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each input
+
+        profile (str?)
+            the decoding profile applied to the whole batch
+
+        Returns
+        -------
+        translations (list[ScoredTranslation])
+            list of scored translations in the same order as input
+        """
+        decoding_profile = self.get_decoding_profile(profile)
+        token_counts = [len(encoded) for encoded in encoded_texts]
+
         # Calculate min_decoding_length based on minimum token count to avoid forcing
         # short texts to generate too many tokens, while still preventing early stopping
         min_token_count = min(token_counts) if token_counts else 1
@@ -277,7 +454,7 @@ class Translator(TranslatorProtocol):
         batch_inputs = []
         for source_lang, encoded in zip(source_languages, encoded_texts):
             # Create a list with source language followed by tokens (same as single translation)
-            batch_input = [source_lang] + encoded.tokens
+            batch_input = [source_lang, *encoded]
             batch_inputs.append(batch_input)
         
         # target_prefix should be list of lists (one per input)
@@ -286,19 +463,32 @@ class Translator(TranslatorProtocol):
 
         # Use native batch translation for GPU efficiency
         # suppress_sequences should match target_prefix format: list[list[str]]
+        # CTranslate2 splits the batch into sub-batches of at most `max_batch_size` tokens, 0 disables the limit
+        usage_before = get_memory_usage() if self.batch_budget else 0
+        batch_tokens = sum(len(batch_input) for batch_input in batch_inputs)
+        max_batch_size = self.batch_budget.limit(usage_before, batch_tokens) if self.batch_budget else 0
         batch_results = self.translator.translate_batch(
             batch_inputs,
             target_prefix=target_prefixes,
             max_decoding_length=4096,
             min_decoding_length=min_decoding_length,
             sampling_temperature=0,
-            no_repeat_ngram_size=3,
+            beam_size=decoding_profile.beam_size,
+            length_penalty=decoding_profile.length_penalty,
+            repetition_penalty=decoding_profile.repetition_penalty,
+            no_repeat_ngram_size=decoding_profile.no_repeat_ngram_size,
             suppress_sequences=target_prefixes,  # Suppress target language prefix sequences
+            return_scores=True,
+            max_batch_size=max_batch_size,
+            batch_type="tokens",
         )
 
+        if self.batch_budget:
+            self.batch_budget.update(usage_before, get_memory_usage(), tokens=min(batch_tokens, max_batch_size))
+
         # Decode all results
         # hypotheses contains token IDs - check if they're strings or integers
-        decoded_texts = []
+        decoded_texts: list[ScoredTranslation] = []
         for idx, result in enumerate(batch_results):
             try:
                 if not hasattr(result, "hypotheses"):
@@ -357,7 +547,9 @@ class Translator(TranslatorProtocol):
                 # The token strings may contain special characters like \u2581 (word boundary)
                 # which need to be handled properly
                 decoded_text = "".join(token_strings).replace("\u2581", " ").strip()
-                decoded_texts.append(decoded_text)
+                # CTranslate2 returns the cumulative log-probability, which would penalise long translations
+                score = result.scores[0] / len(token_strings)
+                decoded_texts.append(ScoredTranslation(decoded_text, score, token_counts[idx], token_strings))
             except (ValueError, IndexError, TypeError, AttributeError) as e:
                 logger.error(
                     "Error decoding batch result",
@@ -375,13 +567,124 @@ class Translator(TranslatorProtocol):
             "Batch translation complete",
             total_items=len(decoded_texts),
             min_decoding_length=min_decoding_length,
-            total_output_length=sum(len(t) for t in decoded_texts),
+            total_output_length=sum(len(t.text) for t in decoded_texts),
         )
         
         return decoded_texts
 
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages with one batched decode
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        return [
+            translation.text
+            for translation in self.translate_fanout_scored(
+                text,
+                source_language,
+                target_languages,
+                min_length_percentage,
+                profile=profile,
+            )
+        ]
+
+    def translate_fanout_scored(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[ScoredTranslation]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages, tokenising the input only once
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translations (list[ScoredTranslation])
+            list of scored translations in the same order as the target languages
+        """
+        if not target_languages:
+            return []
+
+        encoded_text = self.tokeniser.encode(text).tokens
+        fanout_size = len(target_languages)
+
+        logger.debug(
+            "Starting fan-out translation",
+            input_length=len(text),
+            source_language=source_language,
+            fanout_size=fanout_size,
+            profile=profile,
+        )
+
+        return self.translate_tokens_scored(
+            [encoded_text] * fanout_size,
+            [source_language] * fanout_size,
+            target_languages,
+            [min_length_percentage] * fanout_size,
+            profile=profile,
+        )
+
     def translate(
-        self, text: str, source_language: Language, target_language: Language, min_length_percentage: float = 0.8
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
     ) -> str:
         """
         Summary
@@ -404,12 +707,27 @@ class Translator(TranslatorProtocol):
             Defaults to 0.8 (80%). Used to prevent early stopping in NLLB models.
             See: https://huggingface.co/facebook/nllb-200-distilled-600M/discussions/6
 
+        profile (str?)
+            the decoding profile
+
         Returns
         -------
         translated_text (str)
             the translated text
         """
-        token_ids = list(self.translate_generator(text, source_language, target_language, min_length_percentage))
+        # Token generation is greedy only, so beam search profiles go through the batch path
+        if self.get_decoding_profile(profile).beam_size > 1:
+            return self.translate_batch(
+                [text],
+                [source_language],
+                [target_language],
+                [min_length_percentage],
+                profile=profile,
+            )[0]
+
+        token_ids = list(
+            self.translate_generator(text, source_language, target_language, min_length_percentage, profile=profile)
+        )
         decoded_text = self.tokeniser.decode(token_ids, skip_special_tokens=True)
         
         logger.debug(
@@ -423,7 +741,13 @@ class Translator(TranslatorProtocol):
         return decoded_text
 
     def translate_stream(
-        self, text: str, source_language: Language, target_language: Language, min_length_percentage: float = 0.8
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
     ) -> Iterator[str]:
         """
         Summary
@@ -446,25 +770,64 @@ class Translator(TranslatorProtocol):
             Defaults to 0.8 (80%). Used to prevent early stopping in NLLB models.
             See: https://huggingface.co/facebook/nllb-200-distilled-600M/discussions/6
 
+        profile (str?)
+            the decoding profile, beam search profiles emit the full translation as a single chunk
+
         Returns
         -------
         translated_text (Iterator[str])
             the translated text
         """
+        if self.get_decoding_profile(profile).beam_size > 1:
+            translated_text = self.translate(
+                text, source_language, target_language, min_length_percentage, profile=profile
+            )
+            return iter((translated_text,))
 
         return (
             self.tokeniser.decode((token,))
-            for token in self.translate_generator(text, source_language, target_language, min_length_percentage)
+            for token in self.translate_generator(
+                text, source_language, target_language, min_length_percentage, profile=profile
+            )
         )
 
 
+@cache
+def load_tokeniser(model_path: str) -> Tokenizer:
+    """
+    Summary
+    -------
+    parse the tokeniser of a model, once per process so a prefork master can parse it before its workers inherit it
+
+    Parameters
+    ----------
+    model_path (str)
+        the path to the model
+
+    Returns
+    -------
+    tokeniser (Tokenizer)
+        the tokeniser
+    """
+    return Tokenizer.from_file(str(Path(model_path) / "tokenizer.json"))
+
+
 def get_translator(
     repository: str,
     *,
     translator_threads: int,
+    translator_intra_threads: int,
+    compute_type: str,
+    calibration_cache: str,
+    model_prefetch: str,
+    model_lock: bool,
     stub: bool,
     testing: bool,
     use_cuda: bool,
+    decoding_profiles: dict[str, DecodingProfile],
+    default_decoding_profile: str,
+    batch_budget: BatchTokenBudget | None,
+    component: Component,
 ) -> TranslatorProtocol:
     """
     Summary
@@ -479,6 +842,21 @@ def get_translator(
     translator_threads (int)
         the number of threads to use for the translator
 
+    translator_intra_threads (int)
+        the number of threads each translator thread computes a batch with, `0` uses the CTranslate2 default
+
+    compute_type (str)
+        the CTranslate2 compute type, e.g. `auto`, `int8` or `int8_float32`, `calibrate` times every supported type
+
+    calibration_cache (str)
+        the JSON file the calibrated compute types are cached in
+
+    model_prefetch (str)
+        how the model files are brought into the page cache while the tokeniser loads, `off`, `readahead` or `read`
+
+    model_lock (bool)
+        whether to lock the loaded model and tokeniser into RAM
+
     stub (bool)
         whether to return a stub object
 
@@ -488,6 +866,18 @@ def get_translator(
     use_cuda (bool)
         whether to use CUDA for inference
 
+    decoding_profiles (dict[str, DecodingProfile])
+        the named decoding profiles that requests can select from
+
+    default_decoding_profile (str)
+        the decoding profile used when a request does not select one
+
+    batch_budget (BatchTokenBudget?)
+        the adaptive limit on the number of tokens decoded at once, None disables the limit
+
+    component (Component)
+        the readiness component that reports the download and loading progress
+
     Returns
     -------
     translator (TranslatorProtocol)
@@ -496,40 +886,92 @@ def get_translator(
     if stub:
         return TranslatorStub()
 
-    model_path = huggingface_download(repository)
-    tokeniser = Tokenizer.from_file(str(Path(model_path) / "tokenizer.json"))
+    component.advance("downloading")
+
+    with measure_startup("translator_resolve"):
+        model_path = huggingface_download(repository, on_progress=component.update)
+
+    component.advance("loading")
+    resident_before = get_resident_memory()
+
+    if model_prefetch != "off":
+        prefetch_model(model_path, mode=model_prefetch)
+
+    with measure_footprint("tokeniser"), measure_startup("tokeniser_parse"):
+        tokeniser = load_tokeniser(model_path)
     
-    # Check if CUDA is actually available
-    device = "cuda" if use_cuda else "cpu"
-    if use_cuda:
-        try:
-            # Try to create a translator with CUDA to check availability
-            # This will fail if CUDA libraries aren't available
-            test_translator = CTranslator(
+    if compute_type == "calibrate" and (use_cuda or testing):
+        # the calibration times the CPU kernels, on GPUs CTranslate2 picks the compute type
+        compute_type = "auto"
+
+    elif compute_type == "calibrate":
+        with measure_startup("compute_type_calibration"):
+            compute_type = calibrate_compute_type(
                 model_path,
-                "cuda",
-                compute_type="default" if testing else "auto",
-                inter_threads=translator_threads,
+                build=lambda candidate: Translator(
+                    CTranslator(model_path, "cpu", compute_type=candidate, intra_threads=translator_intra_threads),
+                    tokeniser,
+                    use_cuda=False,
+                    decoding_profiles=decoding_profiles,
+                    default_decoding_profile=default_decoding_profile,
+                    batch_budget=None,
+                ),
+                cache_path=Path(calibration_cache).expanduser(),
             )
-            # If successful, use CUDA
-            translator = test_translator
-            logger.info("CUDA device initialized successfully")
-        except (RuntimeError, OSError) as e:
-            # CUDA not available, fall back to CPU
-            logger.warning("CUDA requested but not available, falling back to CPU", error=str(e))
-            device = "cpu"
+
+    with measure_footprint("model"), measure_startup("translator_construct"):
+        # Check if CUDA is actually available
+        device = "cuda" if use_cuda else "cpu"
+        if use_cuda:
+            try:
+                # Try to create a translator with CUDA to check availability
+                # This will fail if CUDA libraries aren't available
+                test_translator = CTranslator(
+                    model_path,
+                    "cuda",
+                    compute_type="default" if testing else compute_type,
+                    inter_threads=translator_threads,
+                    intra_threads=translator_intra_threads,
+                )
+                # If successful, use CUDA
+                translator = test_translator
+                logger.info("CUDA device initialized successfully")
+            except (RuntimeError, OSError) as e:
+                # CUDA not available, fall back to CPU
+                logger.warning("CUDA requested but not available, falling back to CPU", error=str(e))
+                device = "cpu"
+                translator = CTranslator(
+                    model_path,
+                    "cpu",
+                    compute_type="default" if testing else compute_type,
+                    inter_threads=translator_threads,
+                    intra_threads=translator_intra_threads,
+                )
+        else:
             translator = CTranslator(
                 model_path,
                 "cpu",
-                compute_type="default" if testing else "auto",
+                compute_type="default" if testing else compute_type,
                 inter_threads=translator_threads,
+                intra_threads=translator_intra_threads,
             )
-    else:
-        translator = CTranslator(
-            model_path,
-            "cpu",
-            compute_type="default" if testing else "auto",
-            inter_threads=translator_threads,
-        )
 
-    return Translator(translator, tokeniser, use_cuda=(device == "cuda"))
+    if model_lock:
+        lock_memory()
+
+    logger.info(
+        "Model residency",
+        repository=repository,
+        expected_bytes=sum(path.stat().st_size for path in get_model_files(model_path)),
+        resident_bytes=get_resident_memory() - resident_before,
+        locked_bytes=get_locked_memory(),
+    )
+
+    return Translator(
+        translator,
+        tokeniser,
+        use_cuda=(device == "cuda"),
+        decoding_profiles=decoding_profiles,
+        default_decoding_profile=default_decoding_profile,
+        batch_budget=batch_budget,
+    )
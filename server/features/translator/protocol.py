@@ -18,6 +18,9 @@ class TranslatorProtocol(Protocol):
     translate_batch(texts: list[str], source_languages: list[Language], target_languages: list[Language]) -> list[str]
         translate multiple inputs from source languages to target languages in batch
 
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages
+
     translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
         streams the translation input from the source language to the target language
 
@@ -94,6 +97,9 @@ class TranslatorProtocol(Protocol):
         texts: list[str],
         source_languages: list[Language],
         target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
     ) -> list[str]:
         """
         Summary
@@ -111,6 +117,12 @@ class TranslatorProtocol(Protocol):
         target_languages (list[Language])
             list of target languages corresponding to each text
 
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile applied to the whole batch
+
         Returns
         -------
         translated_texts (list[str])
@@ -118,7 +130,53 @@ class TranslatorProtocol(Protocol):
         """
         ...
 
-    def translate(self, text: str, source_language: Language, target_language: Language) -> str:
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        ...
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
         """
         Summary
         -------
@@ -135,6 +193,12 @@ class TranslatorProtocol(Protocol):
         target_language (Languages)
             the target language
 
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
         Returns
         -------
         translated_text (str)
@@ -142,7 +206,15 @@ class TranslatorProtocol(Protocol):
         """
         ...
 
-    def translate_stream(self, text: str, source_language: Language, target_language: Language) -> Iterator[str]:
+    def translate_stream(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Iterator[str]:
         """
         Summary
         -------
@@ -159,6 +231,12 @@ class TranslatorProtocol(Protocol):
         target_language (Languages)
             the target language
 
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
         Returns
         -------
         translated_text (Iterator[str])
@@ -19,6 +19,9 @@ class TranslatorStub(TranslatorProtocol):
     translate(text: str, source_language: Language, target_language: Language) -> str
         translate the input from the source language to the target language
 
+    translate_fanout(text: str, source_language: Language, target_languages: list[Language]) -> list[str]
+        translate a single input into many target languages
+
     translate_stream(text: str, source_language: Language, target_language: Language) -> Iterator[str]
         streams the translation input from the source language to the target language
 
@@ -97,6 +100,9 @@ class TranslatorStub(TranslatorProtocol):
         texts: list[str],
         source_languages: list[Language],
         target_languages: list[Language],
+        min_length_percentages: list[float] | None = None,
+        *,
+        profile: str | None = None,
     ) -> list[str]:
         """
         Summary
@@ -114,6 +120,12 @@ class TranslatorStub(TranslatorProtocol):
         target_languages (list[Language])
             list of target languages corresponding to each text
 
+        min_length_percentages (list[float]?)
+            minimum decoding length as percentage of input tokens (0.0-1.0) for each text
+
+        profile (str?)
+            the decoding profile applied to the whole batch
+
         Returns
         -------
         translated_texts (list[str])
@@ -124,7 +136,53 @@ class TranslatorStub(TranslatorProtocol):
             for text, source_lang, target_lang in zip(texts, source_languages, target_languages)
         ]
 
-    def translate(self, text: str, source_language: Language, target_language: Language) -> str:
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        """
+        Summary
+        -------
+        translate a single input into many target languages
+
+        Parameters
+        ----------
+        text (str)
+            the input to translate
+
+        source_language (Language)
+            the source language
+
+        target_languages (list[Language])
+            the target languages
+
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
+        Returns
+        -------
+        translated_texts (list[str])
+            list of translated texts in the same order as the target languages
+        """
+        return [f"{text} from {source_language} to {target_language}" for target_language in target_languages]
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
         """
         Summary
         -------
@@ -141,6 +199,12 @@ class TranslatorStub(TranslatorProtocol):
         target_language (Languages)
             the target language
 
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
         Returns
         -------
         translated_text (str)
@@ -148,7 +212,15 @@ class TranslatorStub(TranslatorProtocol):
         """
         return f"{text} from {source_language} to {target_language}"
 
-    def translate_stream(self, text: str, source_language: Language, target_language: Language) -> Iterator[str]:
+    def translate_stream(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> Iterator[str]:
         """
         Summary
         -------
@@ -165,6 +237,12 @@ class TranslatorStub(TranslatorProtocol):
         target_language (Languages)
             the target language
 
+        min_length_percentage (float)
+            minimum decoding length as percentage of input tokens (0.0-1.0)
+
+        profile (str?)
+            the decoding profile
+
         Returns
         -------
         translated_text (Iterator[str])
@@ -0,0 +1,2 @@
+from server.features.warmup.warmup import warm_up_language_detector as warm_up_language_detector
+from server.features.warmup.warmup import warm_up_translator as warm_up_translator
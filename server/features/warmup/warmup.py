@@ -0,0 +1,155 @@
+from collections.abc import Callable
+from time import perf_counter
+
+from opentelemetry import metrics
+
+from server.features.detector import LanguageDetectorProtocol
+from server.features.translator import TranslatorProtocol
+from server.logging_config import get_logger
+from server.typedefs import Language
+
+logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+warmup_duration_histogram = meter.create_histogram(
+    name="nllb_api_warmup_duration",
+    description="Time spent in each phase of the startup warm-up",
+    unit="s",
+)
+
+# short UI strings, a sentence and a paragraph, so allocators and kernels see the common shapes
+WARMUP_TEXTS = (
+    "Hello, world!",
+    "Please enter your password to continue.",
+    "The quick brown fox jumps over the lazy dog while the farmer watches from the porch.",
+    (
+        "Machine translation has improved considerably over the last decade. Modern models translate "
+        "between hundreds of languages, yet long documents still take noticeably longer to decode than "
+        "short sentences, which is why the service batches and schedules requests by their expected cost."
+    ),
+)
+
+
+def run_phase(phase: str, warm: Callable[[], object], *, rounds: int) -> float:
+    """
+    Summary
+    -------
+    run and time a warm-up phase
+
+    Parameters
+    ----------
+    phase (str)
+        the name of the phase
+
+    warm (Callable[[], object])
+        the work of the phase
+
+    rounds (int)
+        the number of times the phase is repeated
+
+    Returns
+    -------
+    duration (float)
+        the time spent in the phase in seconds
+    """
+    start = perf_counter()
+
+    for _ in range(rounds):
+        warm()
+
+    duration = perf_counter() - start
+    warmup_duration_histogram.record(duration, {"phase": phase})
+    logger.info("Warm-up phase complete", phase=phase, duration_seconds=duration)
+
+    return duration
+
+
+def warm_up_translator(
+    translator: TranslatorProtocol,
+    *,
+    language_pairs: list[tuple[Language, Language]],
+    rounds: int,
+    on_progress: Callable[[float], None] | None = None,
+) -> dict[str, float]:
+    """
+    Summary
+    -------
+    run representative single and batch translations so the first requests run at steady-state speed
+
+    Parameters
+    ----------
+    translator (TranslatorProtocol)
+        the translator to warm up
+
+    language_pairs (list[tuple[Language, Language]])
+        the source and target languages to translate between
+
+    rounds (int)
+        the number of times each phase is repeated
+
+    on_progress (Callable[[float], None]?)
+        called with the completed share of the phases after each phase
+
+    Returns
+    -------
+    timings (dict[str, float])
+        the time spent in each phase in seconds
+    """
+    texts = [text for text in WARMUP_TEXTS for _ in language_pairs]
+    source_languages = [source for _ in WARMUP_TEXTS for source, _ in language_pairs]
+    target_languages = [target for _ in WARMUP_TEXTS for _, target in language_pairs]
+
+    timings = {
+        "single": run_phase(
+            "single",
+            lambda: [
+                translator.translate(text, source, target) for text in WARMUP_TEXTS for source, target in language_pairs
+            ],
+            rounds=rounds,
+        ),
+    }
+
+    if on_progress is not None:
+        on_progress(0.5)
+
+    timings["batch"] = run_phase(
+        "batch",
+        lambda: translator.translate_batch(texts, source_languages, target_languages),
+        rounds=rounds,
+    )
+
+    if on_progress is not None:
+        on_progress(1.0)
+
+    return timings
+
+
+def warm_up_language_detector(language_detector: LanguageDetectorProtocol, *, rounds: int) -> dict[str, float]:
+    """
+    Summary
+    -------
+    run representative language detections so the first requests run at steady-state speed
+
+    Parameters
+    ----------
+    language_detector (LanguageDetectorProtocol)
+        the language detector to warm up
+
+    rounds (int)
+        the number of times the detections are repeated
+
+    Returns
+    -------
+    timings (dict[str, float])
+        the time spent in each phase in seconds
+    """
+    return {
+        "language_detector": run_phase(
+            "language_detector",
+            lambda: [
+                language_detector.detect(text, fasttext_confidence_threshold=0.85, lingua_confidence_threshold=0.35)
+                for text in WARMUP_TEXTS
+            ],
+            rounds=rounds,
+        ),
+    }
@@ -1 +1,3 @@
+from server.guards.ready import requires_ready as requires_ready
 from server.guards.secret import requires_secret as requires_secret
+from server.guards.tenant import get_tenant as get_tenant
@@ -0,0 +1,51 @@
+from collections.abc import Callable
+
+from fastapi import HTTPException, Request, status
+
+from server.features.drain import Drain
+from server.features.readiness import Component
+
+
+def requires_ready(name: str) -> Callable[[Request], None]:
+    """
+    Summary
+    -------
+    get a guard that rejects requests until a model is ready, and once the server is draining for a shutdown
+
+    Parameters
+    ----------
+    name (str)
+        the name of the readiness component the route depends on
+
+    Returns
+    -------
+    guard (Callable[[Request], None])
+        the guard, raising `503` with a `Retry-After` header while the model is not ready,
+        `503` while draining and `404` when the model is disabled
+    """
+
+    def guard(request: Request) -> None:
+        drain: Drain = request.app.state.drain
+
+        if drain.draining:
+            drain.rejected += 1
+            # closing the connection sends the client's retry to another instance
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="the server is shutting down",
+                headers={"Connection": "close"},
+            )
+
+        component: Component | None = request.app.state.readiness.get(name)
+
+        if component is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"the {name} is disabled")
+
+        if component.state != "ready":
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"the {name} is {component.state}",
+                headers={"Retry-After": str(component.retry_after())},
+            )
+
+    return guard
@@ -0,0 +1,32 @@
+from fastapi import Header, HTTPException, Request, status
+
+from server.features.tenants import TenantBucket
+
+
+def get_tenant(request: Request, authorization: str = Header(default="")) -> TenantBucket | None:
+    """
+    Summary
+    -------
+    resolve the tenant of the request from its API key, rejecting unknown keys when tenants are configured
+
+    Parameters
+    ----------
+    request (Request)
+        the FastAPI request
+    authorization (str)
+        the Authorization header value
+
+    Returns
+    -------
+    tenant (TenantBucket?)
+        the tenant, or None when no tenants are configured or the admin token is used
+    """
+    tenants: dict[str, TenantBucket] = request.app.state.tenants
+
+    if not tenants or authorization == request.app.state.config.auth_token:
+        return None
+
+    if (tenant := tenants.get(authorization)) is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    return tenant
@@ -0,0 +1,87 @@
+from asyncio import Event, get_running_loop, run, start_unix_server
+from functools import partial
+from os import umask
+from pathlib import Path
+from signal import SIGINT, SIGTERM
+
+from fastapi import FastAPI
+
+from server.config import Config
+from server.features.inference import handle_connection
+from server.features.readiness import Component
+from server.features.startup import log_startup_profile
+from server.features.tenants import get_tenant_buckets
+from server.lifespans import load_translator_model
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+async def serve_inference(config: Config, *, inference_socket: str) -> None:
+    """
+    Summary
+    -------
+    load the translator and serve the front-ends on a Unix socket until the process is terminated
+
+    The socket is only created once the model is loaded and warmed up, so front-ends that
+    connect are immediately ready. The scheduler lives here too, so the translator slots are
+    shared fairly between the requests of every front-end.
+
+    Parameters
+    ----------
+    config (Config)
+        the application config
+
+    inference_socket (str)
+        the path of the Unix socket to listen on
+    """
+    stopped = Event()
+    loop = get_running_loop()
+    loop.add_signal_handler(SIGTERM, stopped.set)
+    loop.add_signal_handler(SIGINT, stopped.set)
+
+    # the translator lifespan reports to the state of an application, which is never served
+    app = FastAPI()
+    app.state.readiness = {"translator": Component("translator")}
+    socket_path = Path(inference_socket)
+    socket_path.unlink(missing_ok=True)
+
+    async with load_translator_model(config)(app):
+        log_startup_profile()
+        # quotas are charged here, so the tenants are looked up by the name the front-ends resolved
+        tenants = {bucket.name: bucket for bucket in get_tenant_buckets(config.tenants).values()}
+        handler = partial(handle_connection, translator=app.state.translator, tenants=tenants)
+
+        # the frames are unmarshalled, so the socket is created accessible to this user only,
+        # instead of being restricted after the bind, when another user could already connect
+        previous_umask = umask(0o177)
+
+        try:
+            server = await start_unix_server(handler, path=inference_socket)
+
+        finally:
+            umask(previous_umask)
+
+        async with server:
+            logger.info("Inference process ready", inference_socket=inference_socket)
+            await stopped.wait()
+
+    socket_path.unlink(missing_ok=True)
+    logger.info("Inference process stopped")
+
+
+def run_inference(config: Config) -> None:
+    """
+    Summary
+    -------
+    run the inference process
+
+    Parameters
+    ----------
+    config (Config)
+        the application config, with `inference_socket` set
+    """
+    if not config.inference_socket:
+        raise ValueError("the inference process requires `INFERENCE_SOCKET` to be set")
+
+    run(serve_inference(config, inference_socket=config.inference_socket))
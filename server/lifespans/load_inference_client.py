@@ -0,0 +1,84 @@
+from asyncio import sleep
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+from fastapi import FastAPI
+
+from server.features.inference import InferenceClient
+from server.features.readiness import Component
+
+CONNECT_INTERVAL = 0.5
+
+
+@asynccontextmanager
+async def inference_client_lifespan(
+    app: FastAPI,
+    *,
+    inference_socket: str,
+    scheduler_enabled: bool,
+) -> AsyncIterator[None]:
+    """
+    Summary
+    -------
+    lifespan to connect to the inference process, which only listens once its model is loaded and warmed up
+
+    Parameters
+    ----------
+    app (FastAPI)
+        the application instance
+
+    inference_socket (str)
+        the path of the Unix socket the inference process listens on
+
+    scheduler_enabled (bool)
+        whether the inference process orders requests, which exposes its estimates to this front-end
+    """
+    component: Component = app.state.readiness["translator"]
+    component.advance("loading")
+    app.state.batch_budget = None
+    app.state.hot_swap = None
+    app.state.shadow = None
+
+    while True:
+        try:
+            client = InferenceClient(inference_socket)
+            break
+
+        except (FileNotFoundError, ConnectionRefusedError):
+            await sleep(CONNECT_INTERVAL)
+
+    with client:
+        app.state.translator = client
+        app.state.scheduler = client if scheduler_enabled else None
+        component.advance("ready")
+        yield
+
+
+def load_inference_client(
+    inference_socket: str,
+    *,
+    scheduler_enabled: bool,
+) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
+    """
+    Summary
+    -------
+    the inference client lifespan factory
+
+    Parameters
+    ----------
+    inference_socket (str)
+        the path of the Unix socket the inference process listens on
+
+    scheduler_enabled (bool)
+        whether the inference process orders requests, which exposes its estimates to this front-end
+
+    Returns
+    -------
+    lifespan (Callable[[FastAPI], AbstractAsyncContextManager[None]])
+        a FastAPI-compatible lifespan context manager
+    """
+    return lambda app: inference_client_lifespan(
+        app,
+        inference_socket=inference_socket,
+        scheduler_enabled=scheduler_enabled,
+    )
@@ -1,9 +1,13 @@
+from asyncio import to_thread
 from collections.abc import AsyncIterator, Callable
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
 
 from fastapi import FastAPI
 
 from server.features.detector import get_language_detector
+from server.features.readiness import Component
+from server.features.startup import measure_startup
+from server.features.warmup import warm_up_language_detector
 
 
 @asynccontextmanager
@@ -12,11 +16,12 @@ async def language_detector_lifespan(
     *,
     language_detector_repository: str,
     stub: bool,
+    warmup_rounds: int,
 ) -> AsyncIterator[None]:
     """
     Summary
     -------
-    lifespan to load the language detection model
+    lifespan to load the language detection model in a worker thread, reporting its progress to the readiness state
 
     Parameters
     ----------
@@ -28,12 +33,27 @@ async def language_detector_lifespan(
 
     stub (bool)
         whether to use a stub object
+
+    warmup_rounds (int)
+        the number of times the warm-up detections are repeated, `0` disables the warm-up
     """
-    app.state.language_detector = get_language_detector(
+    component: Component = app.state.readiness["language_detector"]
+
+    app.state.language_detector = await to_thread(
+        get_language_detector,
         language_detector_repository,
         stub=stub,
+        component=component,
     )
 
+    if warmup_rounds:
+        component.advance("warming")
+
+        with measure_startup("language_detector_warmup"):
+            await to_thread(warm_up_language_detector, app.state.language_detector, rounds=warmup_rounds)
+
+    component.advance("ready")
+
     try:
         yield
 
@@ -45,6 +65,7 @@ def load_language_detector(
     language_detector_repository: str,
     *,
     stub: bool,
+    warmup_rounds: int,
 ) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
     """
     Summary
@@ -59,6 +80,9 @@ def load_language_detector(
     stub (bool)
         whether to use a stub object
 
+    warmup_rounds (int)
+        the number of times the warm-up detections are repeated, `0` disables the warm-up
+
     Returns
     -------
     lifespan (Callable[[FastAPI], AbstractAsyncContextManager[None]])
@@ -68,4 +92,5 @@ def load_language_detector(
         app,
         language_detector_repository=language_detector_repository,
         stub=stub,
+        warmup_rounds=warmup_rounds,
     )
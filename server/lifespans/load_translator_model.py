@@ -1,65 +1,234 @@
+from asyncio import CancelledError, create_task, to_thread
 from collections.abc import AsyncIterator, Callable
-from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, suppress
+from os import sched_getaffinity
 
 from fastapi import FastAPI
 
-from server.features.translator import get_translator
+from server.config import Config
+from server.features.hotswap import HotSwap, SwappableTranslator
+from server.features.idle import IdleTranslator, offload_when_idle
+from server.features.memory import BatchTokenBudget
+from server.features.readiness import Component
+from server.features.scheduler import CostModel, ScheduledTranslator, Scheduler
+from server.features.shadow import ShadowTranslator
+from server.features.sizing import BATCH_TOKEN_MEMORY, get_model_size
+from server.features.startup import measure_startup
+from server.features.translator import TranslatorProtocol, get_cascade_translator, get_translator
+from server.features.warmup import warm_up_translator
 
 
 @asynccontextmanager
-async def translator_lifespan(
-    app: FastAPI,
-    *,
-    translator_repository: str,
-    translator_threads: int,
-    stub: bool,
-    testing: bool,
-    use_cuda: bool,
-) -> AsyncIterator[None]:
+async def translator_lifespan(app: FastAPI, *, config: Config) -> AsyncIterator[None]:
     """
     Summary
     -------
-    lifespan to load the translator model
+    lifespan to load the translator model in a worker thread, reporting its progress to the readiness state
 
     Parameters
     ----------
     app (FastAPI)
         the application instance
 
-    translator_repository (str)
-        the repository to download the model from
+    config (Config)
+        the application config, which selects the model and the wrappers around it
+    """
+    component: Component = app.state.readiness["translator"]
+    translator_repository = config.get_translator_repository()
+    translator_intra_threads = config.translator_intra_threads
+
+    if config.cpu_pinning and not translator_intra_threads:
+        # CTranslate2 would otherwise start its default number of threads, regardless of the pinned core set
+        translator_intra_threads = max(1, len(sched_getaffinity(0)) // config.translator_threads)
+
+    batch_budget = app.state.batch_budget = (
+        BatchTokenBudget(
+            ceiling=config.memory_ceiling,
+            minimum=config.batch_min_tokens,
+            maximum=config.batch_max_tokens,
+            # the estimate of the size preset until batches show how much memory a token really takes
+            token_memory=max(
+                BATCH_TOKEN_MEMORY[get_model_size(repository)]
+                for repository in filter(None, (translator_repository, config.cascade_repository))
+            ),
+        )
+        if config.memory_ceiling
+        else None
+    )
+
+    if config.cascade_repository and not config.stub_translator:
+        translator = await to_thread(
+            get_cascade_translator,
+            translator_repository,
+            config.cascade_repository,
+            confidence_threshold=config.cascade_confidence_threshold,
+            translator_threads=config.translator_threads,
+            translator_intra_threads=translator_intra_threads,
+            compute_type=config.compute_type,
+            calibration_cache=config.calibration_cache,
+            model_prefetch=config.model_prefetch,
+            model_lock=config.model_lock,
+            testing=config.testing,
+            use_cuda=config.use_cuda,
+            decoding_profiles=config.decoding_profiles,
+            default_decoding_profile=config.default_decoding_profile,
+            batch_budget=batch_budget,
+            component=component,
+        )
+
+    else:
+        translator = await to_thread(
+            get_translator,
+            translator_repository,
+            translator_threads=config.translator_threads,
+            translator_intra_threads=translator_intra_threads,
+            compute_type=config.compute_type,
+            calibration_cache=config.calibration_cache,
+            model_prefetch=config.model_prefetch,
+            model_lock=config.model_lock,
+            testing=config.testing,
+            stub=config.stub_translator,
+            use_cuda=config.use_cuda,
+            decoding_profiles=config.decoding_profiles,
+            default_decoding_profile=config.default_decoding_profile,
+            batch_budget=batch_budget,
+            component=component,
+        )
+
+    # warm up before wrapping the translator, so the cold first decodes never reach the cost model
+    if config.warmup_rounds:
+        component.advance("warming")
+
+        with measure_startup("translator_warmup"):
+            await to_thread(
+                warm_up_translator,
+                translator,
+                language_pairs=config.warmup_language_pairs,
+                rounds=config.warmup_rounds,
+                on_progress=component.update,
+            )
+
+    app.state.hot_swap = None
+
+    # the cascade pairs two models, so only a single model can be swapped for another
+    if not config.cascade_repository:
+
+        def build(repository: str, swap_compute_type: str, swap_component: Component) -> TranslatorProtocol:
+            return get_translator(
+                repository,
+                translator_threads=config.translator_threads,
+                translator_intra_threads=translator_intra_threads,
+                compute_type=swap_compute_type,
+                calibration_cache=config.calibration_cache,
+                model_prefetch=config.model_prefetch,
+                model_lock=config.model_lock,
+                testing=config.testing,
+                stub=config.stub_translator,
+                use_cuda=config.use_cuda,
+                decoding_profiles=config.decoding_profiles,
+                default_decoding_profile=config.default_decoding_profile,
+                batch_budget=batch_budget,
+                component=swap_component,
+            )
+
+        def warm_up(swapped: TranslatorProtocol) -> None:
+            if config.warmup_rounds:
+                warm_up_translator(swapped, language_pairs=config.warmup_language_pairs, rounds=config.warmup_rounds)
+
+        translator = swappable = SwappableTranslator(translator)
+        app.state.hot_swap = HotSwap(
+            swappable,
+            repository=translator_repository,
+            compute_type=config.compute_type,
+            drain_timeout=config.swap_drain_timeout,
+            build=build,
+            warm_up=warm_up,
+        )
+
+    idle_translator = None
+
+    # the scheduler wraps the idle translator, so the cost model never observes the time spent reloading
+    if config.idle_timeout:
+        translator = idle_translator = IdleTranslator(
+            translator,
+            idle_timeout=config.idle_timeout,
+            hold_timeout=config.idle_hold_timeout,
+        )
+
+    app.state.shadow = None
+
+    # the scheduler wraps the shadow translator, so the primary latencies compared exclude the queueing time
+    if config.shadow_percentage:
+        shadow = translator
+
+        if config.shadow_repository or config.shadow_compute_type:
+            shadow = await to_thread(
+                get_translator,
+                config.shadow_repository or translator_repository,
+                translator_threads=config.translator_threads,
+                translator_intra_threads=translator_intra_threads,
+                compute_type=config.shadow_compute_type or config.compute_type,
+                calibration_cache=config.calibration_cache,
+                model_prefetch=config.model_prefetch,
+                model_lock=config.model_lock,
+                testing=config.testing,
+                stub=config.stub_translator,
+                use_cuda=config.use_cuda,
+                decoding_profiles=config.decoding_profiles,
+                default_decoding_profile=config.default_decoding_profile,
+                batch_budget=batch_budget,
+                component=Component("shadow"),
+            )
+
+        translator = app.state.shadow = ShadowTranslator(
+            translator,
+            shadow,
+            percentage=config.shadow_percentage,
+            capacity=config.shadow_capacity,
+            profile=config.shadow_profile,
+        )
+
+    app.state.scheduler = None
+
+    if config.scheduler_enabled:
+        # CTranslate2 runs `inter_threads` batches in parallel, so each thread is a slot
+        translator = app.state.scheduler = ScheduledTranslator(
+            translator,
+            scheduler=Scheduler(
+                slots=config.translator_threads,
+                aging=config.scheduler_aging,
+                short_slots=config.scheduler_short_slots,
+                short_token_threshold=config.scheduler_short_token_threshold,
+                priority_classes=config.scheduler_priority_classes,
+                default_priority_class=config.scheduler_default_priority_class,
+                strict_priority=config.scheduler_strict_priority,
+            ),
+            cost_model=CostModel(seconds_per_token=config.scheduler_seconds_per_token),
+            default_decoding_profile=config.default_decoding_profile,
+            preemption_batch_size=config.scheduler_preemption_batch_size,
+        )
+
+    with translator:
+        app.state.translator = translator
+        component.advance("ready")
 
-    translator_threads (int)
-        the number of threads to use for translation
+        if idle_translator is None:
+            yield
+            return
 
-    stub (bool)
-        whether to use a stub object
+        offloading = create_task(offload_when_idle(idle_translator))
 
-    testing (bool)
-        whether the application is running in testing mode
+        try:
+            yield
 
-    use_cuda (bool)
-        whether to use CUDA for translation
-    """
-    with get_translator(
-        translator_repository,
-        translator_threads=translator_threads,
-        testing=testing,
-        stub=stub,
-        use_cuda=use_cuda,
-    ) as translator:
-        app.state.translator = translator
-        yield
+        finally:
+            offloading.cancel()
 
+            with suppress(CancelledError):
+                await offloading
 
-def load_translator_model(
-    translator_repository: str,
-    *,
-    translator_threads: int,
-    stub: bool,
-    testing: bool,
-    use_cuda: bool,
-) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
+
+def load_translator_model(config: Config) -> Callable[[FastAPI], AbstractAsyncContextManager[None]]:
     """
     Summary
     -------
@@ -67,31 +236,12 @@ def load_translator_model(
 
     Parameters
     ----------
-    translator_repository (str)
-        the repository to download the model from
-
-    translator_threads (int)
-        the number of threads to use for translation
-
-    stub (bool)
-        whether to use a stub object
-
-    testing (bool)
-        whether the application is running in testing mode
-
-    use_cuda (bool)
-        whether to use CUDA for translation
+    config (Config)
+        the application config
 
     Returns
     -------
     lifespan (Callable[[FastAPI], AbstractAsyncContextManager[None]])
         a FastAPI-compatible lifespan context manager
     """
-    return lambda app: translator_lifespan(
-        app,
-        translator_repository=translator_repository,
-        translator_threads=translator_threads,
-        stub=stub,
-        testing=testing,
-        use_cuda=use_cuda,
-    )
+    return lambda app: translator_lifespan(app, config=config)
@@ -0,0 +1,49 @@
+"""
+ASGI middleware counting the requests in flight for the shutdown drain.
+"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from server.features.drain import Drain
+
+
+class DrainMiddleware:
+    """
+    Middleware to track the requests in flight, so a shutdown can wait for them.
+
+    This is a plain ASGI middleware rather than a `BaseHTTPMiddleware`, as a streamed
+    response is only finished once its last chunk is sent, after `call_next` has returned.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        The wrapped ASGI application
+    untracked_paths : frozenset[str]
+        The paths that are never counted as in flight, such as the probes and the metrics scrape
+    """
+
+    def __init__(self, app: ASGIApp, *, untracked_paths: frozenset[str] = frozenset()) -> None:
+        self.app = app
+        self.untracked_paths = untracked_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Track the request while it is handled.
+
+        Parameters
+        ----------
+        scope : Scope
+            The ASGI connection scope
+        receive : Receive
+            The ASGI receive channel
+        send : Send
+            The ASGI send channel
+        """
+        if scope["type"] != "http" or scope["path"] in self.untracked_paths:
+            await self.app(scope, receive, send)
+            return
+
+        drain: Drain = scope["app"].state.drain
+
+        with drain.track():
+            await self.app(scope, receive, send)
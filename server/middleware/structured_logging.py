@@ -4,11 +4,20 @@ FastAPI middleware for structured logging request context.
 from uuid import uuid4
 
 from fastapi import Request, Response
+from opentelemetry import metrics
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from server.features.memory import get_major_page_faults
 from server.logging_config import bind_request_context, clear_request_context, get_logger
 
 logger = get_logger(__name__)
+meter = metrics.get_meter(__name__)
+
+major_page_fault_histogram = meter.create_histogram(
+    name="nllb_api_request_major_page_faults",
+    description="Major page faults of the process while a request was handled, e.g. weights read back from disk",
+    unit="1",
+)
 
 
 class StructuredLoggingMiddleware(BaseHTTPMiddleware):
@@ -19,6 +28,7 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
     - Generates a unique request_id for each request
     - Binds request context (request_id, method, path) to structured logs
     - Logs request completion/failure
+    - Records the major page faults taken while the request was handled
     - Clears context after request completion
     """
 
@@ -45,12 +55,18 @@ class StructuredLoggingMiddleware(BaseHTTPMiddleware):
             path=request.url.path,
         )
         
+        major_page_faults = get_major_page_faults()
+
         try:
             response = await call_next(request)
+            # the count is process-wide, so concurrent requests share the faults they overlap with
+            major_page_faults = get_major_page_faults() - major_page_faults
+            major_page_fault_histogram.record(major_page_faults, {"path": request.url.path})
             logger.info(
                 "Request completed",
                 status_code=response.status_code,
                 request_id=request_id,
+                major_page_faults=major_page_faults,
             )
             return response
         except Exception as e:
@@ -1,4 +1,4 @@
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
 
 from aiohttp import ClientSession
@@ -17,12 +17,14 @@ async def consul_register(
     consul_service_scheme: str,
     server_root_path: str,
     consul_auth_token: str | None = None,
-) -> AsyncIterator[None]:
+) -> AsyncIterator[Callable[[], Awaitable[None]]]:
     """
     Summary
     -------
     a Consul service lifespan that registers the service on startup and deregisters it on shutdown
 
+    The context yields the deregistration, so a shutdown can stop traffic being routed here before draining.
+
     Parameters
     ----------
     app (FastAPI)
@@ -51,13 +53,17 @@ async def consul_register(
 
     consul_auth_token (str?)
         an optional auth token for populating the `Authorization` header
+
+    Returns
+    -------
+    deregister (Callable[[], Awaitable[None]])
+        deregister the service ahead of the shutdown, only the first call has an effect
     """
     headers: dict[str, str] = {}
     consul_server = f"https://{consul_http_addr}/v1/agent/service"
 
     health_endpoint = (
-        f"{consul_service_scheme}://{consul_service_address}:{consul_service_port}"
-        f"{server_root_path}/health"
+        f"{consul_service_scheme}://{consul_service_address}:{consul_service_port}{server_root_path}/ready"
     )
 
     health_check = {
@@ -90,9 +96,21 @@ async def consul_register(
         ) as response:
             response.raise_for_status()
 
-        try:
-            yield
+        deregistered = False
+
+        async def deregister() -> None:
+            nonlocal deregistered
+
+            if deregistered:
+                return
+
+            deregistered = True
 
-        finally:
             async with session.put(f"{consul_server}/deregister/{payload['ID']}"):
                 pass
+
+        try:
+            yield deregister
+
+        finally:
+            await deregister()
@@ -0,0 +1,294 @@
+import gc
+from os import WNOHANG, _exit, fork, kill, waitpid
+from signal import SIGINT, SIGTERM, signal
+from socket import AF_INET, SO_REUSEADDR, SO_REUSEPORT, SOCK_STREAM, SOL_SOCKET, socket
+from time import monotonic, sleep
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI
+from structlog.contextvars import bind_contextvars
+
+from server.config import Config
+from server.features.detector import load_language_detector_model
+from server.features.memory import get_proportional_memory, get_resident_memory
+from server.features.placement import Placement, pin, place_replicas
+from server.features.translator import load_tokeniser
+from server.logging_config import get_logger
+from server.utils import huggingface_download, huggingface_file_download
+
+logger = get_logger(__name__)
+
+MEMORY_REPORT_INTERVAL = 60.0
+
+
+def preload(config: Config) -> None:
+    """
+    Summary
+    -------
+    load the language detector and tokenisers in the master, so every worker shares them copy-on-write
+
+    The translator weights are not preloaded. CTranslate2 serves each translator from its own thread pool
+    and threads do not survive a fork, so every worker constructs and holds its own copy of the translator
+    unless `inference_socket` moves the only copy into the inference process.
+
+    Parameters
+    ----------
+    config (Config)
+        the application config
+    """
+    if config.language_detector_enabled and not config.stub_language_detector:
+        load_language_detector_model(huggingface_file_download(config.language_detector_repository, "model.bin"))
+
+    # the tokenisers are only needed by workers that load their own translator
+    if not config.stub_translator and not config.inference_socket:
+        for repository in filter(None, (config.get_translator_repository(), config.cascade_repository)):
+            load_tokeniser(huggingface_download(repository))
+
+
+def bind_socket(port: int) -> socket:
+    """
+    Summary
+    -------
+    bind a listening socket that other workers can bind to the same port, letting the kernel balance connections
+
+    Parameters
+    ----------
+    port (int)
+        the port to listen on
+
+    Returns
+    -------
+    socket (socket)
+        the bound socket
+    """
+    server_socket = socket(AF_INET, SOCK_STREAM)
+    server_socket.setsockopt(SOL_SOCKET, SO_REUSEADDR, 1)
+    server_socket.setsockopt(SOL_SOCKET, SO_REUSEPORT, 1)
+    server_socket.bind(("0.0.0.0", port))
+
+    return server_socket
+
+
+def spawn_worker(
+    app: FastAPI,
+    index: int,
+    *,
+    port: int,
+    log_config: dict[str, Any],
+    placement: Placement | None,
+) -> int:
+    """
+    Summary
+    -------
+    fork a worker that serves the application until it is terminated
+
+    Parameters
+    ----------
+    app (FastAPI)
+        the application instance
+
+    index (int)
+        the index of the worker, added to its logs
+
+    port (int)
+        the port to listen on
+
+    log_config (dict[str, Any])
+        the uvicorn log config
+
+    placement (Placement?)
+        the CPUs to pin the worker to before it loads its translator, None leaves it unpinned
+
+    Returns
+    -------
+    pid (int)
+        the process ID of the worker
+    """
+    if pid := fork():
+        return pid
+
+    exit_code = 1
+
+    try:
+        bind_contextvars(worker=index)
+
+        if placement is not None:
+            pin(placement)
+
+        server = uvicorn.Server(uvicorn.Config(app, access_log=False, log_config=log_config))
+        server.run(sockets=[bind_socket(port)])
+        exit_code = 0
+
+    finally:
+        # never return into the master's stack
+        _exit(exit_code)
+
+
+def spawn_inference(config: Config, *, placement: Placement | None) -> int:
+    """
+    Summary
+    -------
+    fork the inference process that owns the translator for every worker
+
+    Parameters
+    ----------
+    config (Config)
+        the application config
+
+    placement (Placement?)
+        the CPUs to pin the inference process to before it loads the translator, None leaves it unpinned
+
+    Returns
+    -------
+    pid (int)
+        the process ID of the inference process
+    """
+    if pid := fork():
+        return pid
+
+    exit_code = 1
+
+    try:
+        from server.inference import run_inference  # noqa: PLC0415
+
+        bind_contextvars(worker="inference")
+
+        if placement is not None:
+            pin(placement)
+        run_inference(config)
+        exit_code = 0
+
+    finally:
+        _exit(exit_code)
+
+
+def report_memory(workers: dict[int, int | str]) -> None:
+    """
+    Summary
+    -------
+    log the resident and proportional set size of every worker, a proportional size well
+    below the resident size shows that the preloaded detector and tokenisers are shared
+
+    Parameters
+    ----------
+    workers (dict[int, int | str])
+        the index or role of each worker, keyed by process ID
+    """
+    for pid, index in workers.items():
+        try:
+            resident = get_resident_memory(pid)
+            proportional = get_proportional_memory(pid)
+
+        except OSError:
+            continue
+
+        logger.info("Worker memory", worker=index, pid=pid, resident_bytes=resident, proportional_bytes=proportional)
+
+
+def run_prefork(config: Config, *, log_config: dict[str, Any]) -> None:
+    """
+    Summary
+    -------
+    preload the models, freeze the heap and fork `worker_count` workers, restarting any that exit unexpectedly
+
+    When `inference_socket` is set, an inference process that owns the translator is forked first,
+    before the master loads anything it does not need, and restarted alongside the workers.
+
+    Parameters
+    ----------
+    config (Config)
+        the application config
+
+    log_config (dict[str, Any])
+        the uvicorn log config
+    """
+    from server.app import app  # noqa: PLC0415
+
+    # the placement of each worker, followed by that of the inference process, only
+    # the processes that load a translator are pinned and the front-ends are left to float
+    placements: list[Placement | None] = [None] * (config.worker_count + 1)
+
+    if config.cpu_pinning and config.inference_socket:
+        placements[-1] = place_replicas(1)[0]
+
+    elif config.cpu_pinning:
+        placements[:-1] = place_replicas(config.worker_count)
+
+    if not config.inference_socket and not config.stub_translator:
+        logger.warning(
+            "Every worker loads its own copy of the translator, set INFERENCE_SOCKET to share one",
+            worker_count=config.worker_count,
+        )
+
+    inference = spawn_inference(config, placement=placements[-1]) if config.inference_socket else None
+    preload(config)
+    # move every object allocated so far out of the collector's reach, so collections in
+    # the workers do not touch, and therefore copy, the pages shared with the master
+    gc.collect()
+    gc.freeze()
+
+    workers = {
+        spawn_worker(
+            app,
+            index,
+            port=config.server_port,
+            log_config=log_config,
+            placement=placements[index],
+        ): index
+        for index in range(config.worker_count)
+    }
+    stopping = False
+
+    def stop(*_: object) -> None:
+        nonlocal stopping
+        stopping = True
+
+        # the inference process is only stopped once the workers have drained the requests it serves
+        for pid in workers:
+            kill(pid, SIGTERM)
+
+    signal(SIGTERM, stop)
+    signal(SIGINT, stop)
+    logger.info("Prefork workers started", worker_count=config.worker_count, pids=list(workers))
+    next_report = monotonic() + MEMORY_REPORT_INTERVAL
+
+    while workers or inference is not None:
+        pid, status = waitpid(-1, WNOHANG)
+
+        if pid and pid == inference:
+            inference = None
+
+            if not stopping:
+                logger.warning("Inference process exited unexpectedly, restarting", pid=pid, status=status)
+                inference = spawn_inference(config, placement=placements[-1])
+
+            continue
+
+        if pid:
+            index = workers.pop(pid)
+
+            if not stopping:
+                logger.warning("Worker exited unexpectedly, restarting", worker=index, pid=pid, status=status)
+                workers[
+                    spawn_worker(
+                        app,
+                        index,
+                        port=config.server_port,
+                        log_config=log_config,
+                        placement=placements[index],
+                    )
+                ] = index
+
+            elif not workers and inference is not None:
+                kill(inference, SIGTERM)
+
+            continue
+
+        if monotonic() >= next_report:
+            report_memory(workers if inference is None else {**workers, inference: "inference"})
+            next_report += MEMORY_REPORT_INTERVAL
+
+        sleep(0.5)
+
+    logger.info("Prefork workers stopped")
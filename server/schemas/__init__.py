@@ -1 +1,3 @@
 from server.schemas.health import Health as Health
+from server.schemas.readiness import ComponentReadiness as ComponentReadiness
+from server.schemas.readiness import Readiness as Readiness
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+
+from server.features.readiness import ComponentState
+
+
+class ComponentReadiness(BaseModel):
+    """
+    Summary
+    -------
+    the startup state of a single model
+
+    Attributes
+    ----------
+    state (ComponentState)
+        the current stage of the startup
+
+    progress (float)
+        the completed share of the startup between 0.0 and 1.0
+
+    error (str?)
+        the error that stopped the model from loading
+    """
+
+    state: ComponentState
+    progress: float = Field(ge=0.0, le=1.0)
+    error: str | None = None
+
+
+class Readiness(BaseModel):
+    """
+    Summary
+    -------
+    the readiness response schema
+
+    Attributes
+    ----------
+    ready (bool)
+        whether every model is ready to serve requests
+
+    components (dict[str, ComponentReadiness])
+        the startup state of each model
+    """
+
+    ready: bool
+    components: dict[str, ComponentReadiness]
@@ -1,4 +1,10 @@
+from server.schemas.v1.estimated import Estimated as Estimated
 from server.schemas.v1.language import LanguageResult as LanguageResult
+from server.schemas.v1.memory import MemoryReport as MemoryReport
+from server.schemas.v1.model_swap import ModelSwap as ModelSwap
+from server.schemas.v1.model_swap import ModelSwapStatus as ModelSwapStatus
+from server.schemas.v1.shadow import ShadowPair as ShadowPair
+from server.schemas.v1.shadow import ShadowSummary as ShadowSummary
 from server.schemas.v1.tokens import Tokens as Tokens
 from server.schemas.v1.translated import Translated as Translated
 from server.schemas.v1.translation import Translation as Translation
@@ -6,3 +12,5 @@ from server.schemas.v1.translation_batch import TranslationBatch as TranslationB
 from server.schemas.v1.translation_batch import TranslatedBatch as TranslatedBatch
 from server.schemas.v1.translation_batch import TranslatedBatchItem as TranslatedBatchItem
 from server.schemas.v1.translation_batch import TranslationBatchItem as TranslationBatchItem
+from server.schemas.v1.translation_fanout import TranslatedFanout as TranslatedFanout
+from server.schemas.v1.translation_fanout import TranslationFanout as TranslationFanout
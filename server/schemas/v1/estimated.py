@@ -0,0 +1,37 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class Estimated(BaseModel):
+    """
+    Summary
+    -------
+    the translation cost estimate schema
+
+    Attributes
+    ----------
+    tokens (int)
+        the number of tokens in the input text
+
+    cost (float)
+        the predicted decode time in seconds
+
+    queue_wait (float)
+        the predicted time in seconds before the request would start decoding
+    """
+
+    tokens: Annotated[
+        int,
+        Field(description="the number of tokens in the input text", examples=[12]),
+    ]
+
+    cost: Annotated[
+        float,
+        Field(description="the predicted decode time in seconds", examples=[0.12]),
+    ]
+
+    queue_wait: Annotated[
+        float,
+        Field(description="the predicted time in seconds before the request would start decoding", examples=[0.35]),
+    ]
@@ -0,0 +1,67 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class MemoryReport(BaseModel):
+    """
+    Summary
+    -------
+    the memory report schema
+
+    Attributes
+    ----------
+    usage (int)
+        the memory usage counted against the OOM killer, from the cgroup when available
+
+    resident (int)
+        the resident set size of the process
+
+    proportional (int)
+        the proportional set size of the process, which splits pages shared with other workers between them
+
+    ceiling (int?)
+        the memory usage that batches adapt to stay under
+
+    max_batch_tokens (int?)
+        the current maximum number of tokens decoded at once
+
+    model (int)
+        the memory attributed to the translation models
+
+    tokeniser (int)
+        the memory attributed to the tokenisers
+
+    language_detector (int)
+        the memory attributed to the language detector
+
+    cache (int)
+        the memory attributed to model weights cached in RAM while unloaded from the GPU
+
+    transient_batch (int)
+        the growth of memory usage across the last batch
+
+    peak_transient_batch (int)
+        the largest growth of memory usage across a single batch
+    """
+
+    usage: Annotated[int, Field(description="the memory usage in bytes, from the cgroup when available")]
+    resident: Annotated[int, Field(description="the resident set size of the process in bytes")]
+    proportional: Annotated[
+        int,
+        Field(description="the proportional set size of the process in bytes, shared pages split between workers"),
+    ]
+    ceiling: Annotated[int | None, Field(description="the memory ceiling in bytes, unset when not configured")]
+    max_batch_tokens: Annotated[
+        int | None,
+        Field(description="the current maximum number of tokens decoded at once, unset when unlimited"),
+    ]
+    model: Annotated[int, Field(description="the memory in bytes attributed to the translation models")]
+    tokeniser: Annotated[int, Field(description="the memory in bytes attributed to the tokenisers")]
+    language_detector: Annotated[int, Field(description="the memory in bytes attributed to the language detector")]
+    cache: Annotated[int, Field(description="the memory in bytes of model weights cached in RAM")]
+    transient_batch: Annotated[int, Field(description="the growth of memory usage in bytes across the last batch")]
+    peak_transient_batch: Annotated[
+        int,
+        Field(description="the largest growth of memory usage in bytes across a single batch"),
+    ]
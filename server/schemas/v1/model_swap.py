@@ -0,0 +1,100 @@
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+
+class ModelSwap(BaseModel):
+    """
+    Summary
+    -------
+    the model swap request schema
+
+    Attributes
+    ----------
+    repository (str?)
+        the repository of the new model, overrides `model_size`
+
+    model_size (str?)
+        the size preset of the new model
+
+    compute_type (str?)
+        the compute type the new model is loaded with
+
+    force (bool)
+        whether to swap even when the memory headroom check fails
+    """
+
+    repository: Annotated[
+        str | None,
+        Field(
+            description="the repository of the new model, overrides `model_size`",
+            examples=["OpenNMT/nllb-200-3.3B-ct2-int8"],
+        ),
+    ] = None
+
+    model_size: Annotated[
+        Literal["small", "medium", "large"] | None,
+        Field(description="the size preset of the new model, the current model is kept when neither is set"),
+    ] = None
+
+    compute_type: Annotated[
+        str | None,
+        Field(
+            description="the compute type the new model is loaded with, defaults to the current one",
+            examples=["int8"],
+        ),
+    ] = None
+
+    force: Annotated[
+        bool,
+        Field(description="whether to swap even when the new model is not expected to fit beside the current one"),
+    ] = False
+
+
+class ModelSwapStatus(BaseModel):
+    """
+    Summary
+    -------
+    the model swap status schema
+
+    Attributes
+    ----------
+    state (str)
+        the progress of the last swap
+
+    repository (str)
+        the repository of the current model
+
+    compute_type (str)
+        the compute type of the current model
+
+    required_memory (int?)
+        the estimated memory of the model swapped in by the last swap
+
+    available_memory (int?)
+        the memory that could still be allocated when the last swap was requested
+
+    error (str?)
+        the reason the last swap failed
+    """
+
+    state: Annotated[
+        Literal["idle", "loading", "warming", "draining", "swapped", "failed"],
+        Field(description="the progress of the last swap", examples=["loading"]),
+    ]
+
+    repository: Annotated[str, Field(description="the repository of the current model")]
+
+    compute_type: Annotated[str, Field(description="the compute type of the current model")]
+
+    required_memory: Annotated[
+        int | None,
+        Field(description="the estimated memory in bytes of the model swapped in by the last swap"),
+    ]
+
+    available_memory: Annotated[
+        int | None,
+        Field(description="the memory in bytes that could still be allocated when the last swap was requested"),
+    ]
+
+    error: Annotated[str | None, Field(description="the reason the last swap failed")]
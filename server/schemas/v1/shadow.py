@@ -0,0 +1,89 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from server.typedefs import Language
+
+
+class ShadowPair(BaseModel):
+    """
+    Summary
+    -------
+    the shadow comparison schema of one language pair
+
+    Attributes
+    ----------
+    source (Language)
+        the source language
+
+    target (Language)
+        the target language
+
+    count (int)
+        the number of compared translations
+
+    chrf (float)
+        the mean chrF of the shadow translations against the primary translations
+
+    primary_latency (float)
+        the mean latency of the primary configuration in seconds
+
+    shadow_latency (float)
+        the mean latency of the shadow configuration in seconds
+    """
+
+    source: Annotated[Language, Field(description="the source language", examples=["eng_Latn"])]
+
+    target: Annotated[Language, Field(description="the target language", examples=["deu_Latn"])]
+
+    count: Annotated[int, Field(description="the number of compared translations")]
+
+    chrf: Annotated[
+        float,
+        Field(description="the mean chrF of the shadow translations against the primary translations", examples=[87.5]),
+    ]
+
+    primary_latency: Annotated[float, Field(description="the mean latency of the primary configuration in seconds")]
+
+    shadow_latency: Annotated[float, Field(description="the mean latency of the shadow configuration in seconds")]
+
+
+class ShadowSummary(BaseModel):
+    """
+    Summary
+    -------
+    the shadow traffic summary schema
+
+    Attributes
+    ----------
+    percentage (float)
+        the percentage of requests mirrored to the shadow configuration
+
+    mirrored (int)
+        the number of requests compared with the shadow configuration
+
+    dropped (int)
+        the number of sampled requests not mirrored because the shadow capacity was exhausted
+
+    failed (int)
+        the number of mirrored requests that failed on the shadow configuration
+
+    pairs (list[ShadowPair])
+        the comparison of every language pair, most compared first
+    """
+
+    percentage: Annotated[float, Field(description="the percentage of requests mirrored to the shadow configuration")]
+
+    mirrored: Annotated[int, Field(description="the number of requests compared with the shadow configuration")]
+
+    dropped: Annotated[
+        int,
+        Field(description="the number of sampled requests not mirrored because the shadow capacity was exhausted"),
+    ]
+
+    failed: Annotated[int, Field(description="the number of mirrored requests that failed on the shadow configuration")]
+
+    pairs: Annotated[
+        list[ShadowPair],
+        Field(description="the comparison of every language pair, most compared first"),
+    ]
@@ -26,6 +26,9 @@ class TranslationBatchItem(BaseModel):
         minimum decoding length as percentage of input tokens (0.0-1.0).
         Defaults to 0.8 (80%). Used to prevent early stopping in NLLB models.
         See: https://huggingface.co/facebook/nllb-200-distilled-600M/discussions/6
+
+    profile (str?)
+        the name of the decoding profile, overrides the batch profile
     """
 
     text: Annotated[
@@ -54,6 +57,11 @@ class TranslationBatchItem(BaseModel):
         ),
     ] = 0.8
 
+    profile: Annotated[
+        str | None,
+        Field(description="the name of the decoding profile, e.g. `fast`, `balanced` or `quality`", examples=["fast"]),
+    ] = None
+
 
 class TranslationBatch(BaseModel):
     """
@@ -65,6 +73,9 @@ class TranslationBatch(BaseModel):
     ----------
     translations (list[TranslationBatchItem])
         list of translation requests to process in batch
+
+    profile (str?)
+        the name of the decoding profile for items that do not select one
     """
 
     translations: Annotated[
@@ -82,6 +93,11 @@ class TranslationBatch(BaseModel):
         ),
     ]
 
+    profile: Annotated[
+        str | None,
+        Field(description="the name of the decoding profile for items that do not select one", examples=["quality"]),
+    ] = None
+
 
 class TranslatedBatchItem(BaseModel):
     """
@@ -0,0 +1,88 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from server.typedefs import Language
+
+
+class TranslationFanout(BaseModel):
+    """
+    Summary
+    -------
+    the NLLB fan-out translation schema
+
+    Attributes
+    ----------
+    text (str)
+        source text of a single language
+
+    source (Language)
+        source language in the FLORES-200 code format
+
+    targets (list[Language])
+        target languages in the FLORES-200 code format
+
+    min_length_percentage (float)
+        minimum decoding length as percentage of input tokens (0.0-1.0)
+
+    profile (str?)
+        the name of the decoding profile
+    """
+
+    text: Annotated[
+        str,
+        Field(
+            min_length=1, max_length=4096, description="source text of a single language", examples=["Hello, world!"]
+        ),
+    ]
+
+    source: Annotated[
+        Language,
+        Field(description="source language in the FLORES-200 code format", examples=["eng_Latn"]),
+    ]
+
+    targets: Annotated[
+        list[Language],
+        Field(
+            min_length=1,
+            max_length=202,
+            description="target languages in the FLORES-200 code format, duplicates are translated once",
+            examples=[["spa_Latn", "fra_Latn", "deu_Latn"]],
+        ),
+    ]
+
+    min_length_percentage: Annotated[
+        float,
+        Field(
+            ge=0.0,
+            le=1.0,
+            description="Minimum decoding length as percentage of input tokens (0.0-1.0). Defaults to 0.8 (80%).",
+            examples=[0.8],
+        ),
+    ] = 0.8
+
+    profile: Annotated[
+        str | None,
+        Field(description="the name of the decoding profile, e.g. `fast`, `balanced` or `quality`", examples=["fast"]),
+    ] = None
+
+
+class TranslatedFanout(BaseModel):
+    """
+    Summary
+    -------
+    the fan-out translated schema
+
+    Attributes
+    ----------
+    results (dict[Language, str])
+        the translated text keyed by target language
+    """
+
+    results: Annotated[
+        dict[Language, str],
+        Field(
+            description="the translated text keyed by target language",
+            examples=[{"spa_Latn": "¡Hola, mundo!", "fra_Latn": "Bonjour, le monde!"}],
+        ),
+    ]
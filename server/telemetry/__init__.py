@@ -2,23 +2,19 @@
 OpenTelemetry instrumentation setup for monitoring API calls and performance metrics.
 """
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from opentelemetry import metrics, trace
-from opentelemetry.exporter.prometheus import PrometheusMetricReader
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
 
 from server.logging_config import get_logger
-from server.telemetry.log_handler import get_log_handler as get_log_handler
-from server.telemetry.meter_provider import (
-    get_meter_provider as get_meter_provider,
-    get_prometheus_metric_reader as get_prometheus_metric_reader,
-)
-from server.telemetry.tracer_provider import get_tracer_provider as get_tracer_provider
+
+if TYPE_CHECKING:
+    from opentelemetry.exporter.prometheus import PrometheusMetricReader
+
+# the SDK, exporters and instrumentation are only imported by `setup_telemetry`, once telemetry is enabled
 
 # Global reference to the Prometheus metric reader
-_prometheus_metric_reader: Optional[PrometheusMetricReader] = None
+_prometheus_metric_reader: Optional["PrometheusMetricReader"] = None
 
 logger = get_logger(__name__)
 
@@ -39,6 +35,12 @@ def setup_telemetry(app, service_name: Optional[str] = None):
     if not config.otel_enabled:
         return
 
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor  # noqa: PLC0415
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter  # noqa: PLC0415
+
+    from server.telemetry.meter_provider import get_meter_provider, get_prometheus_metric_reader  # noqa: PLC0415
+    from server.telemetry.tracer_provider import get_tracer_provider  # noqa: PLC0415
+
     service_name = service_name or config.app_name
 
     # Set up tracing if OTLP endpoint is configured
@@ -67,7 +69,7 @@ def setup_telemetry(app, service_name: Optional[str] = None):
     logger.info("OpenTelemetry instrumentation enabled", service_name=service_name, app_id=app_id)
 
 
-def get_metrics_reader() -> Optional[PrometheusMetricReader]:
+def get_metrics_reader() -> Optional["PrometheusMetricReader"]:
     """
     Get the Prometheus metric reader for exposing metrics endpoint.
 
@@ -1,3 +1,4 @@
 from server.typedefs.confidence import Confidence as Confidence
 from server.typedefs.language import Language as Language
+from server.typedefs.scored_translation import ScoredTranslation as ScoredTranslation
 from server.typedefs.state import AppState as AppState, get_app_state as get_app_state
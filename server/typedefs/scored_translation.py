@@ -0,0 +1,28 @@
+from typing import NamedTuple
+
+
+class ScoredTranslation(NamedTuple):
+    """
+    Summary
+    -------
+    a translation with the information required to estimate its confidence
+
+    Attributes
+    ----------
+    text (str)
+        the translated text
+
+    score (float)
+        the log-probability of the hypothesis, normalised by its length
+
+    source_length (int)
+        the number of tokens in the source text
+
+    tokens (list[str])
+        the generated target tokens, without the target language prefix
+    """
+
+    text: str
+    score: float
+    source_length: int
+    tokens: list[str]
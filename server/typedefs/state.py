@@ -4,6 +4,7 @@ from fastapi import Request
 
 if TYPE_CHECKING:
     from server.features.detector import LanguageDetectorProtocol
+    from server.features.scheduler import ScheduledTranslator
     from server.features.translator import TranslatorProtocol
 
 
@@ -20,14 +21,28 @@ class AppState:
 
     translator (TranslatorProtocol)
         the translator
+
+    scheduler (ScheduledTranslator?)
+        the scheduled translator, unset when the scheduler is disabled
     """
 
-    language_detector: "LanguageDetectorProtocol"
-    translator: "TranslatorProtocol"
+    __slots__ = ("state",)
 
     def __init__(self, request: Request):
-        self.language_detector = request.app.state.language_detector
-        self.translator = request.app.state.translator
+        # the models are loaded in the background, so they are only looked up once a route uses them
+        self.state = request.app.state
+
+    @property
+    def language_detector(self) -> "LanguageDetectorProtocol":
+        return self.state.language_detector
+
+    @property
+    def translator(self) -> "TranslatorProtocol":
+        return self.state.translator
+
+    @property
+    def scheduler(self) -> "ScheduledTranslator | None":
+        return self.state.scheduler
 
 
 def get_app_state(request: Request) -> AppState:
@@ -1,2 +1,3 @@
-from server.utils.huggingface_download import huggingface_download as huggingface_download
-from server.utils.huggingface_file_download import huggingface_file_download as huggingface_file_download
+from server.utils.chrf import chrf as chrf
+from server.utils.huggingface_download import huggingface_download as huggingface_download
+from server.utils.huggingface_file_download import huggingface_file_download as huggingface_file_download
@@ -0,0 +1,78 @@
+from collections import Counter
+
+
+def character_ngrams(text: str, order: int) -> Counter[str]:
+    """
+    Summary
+    -------
+    count the character n-grams of a text, ignoring whitespace
+
+    Parameters
+    ----------
+    text (str)
+        the text to extract the n-grams from
+
+    order (int)
+        the length of the n-grams
+
+    Returns
+    -------
+    ngrams (Counter[str])
+        the n-gram counts
+    """
+    characters = "".join(text.split())
+    return Counter(characters[index : index + order] for index in range(len(characters) - order + 1))
+
+
+def chrf(hypothesis: str, reference: str, *, max_order: int = 6, beta: float = 2.0) -> float:
+    """
+    Summary
+    -------
+    compute the sentence-level chrF score between a hypothesis and a reference
+
+    Parameters
+    ----------
+    hypothesis (str)
+        the candidate translation
+
+    reference (str)
+        the reference translation
+
+    max_order (int)
+        the maximum character n-gram order
+
+    beta (float)
+        the recall weight of the F-score
+
+    Returns
+    -------
+    score (float)
+        the chrF score between 0 and 100
+    """
+    precisions: list[float] = []
+    recalls: list[float] = []
+
+    for order in range(1, max_order + 1):
+        hypothesis_ngrams = character_ngrams(hypothesis, order)
+        reference_ngrams = character_ngrams(reference, order)
+        hypothesis_total = hypothesis_ngrams.total()
+        reference_total = reference_ngrams.total()
+
+        if not hypothesis_total or not reference_total:
+            continue
+
+        matches = (hypothesis_ngrams & reference_ngrams).total()
+        precisions.append(matches / hypothesis_total)
+        recalls.append(matches / reference_total)
+
+    if not precisions:
+        return 100.0 if hypothesis.split() == reference.split() else 0.0
+
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+
+    if not precision and not recall:
+        return 0.0
+
+    beta_squared = beta**2
+    return 100 * (1 + beta_squared) * precision * recall / (beta_squared * precision + recall)
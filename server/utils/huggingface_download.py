@@ -1,13 +1,44 @@
 import os
+from collections.abc import Callable
 from pathlib import Path
 
 from huggingface_hub import snapshot_download
+from tqdm.auto import tqdm
+
 from server.logging_config import get_logger
+from server.utils.model_manifest import resolve_snapshot
 
 logger = get_logger(__name__)
 
 
-def huggingface_download(repository: str) -> str:
+def progress_bar(on_progress: Callable[[float], None]) -> type[tqdm]:
+    """
+    Summary
+    -------
+    get a progress bar class that reports the share of downloaded files
+
+    Parameters
+    ----------
+    on_progress (Callable[[float], None]) : called with the downloaded share between 0.0 and 1.0
+
+    Returns
+    -------
+    progress_bar (type[tqdm]) : the progress bar class
+    """
+
+    class ProgressBar(tqdm):
+        def update(self, n: float | None = 1) -> bool | None:
+            displayed = super().update(n)
+
+            if self.total:
+                on_progress(self.n / self.total)
+
+            return displayed
+
+    return ProgressBar
+
+
+def huggingface_download(repository: str, *, on_progress: Callable[[float], None] | None = None) -> str:
     """
     Summary
     -------
@@ -16,13 +47,22 @@ def huggingface_download(repository: str) -> str:
     Parameters
     ----------
     repository (str) : the name of the Hugging Face repository
+    on_progress (Callable[[float], None]?) : called with the downloaded share of files while downloading
 
     Returns
     -------
     repository_path (str) : local path to the model
+
+    Raises
+    ------
+    StaleSnapshotError : when the snapshot recorded in the model manifest no longer matches its files
     """
     cache_dir = Path.home() / ".cache" / "huggingface"
     repo_name = repository.replace("/", "--")
+
+    # the manifest written by scripts/download_models.py pins the exact snapshot, so the cache is not scanned
+    if (snapshot := resolve_snapshot(repository, cache_dir)) is not None:
+        return str(snapshot)
     
     logger.debug(
         "Searching for model",
@@ -111,6 +151,7 @@ def huggingface_download(repository: str) -> str:
         model_path = snapshot_download(
             repo_id=repository,
             cache_dir=str(cache_dir),
+            tqdm_class=progress_bar(on_progress) if on_progress else None,
         )
         return model_path
     except Exception as e:
@@ -3,6 +3,8 @@ from pathlib import Path
 
 from huggingface_hub import hf_hub_download
 
+from server.utils.model_manifest import resolve_snapshot
+
 
 def huggingface_file_download(repository: str, file: str) -> str:
     """
@@ -18,9 +20,17 @@ def huggingface_file_download(repository: str, file: str) -> str:
     Returns
     -------
     file_path (str) : local path to the file
+
+    Raises
+    ------
+    StaleSnapshotError : when the snapshot recorded in the model manifest no longer matches the file
     """
     cache_dir = Path.home() / ".cache" / "huggingface"
     repo_name = repository.replace("/", "--")
+
+    # the manifest written by scripts/download_models.py pins the exact snapshot, so the cache is not scanned
+    if (snapshot := resolve_snapshot(repository, cache_dir, file=file)) is not None:
+        return str(snapshot / file)
     
     # Check hub format: hub/models--repo-name/snapshots/hash/file
     hub_path = cache_dir / "hub" / f"models--{repo_name}" / "snapshots"
@@ -0,0 +1,215 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from pathlib import Path
+
+from server.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+BLOCK_SIZE = 64 * 1024 * 1024
+VERIFICATION_WORKERS = min(8, os.cpu_count() or 1)
+
+
+class StaleSnapshotError(FileNotFoundError):
+    """
+    Summary
+    -------
+    raised when the files of a snapshot no longer match the model manifest
+    """
+
+
+def read_manifest(cache_dir: Path) -> dict[str, dict]:
+    """
+    Summary
+    -------
+    read the repositories recorded in the model manifest
+
+    Parameters
+    ----------
+    cache_dir (Path) : the Hugging Face cache directory the manifest is stored in
+
+    Returns
+    -------
+    repositories (dict[str, dict]) : the manifest entries keyed by repository, empty when there is no manifest
+    """
+    try:
+        manifest = json.loads((cache_dir / MANIFEST_NAME).read_text())
+
+    except FileNotFoundError:
+        return {}
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"unsupported model manifest version {manifest.get('version')!r} in {cache_dir}")
+
+    return manifest["repositories"]
+
+
+def write_manifest(cache_dir: Path, repositories: dict[str, dict]) -> None:
+    """
+    Summary
+    -------
+    record repositories in the model manifest, keeping the entries of other repositories
+
+    Parameters
+    ----------
+    cache_dir (Path) : the Hugging Face cache directory the manifest is stored in
+    repositories (dict[str, dict]) : the manifest entries to record, keyed by repository
+    """
+    manifest_path = cache_dir / MANIFEST_NAME
+    temporary_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+    manifest = {"version": MANIFEST_VERSION, "repositories": {**read_manifest(cache_dir), **repositories}}
+    temporary_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    temporary_path.replace(manifest_path)
+
+
+def hash_block(path: Path, offset: int) -> str:
+    """
+    Summary
+    -------
+    get the SHA-256 checksum of one block of a file
+
+    Parameters
+    ----------
+    path (Path) : the path to the file
+    offset (int) : the offset of the block in bytes
+
+    Returns
+    -------
+    checksum (str) : the hexadecimal checksum of the block
+    """
+    with path.open("rb") as file:
+        file.seek(offset)
+        return sha256(file.read(BLOCK_SIZE)).hexdigest()
+
+
+def get_checksums(paths: list[Path]) -> list[list[str]]:
+    """
+    Summary
+    -------
+    get the block checksums of files, hashing the blocks of all files in parallel threads
+
+    Parameters
+    ----------
+    paths (list[Path]) : the paths to the files
+
+    Returns
+    -------
+    checksums (list[list[str]]) : the checksums of each file's blocks, in the order of the paths
+    """
+    blocks = [(path, offset) for path in paths for offset in range(0, max(1, path.stat().st_size), BLOCK_SIZE)]
+
+    with ThreadPoolExecutor(VERIFICATION_WORKERS) as executor:
+        block_checksums = iter(executor.map(lambda block: hash_block(*block), blocks))
+
+    return [[next(block_checksums) for _ in range(0, max(1, path.stat().st_size), BLOCK_SIZE)] for path in paths]
+
+
+def describe_snapshot(cache_dir: Path, snapshot: Path, *, revision: str, files: list[str]) -> dict:
+    """
+    Summary
+    -------
+    get the manifest entry of a downloaded snapshot
+
+    Parameters
+    ----------
+    cache_dir (Path) : the Hugging Face cache directory the snapshot is stored in
+    snapshot (Path) : the path to the snapshot
+    revision (str) : the commit hash of the snapshot
+    files (list[str]) : the names of the snapshot files to record
+
+    Returns
+    -------
+    entry (dict) : the snapshot path relative to the cache, its revision and the size and checksums of each file
+    """
+    paths = [snapshot / file for file in files]
+
+    return {
+        "snapshot": snapshot.relative_to(cache_dir).as_posix(),
+        "revision": revision,
+        "files": {
+            file: {"size": path.stat().st_size, "sha256": checksums}
+            for file, path, checksums in zip(files, paths, get_checksums(paths), strict=True)
+        },
+    }
+
+
+def verify_snapshot(repository: str, snapshot: Path, files: dict[str, dict], *, checksums: bool) -> None:
+    """
+    Summary
+    -------
+    check that the files of a snapshot still match the manifest
+
+    Parameters
+    ----------
+    repository (str) : the name of the Hugging Face repository
+    snapshot (Path) : the path to the snapshot
+    files (dict[str, dict]) : the manifest entries of the files to check, keyed by file name
+    checksums (bool) : whether to compare the block checksums as well as the sizes
+
+    Raises
+    ------
+    StaleSnapshotError : when a file is missing, or its size or checksums differ from the manifest
+    """
+    for file, expected in files.items():
+        try:
+            size = (snapshot / file).stat().st_size
+
+        except FileNotFoundError:
+            raise StaleSnapshotError(f"{file} of {repository} is missing from {snapshot}") from None
+
+        if size != expected["size"]:
+            raise StaleSnapshotError(f"{file} of {repository} is {size} bytes, the manifest expects {expected['size']}")
+
+    if not checksums:
+        return
+
+    actual_checksums = get_checksums([snapshot / file for file in files])
+
+    for (file, expected), actual in zip(files.items(), actual_checksums, strict=True):
+        if actual != expected["sha256"]:
+            raise StaleSnapshotError(f"{file} of {repository} does not match the checksums in the manifest")
+
+
+def resolve_snapshot(repository: str, cache_dir: Path, *, file: str | None = None) -> Path | None:
+    """
+    Summary
+    -------
+    resolve the snapshot of a repository from the model manifest, without scanning the cache
+
+    `MODEL_VERIFICATION=checksum` compares the block checksums of the files, otherwise only their sizes are compared.
+
+    Parameters
+    ----------
+    repository (str) : the name of the Hugging Face repository
+    cache_dir (Path) : the Hugging Face cache directory
+    file (str?) : the only file of the snapshot to verify, all recorded files are verified when not set
+
+    Returns
+    -------
+    snapshot (Path?) : the path to the verified snapshot, None when the repository is not in the manifest
+
+    Raises
+    ------
+    StaleSnapshotError : when the snapshot no longer matches the manifest
+    """
+    if (entry := read_manifest(cache_dir).get(repository)) is None:
+        return None
+
+    snapshot = cache_dir / entry["snapshot"]
+    files = entry["files"]
+
+    if file is not None and file not in files:
+        raise StaleSnapshotError(f"{file} of {repository} is not recorded in the manifest")
+
+    if file is not None:
+        files = {file: files[file]}
+
+    verify_snapshot(repository, snapshot, files, checksums=os.getenv("MODEL_VERIFICATION", "size") == "checksum")
+
+    logger.debug("Found model in manifest", repository=repository, revision=entry["revision"], path=str(snapshot))
+
+    return snapshot
@@ -1,3 +1,4 @@
+from asyncio import sleep
 from collections.abc import AsyncIterator, Callable
 from typing import Literal
 
@@ -9,6 +10,11 @@ from server.app import app
 from server.config import Config
 
 
+async def wait_until_ready(client: AsyncTestClient[Litestar]) -> None:
+    while (await client.get("/ready")).status_code != 200:  # noqa: ASYNC110, PLR2004
+        await sleep(0.01)
+
+
 def client_factory(config: Config, *, no_lifespans: bool) -> AsyncTestClient[Litestar]:
     litestar = app(config)
 
@@ -34,6 +40,7 @@ async def client(auth_token: str) -> AsyncIterator[AsyncTestClient[Litestar]]:
     config.auth_token = auth_token
 
     async with AsyncTestClient(app=app(config), backend_options={"use_uvloop": True}) as client:
+        await wait_until_ready(client)
         yield client
 
 
@@ -48,4 +55,5 @@ async def session_client(auth_token: str) -> AsyncIterator[AsyncTestClient[Lites
     config.auth_token = auth_token
 
     async with AsyncTestClient(app=app(config), backend_options={"use_uvloop": True}) as client:
+        await wait_until_ready(client)
         yield client
@@ -0,0 +1,52 @@
+# ruff: noqa: S101
+
+from json import dumps, loads
+from pathlib import Path
+
+from ctranslate2 import get_supported_compute_types
+
+from server.features.translator import calibrate_compute_type
+from server.features.translator.calibration import get_cpu_model, get_model_hash
+from server.features.translator.stub import TranslatorStub
+
+
+def test_model_hash_changes_with_the_model(tmp_path: Path) -> None:
+    (tmp_path / "config.json").write_text("{}")
+    (tmp_path / "model.bin").write_bytes(b"weights")
+    model_hash = get_model_hash(str(tmp_path))
+
+    assert get_model_hash(str(tmp_path)) == model_hash
+
+    (tmp_path / "model.bin").write_bytes(b"other weights")
+    assert get_model_hash(str(tmp_path)) != model_hash
+
+
+def test_calibration_is_cached(tmp_path: Path) -> None:
+    (tmp_path / "config.json").write_text("{}")
+    cache_path = tmp_path / "cache" / "compute-types.json"
+    built: list[str] = []
+
+    def build(compute_type: str) -> TranslatorStub:
+        built.append(compute_type)
+        return TranslatorStub()
+
+    compute_type = calibrate_compute_type(str(tmp_path), build=build, cache_path=cache_path)
+
+    assert compute_type in get_supported_compute_types("cpu")
+    assert sorted(built) == sorted(get_supported_compute_types("cpu"))
+    assert loads(cache_path.read_text())[f"{get_cpu_model()}:{get_model_hash(str(tmp_path))}"]["compute_type"] == (
+        compute_type
+    )
+
+    built.clear()
+    assert calibrate_compute_type(str(tmp_path), build=build, cache_path=cache_path) == compute_type
+    assert built == []
+
+
+def test_calibration_cache_is_keyed_by_model(tmp_path: Path) -> None:
+    cache_path = tmp_path / "compute-types.json"
+    model_path = tmp_path / "model"
+    model_path.mkdir()
+    cache_path.write_text(dumps({f"{get_cpu_model()}:{get_model_hash(str(model_path))}": {"compute_type": "int8"}}))
+
+    assert calibrate_compute_type(str(model_path), build=lambda _: TranslatorStub(), cache_path=cache_path) == "int8"
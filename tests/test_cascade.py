@@ -0,0 +1,84 @@
+# ruff: noqa: S101
+
+from types import SimpleNamespace
+
+from pytest import mark
+
+from server.config import Config
+from server.features.translator.cascade import CascadeTranslator, estimate_confidence
+from server.features.translator.nllb import Translator
+from server.typedefs import ScoredTranslation
+
+
+class ScoringTranslator:
+    """
+    Summary
+    -------
+    a CTranslate2 translator stand-in that copies its inputs behind its name,
+    scoring every generated token with the log-probability set for the input
+    """
+
+    def __init__(self, name: str, log_probabilities: dict[str, float]) -> None:
+        self.name = name
+        self.log_probabilities = log_probabilities
+
+    def translate_batch(
+        self,
+        batch_inputs: list[list[str]],
+        *,
+        target_prefix: list[list[str]],
+        **_: object,
+    ) -> list[SimpleNamespace]:
+        results = []
+
+        for (_, *tokens), (target_language,) in zip(batch_inputs, target_prefix, strict=True):
+            hypothesis = [target_language, f"\u2581{self.name}", *(f"\u2581{token}" for token in tokens)]
+            log_probability = self.log_probabilities.get(" ".join(tokens), -0.05)
+            results.append(SimpleNamespace(hypotheses=[hypothesis], scores=[log_probability * (len(hypothesis) - 1)]))
+
+        return results
+
+
+def get_scoring_translator(name: str, log_probabilities: dict[str, float]) -> Translator:
+    config = Config()
+    return Translator(
+        ScoringTranslator(name, log_probabilities),
+        SimpleNamespace(encode=lambda text: SimpleNamespace(tokens=text.split())),
+        use_cuda=False,
+        decoding_profiles=config.decoding_profiles,
+        default_decoding_profile=config.default_decoding_profile,
+        batch_budget=None,
+    )
+
+
+def test_confident_translation() -> None:
+    translation = ScoredTranslation("¡Hola, mundo!", -0.1, 4, ["▁¡", "Hola", ",", "▁mundo", "!"])
+    assert estimate_confidence(translation) > 0.5
+
+
+@mark.parametrize(
+    "translation",
+    [
+        ScoredTranslation("hola", -2.0, 4, ["▁hola", "▁a", "▁todos", "!"]),
+        ScoredTranslation("hola", -0.1, 40, ["▁hola"]),
+        ScoredTranslation("hola hola hola hola", -0.1, 8, ["▁hola", "▁hola"] * 4),
+    ],
+)
+def test_unconfident_translation(translation: ScoredTranslation) -> None:
+    assert estimate_confidence(translation) < 0.5
+
+
+def test_cascade_escalates_only_low_confidence_items() -> None:
+    # the long translation is confident per token, although its cumulative log-probability is low
+    confident = " ".join(f"word{index}" for index in range(40))
+    unconfident = "hello world"
+    cascade = CascadeTranslator(
+        get_scoring_translator("small", {confident: -0.05, unconfident: -3.0}),
+        get_scoring_translator("large", {}),
+        confidence_threshold=0.5,
+    )
+
+    assert cascade.translate_batch([confident, unconfident], ["eng_Latn"] * 2, ["spa_Latn"] * 2) == [
+        f"small {confident}",
+        f"large {unconfident}",
+    ]
@@ -0,0 +1,56 @@
+# ruff: noqa: S101
+
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+from pydantic import ValidationError
+from pytest import raises
+
+from server.config import Config
+from server.features.translator.nllb import Translator
+
+
+class RecordingTranslator:
+    """
+    Summary
+    -------
+    a CTranslate2 translator stand-in that records the decoding options it is called with
+    """
+
+    def __init__(self) -> None:
+        self.options: dict[str, object] = {}
+
+    def generate_tokens(self, *_: object, **options: object) -> Iterator[object]:
+        self.options = options
+        return iter(())
+
+
+def test_default_decoding_profile_decodes_like_before_profiles() -> None:
+    config = Config()
+    recorder = RecordingTranslator()
+    tokeniser = SimpleNamespace(encode=lambda text: SimpleNamespace(tokens=text.split()))
+    translator = Translator(
+        recorder,
+        tokeniser,
+        use_cuda=False,
+        decoding_profiles=config.decoding_profiles,
+        default_decoding_profile=config.default_decoding_profile,
+        batch_budget=None,
+    )
+
+    list(translator.translate_generator("Hello world", "eng_Latn", "spa_Latn", 0.8))
+
+    assert config.decoding_profiles[config.default_decoding_profile].beam_size == 1
+    assert recorder.options["sampling_temperature"] == 0
+    assert recorder.options["no_repeat_ngram_size"] == 3
+    assert recorder.options["repetition_penalty"] == 1.0
+
+
+def test_default_decoding_profile_must_be_configured() -> None:
+    with raises(ValidationError):
+        Config(default_decoding_profile="unknown")
+
+
+def test_tenants_require_the_scheduler() -> None:
+    with raises(ValidationError):
+        Config(tenants={"chat": {"api_key": "key", "tokens_per_second": 100}}, scheduler_enabled=False)
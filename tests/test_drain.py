@@ -0,0 +1,54 @@
+# ruff: noqa: S101
+
+from asyncio import get_running_loop, run
+from types import SimpleNamespace
+
+from starlette.types import Message, Receive, Scope, Send
+
+from server.features.drain import Drain
+from server.middleware.drain import DrainMiddleware
+
+
+def test_drain_waits_for_requests_in_flight() -> None:
+    async def drain_requests() -> None:
+        drain = Drain()
+        request = drain.track()
+        request.__enter__()
+        get_running_loop().call_later(0.05, request.__exit__, None, None, None)
+
+        assert await drain.drain(5) == 0
+        assert drain.draining
+
+    run(drain_requests())
+
+
+def test_drain_stops_at_the_deadline() -> None:
+    async def drain_requests() -> int:
+        drain = Drain()
+
+        with drain.track():
+            return await drain.drain(0.05)
+
+    assert run(drain_requests()) == 1
+
+
+def test_drain_middleware_ignores_untracked_paths() -> None:
+    drain = Drain()
+    in_flight: list[int] = []
+
+    async def app(_scope: Scope, _receive: Receive, _send: Send) -> None:
+        in_flight.append(drain.in_flight)
+
+    async def receive() -> Message:
+        return {"type": "http.disconnect"}
+
+    async def send(_: Message) -> None:
+        pass
+
+    middleware = DrainMiddleware(app, untracked_paths=frozenset({"/ready"}))
+    application = SimpleNamespace(state=SimpleNamespace(drain=drain))
+
+    for path in ("/ready", "/translator"):
+        run(middleware({"type": "http", "path": path, "app": application}, receive, send))
+
+    assert in_flight == [0, 1]
@@ -0,0 +1,81 @@
+# ruff: noqa: S101
+
+from asyncio import run
+from threading import Thread
+
+from pytest import raises
+
+from server.features.hotswap import HotSwap, SwappableTranslator
+from server.features.translator.stub import TranslatorStub
+
+
+def test_swappable_translator_drains_the_old_translator() -> None:
+    old, new = TranslatorStub(), TranslatorStub()
+    translator = SwappableTranslator(old)
+    stream = translator.translate_stream("Hello, world!", "eng_Latn", "spa_Latn")
+    next(stream)
+
+    swap = Thread(target=translator.swap, args=(new,), kwargs={"timeout": 5})
+    swap.start()
+    swap.join(0.1)
+
+    # new requests run on the new translator while the stream keeps the old one
+    assert swap.is_alive()
+    assert translator.translator is new
+
+    list(stream)
+    swap.join(5)
+    assert not swap.is_alive()
+    assert not translator.in_flight
+
+
+def test_swappable_translator_ignores_streams_never_iterated() -> None:
+    old, new = TranslatorStub(), TranslatorStub()
+    translator = SwappableTranslator(old)
+    stream = translator.translate_stream("Hello, world!", "eng_Latn", "spa_Latn")
+
+    assert translator.swap(new, timeout=0.1) is old
+    assert not translator.in_flight
+
+    # the stream runs on the translator that is current when it starts
+    assert next(stream) == next(new.translate_stream("Hello, world!", "eng_Latn", "spa_Latn"))
+
+
+def test_swappable_translator_fails_a_swap_that_does_not_drain() -> None:
+    old, new = TranslatorStub(), TranslatorStub()
+    translator = SwappableTranslator(old)
+    stream = translator.translate_stream("Hello, world!", "eng_Latn", "spa_Latn")
+    next(stream)
+
+    with raises(TimeoutError):
+        translator.swap(new, timeout=0.1)
+
+    assert translator.translator is old
+    stream.close()
+    assert not any(translator.in_flight.values())
+
+
+def test_hot_swap() -> None:
+    translator = SwappableTranslator(TranslatorStub())
+    warmed_up = []
+    hot_swap = HotSwap(
+        translator,
+        repository="OpenNMT/nllb-200-distilled-600M-ct2-int8",
+        compute_type="int8",
+        drain_timeout=5,
+        build=lambda *_: TranslatorStub(),
+        warm_up=warmed_up.append,
+    )
+
+    async def swap() -> None:
+        hot_swap.start("OpenNMT/nllb-200-distilled-1.3B-ct2-int8", "int8_float32", force=True)
+        assert hot_swap.running
+        assert hot_swap.task
+        await hot_swap.task
+
+    run(swap())
+
+    assert hot_swap.state == "swapped"
+    assert hot_swap.repository == "OpenNMT/nllb-200-distilled-1.3B-ct2-int8"
+    assert hot_swap.compute_type == "int8_float32"
+    assert warmed_up == [translator.translator]
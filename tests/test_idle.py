@@ -0,0 +1,65 @@
+# ruff: noqa: S101
+
+from threading import Event
+
+import pytest
+
+from server.features.idle import IdleTranslator, ModelReloadingError
+from server.features.translator.stub import TranslatorStub
+
+
+class SlowTranslatorStub(TranslatorStub):
+    def __init__(self) -> None:
+        self.loading = Event()
+
+    def load_model(self, *, keep_cache: bool) -> bool:
+        self.loading.wait(5)
+        return keep_cache
+
+
+def test_idle_translator_offloads_and_reloads() -> None:
+    translator = IdleTranslator(TranslatorStub(), idle_timeout=0.0, hold_timeout=5.0)
+
+    assert translator.offload_if_idle()
+    assert not translator.loaded
+    assert not translator.offload_if_idle()
+
+    translator.translate("Hello, world!", "eng_Latn", "spa_Latn")
+    assert translator.loaded
+    assert translator.in_flight == 0
+
+
+def test_idle_translator_keeps_recently_used_model() -> None:
+    translator = IdleTranslator(TranslatorStub(), idle_timeout=60.0, hold_timeout=5.0)
+    translator.translate("Hello, world!", "eng_Latn", "spa_Latn")
+
+    assert not translator.offload_if_idle()
+
+
+def test_idle_translator_rejects_while_reloading() -> None:
+    stub = SlowTranslatorStub()
+    translator = IdleTranslator(stub, idle_timeout=0.0, hold_timeout=0.0)
+    translator.offload_if_idle()
+
+    with pytest.raises(ModelReloadingError):
+        translator.translate("Hello, world!", "eng_Latn", "spa_Latn")
+
+    assert translator.in_flight == 0
+
+    stub.loading.set()
+    translator.hold_timeout = 5.0
+    translator.translate("Hello, world!", "eng_Latn", "spa_Latn")
+    assert translator.loaded
+
+
+def test_idle_translator_ignores_streams_never_iterated() -> None:
+    translator = IdleTranslator(TranslatorStub(), idle_timeout=0.0, hold_timeout=5.0)
+    stream = translator.translate_stream("Hello, world!", "eng_Latn", "spa_Latn")
+
+    assert translator.in_flight == 0
+    assert translator.offload_if_idle()
+
+    # the stream reloads the model once it starts
+    assert list(stream)
+    assert translator.loaded
+    assert translator.in_flight == 0
@@ -0,0 +1,81 @@
+# ruff: noqa: S101
+
+from os import environ
+from subprocess import run
+from sys import executable
+
+IMPORT_TIME_BUDGET_MICROSECONDS = 100_000
+OPTIONAL_MODULES = (
+    "aiohttp",
+    "opentelemetry.exporter",
+    "opentelemetry.instrumentation",
+    "opentelemetry.sdk",
+    "prometheus_client",
+    "server.plugins.swagger_ui",
+)
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """
+    Summary
+    -------
+    run a statement in a fresh interpreter with `-X importtime`
+
+    Parameters
+    ----------
+    statement (str)
+        the statement to run
+
+    Returns
+    -------
+    import_times (dict[str, int])
+        the cumulative import time of every imported module in microseconds
+    """
+    process = run(
+        [executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**environ, "OTEL_ENABLED": "false", "STUB_TRANSLATOR": "true", "STUB_LANGUAGE_DETECTOR": "true"},
+    )
+    times: dict[str, int] = {}
+
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+def test_import_time_budget() -> None:
+    assert import_times("import server")["server"] < IMPORT_TIME_BUDGET_MICROSECONDS
+
+
+def test_optional_modules_imported_lazily() -> None:
+    eager = [
+        name
+        for name in import_times("import server.app")
+        if any(name == module or name.startswith(f"{module}.") for module in OPTIONAL_MODULES)
+    ]
+    assert not eager
+
+
+def test_lazy_app_is_the_application() -> None:
+    process = run(
+        [
+            executable,
+            "-c",
+            (
+                "import server; from fastapi import FastAPI; "
+                "print(isinstance(server.app, FastAPI), isinstance(server.app, FastAPI))"
+            ),
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**environ, "OTEL_ENABLED": "false", "STUB_TRANSLATOR": "true", "STUB_LANGUAGE_DETECTOR": "true"},
+    )
+    assert process.stdout.split() == ["True", "True"]
@@ -0,0 +1,74 @@
+# ruff: noqa: S101
+
+from asyncio import AbstractEventLoop, get_running_loop, run, start_unix_server
+from asyncio import Event as AsyncEvent
+from collections.abc import Iterator
+from functools import partial
+from pathlib import Path
+from threading import Event, Thread
+
+from pytest import fixture, raises
+
+from server.features.inference import InferenceClient, InferenceError, handle_connection
+from server.features.inference.framing import HEADER, decode_payload, encode_frame
+from server.features.translator.stub import TranslatorStub
+
+
+@fixture
+def inference_socket(tmp_path: Path) -> Iterator[str]:
+    path = str(tmp_path / "inference.sock")
+    started = Event()
+    stopped: AsyncEvent | None = None
+    loop: AbstractEventLoop | None = None
+
+    async def serve() -> None:
+        nonlocal loop, stopped
+        loop = get_running_loop()
+        stopped = AsyncEvent()
+        handler = partial(handle_connection, translator=TranslatorStub(), tenants={})
+
+        async with await start_unix_server(handler, path=path):
+            started.set()
+            await stopped.wait()
+
+    thread = Thread(target=run, args=(serve(),))
+    thread.start()
+    started.wait()
+
+    yield path
+
+    assert loop is not None
+    assert stopped is not None
+    loop.call_soon_threadsafe(stopped.set)
+    thread.join()
+
+
+def test_frame_round_trip() -> None:
+    payload = ("interactive", None, None, (["Hello"], ["eng_Latn"], ["spa_Latn"], None), {"profile": "fast"})
+    frame = encode_frame(7, 1, payload)
+
+    assert HEADER.unpack(frame[: HEADER.size]) == (7, 1, len(frame) - HEADER.size)
+    assert decode_payload(frame[HEADER.size :]) == payload
+
+
+def test_client_forwards_to_the_inference_process(inference_socket: str) -> None:
+    with InferenceClient(inference_socket) as client:
+        assert client.translate("Hello", "eng_Latn", "spa_Latn") == "Hello from eng_Latn to spa_Latn"
+        assert client.translate_batch(["a", "b"], ["eng_Latn"] * 2, ["fra_Latn"] * 2) == [
+            "a from eng_Latn to fra_Latn",
+            "b from eng_Latn to fra_Latn",
+        ]
+        assert client.translate_fanout("a", "eng_Latn", ["fra_Latn", "deu_Latn"]) == [
+            "a from eng_Latn to fra_Latn",
+            "a from eng_Latn to deu_Latn",
+        ]
+        assert list(client.translate_stream("a b", "eng_Latn", "spa_Latn")) == [
+            "a from eng_Latn to spa_Latn",
+            "b from eng_Latn to spa_Latn",
+        ]
+        assert client.count_tokens("a b c") == 3
+
+
+def test_client_raises_errors_of_the_inference_process(inference_socket: str) -> None:
+    with InferenceClient(inference_socket) as client, raises(InferenceError):
+        client.estimate("Hello", "eng_Latn", "spa_Latn")
@@ -0,0 +1,48 @@
+# ruff: noqa: S101
+
+from pathlib import Path
+
+import pytest
+
+from server.utils.model_manifest import StaleSnapshotError, describe_snapshot, resolve_snapshot, write_manifest
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    snapshot = tmp_path / "models--OpenNMT--nllb" / "snapshots" / "abc"
+    snapshot.mkdir(parents=True)
+    (snapshot / "model.bin").write_bytes(b"weights")
+    (snapshot / "config.json").write_text("{}")
+    write_manifest(
+        tmp_path,
+        {"OpenNMT/nllb": describe_snapshot(tmp_path, snapshot, revision="abc", files=["model.bin", "config.json"])},
+    )
+
+    return tmp_path
+
+
+def test_resolve_snapshot(cache_dir: Path) -> None:
+    snapshot = cache_dir / "models--OpenNMT--nllb" / "snapshots" / "abc"
+
+    assert resolve_snapshot("OpenNMT/nllb", cache_dir) == snapshot
+    assert resolve_snapshot("OpenNMT/nllb", cache_dir, file="model.bin") == snapshot
+    assert resolve_snapshot("facebook/fasttext", cache_dir) is None
+
+
+def test_resolve_snapshot_refuses_stale_files(cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    model = cache_dir / "models--OpenNMT--nllb" / "snapshots" / "abc" / "model.bin"
+    model.write_bytes(b"Weights")
+    assert resolve_snapshot("OpenNMT/nllb", cache_dir)
+
+    monkeypatch.setenv("MODEL_VERIFICATION", "checksum")
+
+    with pytest.raises(StaleSnapshotError):
+        resolve_snapshot("OpenNMT/nllb", cache_dir)
+
+    model.write_bytes(b"truncated")
+
+    with pytest.raises(StaleSnapshotError):
+        resolve_snapshot("OpenNMT/nllb", cache_dir, file="model.bin")
+
+    with pytest.raises(StaleSnapshotError):
+        resolve_snapshot("OpenNMT/nllb", cache_dir, file="tokenizer.json")
@@ -0,0 +1,114 @@
+# ruff: noqa: S101
+
+from pathlib import Path
+from threading import Event, Thread
+from time import sleep
+
+import pytest
+
+from server.features.memory.budget import BatchTokenBudget
+from server.features.memory.footprint import measure_footprint, memory_footprint
+from server.features.memory.residency import get_locked_memory, get_model_files, prefetch_model
+from server.features.memory.usage import (
+    get_major_page_faults,
+    get_memory_usage,
+    get_proportional_memory,
+    get_resident_memory,
+)
+
+
+def test_memory_usage() -> None:
+    assert get_resident_memory() > 0
+    assert 0 < get_proportional_memory() <= get_resident_memory()
+    assert get_memory_usage() > 0
+    assert get_major_page_faults() >= 0
+    assert get_locked_memory() >= 0
+
+
+@pytest.mark.parametrize("mode", ["readahead", "read"])
+def test_prefetch_model(tmp_path: Path, mode: str) -> None:
+    (tmp_path / "model.bin").write_bytes(bytes(1024))
+    (tmp_path / "config.json").write_text("{}")
+
+    assert [path.name for path in get_model_files(str(tmp_path))] == ["model.bin", "config.json"]
+
+    for thread in prefetch_model(str(tmp_path), mode=mode):
+        thread.join()
+
+
+def test_batch_token_budget_shrinks_over_ceiling() -> None:
+    budget = BatchTokenBudget(ceiling=1000, minimum=64, maximum=1024, token_memory=0)
+    budget.update(800, 950, tokens=150)
+    assert budget.tokens == 512
+    assert budget.last_transient == 150
+
+    for _ in range(8):
+        budget.update(950, 950, tokens=budget.tokens)
+
+    assert budget.tokens == 64
+
+
+def test_batch_token_budget_grows_under_ceiling() -> None:
+    budget = BatchTokenBudget(ceiling=1000, minimum=64, maximum=1024, token_memory=0)
+    budget.update(800, 950, tokens=150)
+    budget.update(500, 500, tokens=150)
+    assert 512 < budget.tokens <= 1024
+
+
+def test_batch_token_budget_shrinks_before_decoding() -> None:
+    budget = BatchTokenBudget(ceiling=1000, minimum=64, maximum=1024, token_memory=1)
+    assert budget.limit(500, 100) == 1024
+    # a full batch would take usage to 1524 bytes, a quarter of it stays under the 900 bytes watermark
+    assert budget.limit(500, 2048) == 256
+    assert budget.tokens == 256
+
+
+def test_batch_token_budget_learns_token_memory() -> None:
+    budget = BatchTokenBudget(ceiling=1000, minimum=64, maximum=1024, token_memory=1)
+
+    for _ in range(20):
+        budget.update(100, 300, tokens=100)
+
+    assert budget.token_memory == pytest.approx(2, abs=0.01)
+    assert budget.limit(500, 1024) == 128
+
+
+def test_batch_token_budget_recovers_after_spike() -> None:
+    budget = BatchTokenBudget(ceiling=1_000_000, minimum=64, maximum=1024, token_memory=100)
+    # a growth of 1000 bytes per token is clamped to four times the estimate
+    budget.update(0, 1_000_000, tokens=1000)
+    assert budget.token_memory == 175
+    assert budget.tokens == 512
+
+    for _ in range(20):
+        budget.update(0, 100_000, tokens=1000)
+
+    assert budget.token_memory < 110
+    assert budget.limit(750_000, 1024) == 1024
+
+
+def test_concurrent_footprints_are_measured_apart() -> None:
+    measuring = Event()
+    buffers: list[bytes] = []
+
+    def load_small() -> None:
+        with measure_footprint("small"):
+            measuring.set()
+            sleep(0.1)
+
+    def load_large() -> None:
+        measuring.wait()
+
+        with measure_footprint("large"):
+            buffers.append(b"x" * (64 << 20))
+
+    threads = [Thread(target=load_small), Thread(target=load_large)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert memory_footprint.pop("large") >= 32 << 20
+    assert memory_footprint.pop("small") < 32 << 20
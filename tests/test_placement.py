@@ -0,0 +1,39 @@
+# ruff: noqa: S101
+
+from os import sched_getaffinity
+from pathlib import Path
+
+from server.features.placement import Placement, parse_cpu_list, plan_placement, read_numa_nodes
+
+
+def test_parse_cpu_list() -> None:
+    assert parse_cpu_list("0-3,8-11\n") == [0, 1, 2, 3, 8, 9, 10, 11]
+    assert parse_cpu_list("5") == [5]
+    assert parse_cpu_list("") == []
+
+
+def test_plan_placement_keeps_replicas_within_a_node() -> None:
+    nodes = {0: list(range(8)), 1: list(range(8, 16))}
+
+    assert plan_placement(nodes, replicas=3) == [
+        Placement(0, 0, [0, 1, 2, 3]),
+        Placement(1, 1, list(range(8, 16))),
+        Placement(2, 0, [4, 5, 6, 7]),
+    ]
+    assert plan_placement({0: [0, 1, 2, 3, 4]}, replicas=2) == [Placement(0, 0, [0, 1, 2]), Placement(1, 0, [3, 4])]
+    assert plan_placement({0: [0, 1]}, replicas=3) == [
+        Placement(0, 0, [0]),
+        Placement(1, 0, [1]),
+        Placement(2, 0, [0]),
+    ]
+
+
+def test_read_numa_nodes(tmp_path: Path) -> None:
+    allowed = sorted(sched_getaffinity(0))
+    assert read_numa_nodes(tmp_path) == {0: allowed}
+
+    (tmp_path / "node1").mkdir()
+    (tmp_path / "node1" / "cpulist").write_text(f"{allowed[0]}\n")
+    (tmp_path / "node0").mkdir()
+    (tmp_path / "node0" / "cpulist").write_text("100000-100003\n")
+    assert read_numa_nodes(tmp_path) == {1: [allowed[0]]}
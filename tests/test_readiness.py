@@ -0,0 +1,33 @@
+# ruff: noqa: S101
+
+from server.features.readiness import Component
+from server.features.readiness.component import DEFAULT_RETRY_AFTER
+
+
+def test_component_progress_across_stages() -> None:
+    component = Component("translator")
+    assert component.overall_progress() == 0.0
+    assert component.retry_after() == DEFAULT_RETRY_AFTER
+
+    component.advance("downloading")
+    component.update(0.5)
+    assert component.overall_progress() == 0.5 / 3
+
+    component.advance("warming")
+    component.update(2.0)
+    assert component.overall_progress() == 1.0
+
+    component.advance("ready")
+    assert component.overall_progress() == 1.0
+    assert component.timings.keys() == {"downloading", "warming", "total"}
+
+
+def test_component_failure() -> None:
+    component = Component("language_detector")
+    component.advance("loading")
+    component.fail(FileNotFoundError("model.bin"))
+
+    assert component.state == "failed"
+    assert component.error == "model.bin"
+    assert component.overall_progress() == 0.0
+    assert component.retry_after() == DEFAULT_RETRY_AFTER
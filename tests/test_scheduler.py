@@ -0,0 +1,147 @@
+# ruff: noqa: S101
+
+from asyncio import CancelledError, create_task, get_running_loop, run
+from asyncio import sleep as yield_for
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from threading import Thread
+from time import sleep
+
+from server.features.scheduler import ScheduledTranslator, schedule_as
+from server.features.scheduler.cost_model import CostModel
+from server.features.scheduler.scheduler import Scheduler
+from server.features.translator.stub import TranslatorStub
+
+
+def test_cost_model_prior() -> None:
+    cost_model = CostModel(seconds_per_token=0.01)
+    assert cost_model.predict([("profile", "fast")], 100) == 1.0
+
+
+def test_cost_model_fit() -> None:
+    cost_model = CostModel(seconds_per_token=0.01, min_observations=2)
+
+    for tokens in (10, 20, 30, 40):
+        cost_model.observe([("pair", "eng_Latn", "spa_Latn"), ("profile", "fast")], tokens, 0.1 + 0.02 * tokens)
+
+    assert abs(cost_model.predict([("pair", "eng_Latn", "spa_Latn")], 50) - 1.1) < 1e-6
+    assert abs(cost_model.predict([("pair", "eng_Latn", "fra_Latn"), ("profile", "fast")], 50) - 1.1) < 1e-6
+
+
+def test_scheduler_estimate_wait() -> None:
+    scheduler = Scheduler(slots=1, aging=1.0)
+    assert scheduler.estimate_wait(1.0, 10) == 0.0
+
+    with scheduler.schedule(10.0, 1000):
+        assert 0.0 < scheduler.estimate_wait(1.0, 10) <= 10.0
+
+
+def test_scheduler_pools() -> None:
+    scheduler = Scheduler(slots=2, aging=1.0, short_slots=1, short_token_threshold=64)
+
+    with scheduler.schedule(10.0, 1000):
+        assert scheduler.estimate_wait(1.0, 10) == 0.0
+        assert scheduler.estimate_wait(10.0, 1000) > 0.0
+
+    with scheduler.schedule(1.0, 10):
+        # the idle long pool accepts short inputs as spill-over
+        assert scheduler.estimate_wait(1.0, 10) == 0.0
+
+
+def test_scheduler_priority_classes() -> None:
+    priority_classes = {"interactive": 1.0, "bulk": 4.0}
+    weighted = Scheduler(slots=1, aging=0.0, priority_classes=priority_classes)
+    strict = Scheduler(slots=1, aging=0.0, priority_classes=priority_classes, strict_priority=True)
+
+    assert weighted.is_preemptible("bulk")
+    assert not weighted.is_preemptible(None)
+
+    def key(scheduler: Scheduler, cost: float, priority_class: str) -> tuple[int, float]:
+        return scheduler.priority(scheduler.create_job(cost, 10, priority_class, None, 1.0))
+
+    assert key(weighted, 1.0, "bulk") > key(weighted, 2.0, "interactive")
+    assert key(weighted, 1.0, "bulk") < key(weighted, 8.0, "interactive")
+    assert key(strict, 0.1, "bulk") > key(strict, 8.0, "interactive")
+
+
+def test_scheduler_weighted_fair_queuing() -> None:
+    scheduler = Scheduler(slots=1, aging=0.0)
+    order: list[str] = []
+
+    def submit(tenant: str) -> None:
+        with scheduler.schedule(1.0, 10, None, tenant, 1.0):
+            order.append(tenant)
+
+    with scheduler.schedule(0.0, 10):
+        threads = [Thread(target=submit, args=(tenant,)) for tenant in ("noisy", "noisy", "noisy", "quiet")]
+
+        for thread in threads:
+            thread.start()
+            sleep(0.05)
+
+    for thread in threads:
+        thread.join()
+
+    assert order.index("quiet") == 1
+
+
+def test_async_admission_keeps_the_order_with_the_threadpool_saturated() -> None:
+    scheduler = Scheduler(slots=1, aging=0.0, priority_classes={"interactive": 1.0, "bulk": 4.0})
+    translator = ScheduledTranslator(
+        TranslatorStub(),
+        scheduler=scheduler,
+        cost_model=CostModel(seconds_per_token=0.01),
+        default_decoding_profile="fast",
+        preemption_batch_size=8,
+    )
+    requests = [(8, "interactive"), (3, "bulk"), (3, "interactive"), (1, "bulk"), (1, "interactive")] * 4
+    order: list[tuple[int, str]] = []
+
+    async def submit(words: int, priority_class: str) -> None:
+        with schedule_as(priority_class, None):
+            await translator.translate_async(" ".join(["word"] * words), "eng_Latn", "spa_Latn")
+
+        order.append((words, priority_class))
+
+    async def saturate() -> None:
+        # far fewer threads than queued requests, which would each hold one while waiting for the slot
+        get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+
+        with scheduler.schedule(0.0, 10):
+            tasks = [create_task(submit(words, priority_class)) for words, priority_class in requests]
+
+            while sum(map(len, scheduler.waiting.values())) < len(requests):  # noqa: ASYNC110
+                await yield_for(0.01)
+
+        for task in tasks:
+            await task
+
+    run(saturate())
+
+    # bulk costs count four times, so the order is by the scaled cost of 1, 3, 4, 8 and 12
+    assert order == sorted(requests, key=lambda request: request[0] * (4 if request[1] == "bulk" else 1))
+
+
+def test_cancelled_async_admission_is_withdrawn() -> None:
+    scheduler = Scheduler(slots=1, aging=0.0)
+
+    async def wait_for_the_slot() -> None:
+        async with scheduler.schedule_async(1.0, 10):
+            pass
+
+    async def cancel() -> None:
+        with scheduler.schedule(0.0, 10):
+            waiter = create_task(wait_for_the_slot())
+            await yield_for(0)
+            waiter.cancel()
+
+            with suppress(CancelledError):
+                await waiter
+
+        assert not any(scheduler.waiting.values())
+        assert not any(scheduler.running.values())
+
+        async with scheduler.schedule_async(1.0, 10):
+            assert scheduler.estimate_wait(1.0, 10) > 0.0
+
+    run(cancel())
@@ -0,0 +1,49 @@
+# ruff: noqa: S101
+
+from threading import Event
+
+from server.features.shadow import ShadowTranslator
+from server.features.translator.stub import TranslatorStub
+from server.typedefs import Language
+
+
+class BlockingTranslatorStub(TranslatorStub):
+    def __init__(self, released: Event) -> None:
+        super().__init__()
+        self.released = released
+
+    def translate(
+        self,
+        text: str,
+        source_language: Language,
+        target_language: Language,
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> str:
+        self.released.wait(5)
+        return super().translate(text, source_language, target_language, min_length_percentage, profile=profile)
+
+
+def test_shadow_translator_compares_mirrored_requests() -> None:
+    with ShadowTranslator(TranslatorStub(), TranslatorStub(), percentage=100, capacity=1, profile=None) as translator:
+        translator.translate_batch(["Hello, world!", "Goodbye!"], ["eng_Latn", "eng_Latn"], ["spa_Latn", "spa_Latn"])
+
+    [pair] = translator.comparison.summarise()
+
+    assert translator.comparison.mirrored == 1
+    assert (pair.source, pair.target, pair.count) == ("eng_Latn", "spa_Latn", 2)
+    assert pair.chrf == 100
+
+
+def test_shadow_translator_drops_requests_over_capacity() -> None:
+    released = Event()
+    shadow = BlockingTranslatorStub(released)
+
+    with ShadowTranslator(TranslatorStub(), shadow, percentage=100, capacity=1, profile=None) as translator:
+        translator.translate("Hello, world!", "eng_Latn", "spa_Latn")
+        translator.translate("Hello, world!", "eng_Latn", "spa_Latn")
+        released.set()
+
+    assert translator.comparison.mirrored == 1
+    assert translator.comparison.dropped == 1
@@ -0,0 +1,66 @@
+# ruff: noqa: S101
+
+from pathlib import Path
+
+from server.config import Config
+from server.features.sizing import CgroupLimits, apply_sizing, plan_sizing, read_cgroup_limits
+
+GIB = 1024**3
+
+
+def test_read_cgroup_limits(tmp_path: Path) -> None:
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    (tmp_path / "memory.max").write_text(f"{4 * GIB}\n")
+    limits = read_cgroup_limits(tmp_path)
+
+    assert limits.cpus <= 1.5
+    assert limits.memory == 4 * GIB
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    (tmp_path / "memory.max").write_text("max\n")
+    limits = read_cgroup_limits(tmp_path)
+
+    assert limits.cpus == len(limits.cpuset)
+    assert limits.memory is None
+
+
+def test_plan_sizing_stays_within_the_limits() -> None:
+    plan = plan_sizing(
+        CgroupLimits(32.0, list(range(32)), 8 * GIB),
+        model_sizes=["medium"],
+        inference_process=False,
+        batch_min_tokens=256,
+        batch_max_tokens=8192,
+    )
+
+    assert plan.worker_count == 2
+    assert plan.worker_count * plan.translator_threads * plan.translator_intra_threads <= 32
+    assert plan.memory_ceiling is not None
+    assert plan.memory_ceiling < 8 * GIB
+    assert 256 <= plan.batch_max_tokens < 8192
+
+
+def test_plan_sizing_without_limits() -> None:
+    plan = plan_sizing(
+        CgroupLimits(1.5, [0, 1], None),
+        model_sizes=["large"],
+        inference_process=False,
+        batch_min_tokens=256,
+        batch_max_tokens=8192,
+    )
+
+    assert (plan.worker_count, plan.translator_threads, plan.translator_intra_threads) == (1, 1, 1)
+    assert plan.batch_max_tokens == 8192
+    assert plan.memory_ceiling is None
+
+
+def test_explicit_settings_override_the_plan() -> None:
+    config = Config(worker_count=3, translator_threads=2)
+    plan = apply_sizing(config)
+
+    assert plan is not None
+    assert config.worker_count == 3
+    assert config.translator_threads == 2
+    assert config.translator_intra_threads == plan.translator_intra_threads
+
+    assert apply_sizing(Config(auto_sizing=False)) is None
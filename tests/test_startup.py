@@ -0,0 +1,19 @@
+# ruff: noqa: S101
+
+from server.features.startup import get_process_age, measure_startup, startup_phases
+
+
+def test_process_age() -> None:
+    assert get_process_age() > 0.0
+
+
+def test_measure_startup_accumulates() -> None:
+    with measure_startup("test_phase"):
+        pass
+
+    first = startup_phases["test_phase"]
+
+    with measure_startup("test_phase"):
+        pass
+
+    assert startup_phases["test_phase"] >= first
@@ -0,0 +1,57 @@
+# ruff: noqa: S101
+
+from pytest import raises
+
+from server.features.scheduler import CostModel, ScheduledTranslator, Scheduler, schedule_as
+from server.features.tenants.bucket import QuotaExceededError, TenantBucket
+from server.features.translator.stub import TranslatorStub
+
+
+def test_bucket_admits_within_quota() -> None:
+    bucket = TenantBucket("tenant", rate=10.0, capacity=100.0, weight=1.0)
+    bucket.consume(60)
+    bucket.consume(40)
+
+
+def test_bucket_throttles_over_quota() -> None:
+    bucket = TenantBucket("tenant", rate=10.0, capacity=100.0, weight=1.0)
+    bucket.consume(100)
+
+    with raises(QuotaExceededError) as error:
+        bucket.consume(50)
+
+    assert 0.0 < error.value.retry_after <= 5.0
+
+
+def test_bucket_admits_oversized_request_when_full() -> None:
+    bucket = TenantBucket("tenant", rate=10.0, capacity=100.0, weight=1.0)
+    bucket.consume(500)
+
+    with raises(QuotaExceededError):
+        bucket.consume(1)
+
+
+def test_batch_is_admitted_once_as_a_whole() -> None:
+    bucket = TenantBucket("tenant", rate=0.001, capacity=10.0, weight=1.0)
+    translator = ScheduledTranslator(
+        TranslatorStub(),
+        scheduler=Scheduler(slots=1, aging=1.0),
+        cost_model=CostModel(seconds_per_token=0.01),
+        default_decoding_profile="fast",
+        preemption_batch_size=8,
+    )
+
+    # the first group is admitted for the whole batch, the other groups are not admitted again
+    with schedule_as(None, bucket, admission=8):
+        translator.translate_batch(["a b"], ["eng_Latn"], ["spa_Latn"])
+
+    with schedule_as(None, bucket, admission=0):
+        translator.translate_batch(["a b c d e f"], ["eng_Latn"], ["spa_Latn"], profile="quality")
+
+    assert 2.0 <= bucket.tokens < 2.1
+
+    # a batch over quota is rejected by its first group, before anything is translated
+    with schedule_as(None, bucket, admission=6), raises(QuotaExceededError):
+        translator.translate_batch(["a b"], ["eng_Latn"], ["spa_Latn"])
+
+    assert 2.0 <= bucket.tokens < 2.1
@@ -2,6 +2,7 @@
 
 from asyncio import TaskGroup
 from collections.abc import Awaitable, Callable
+from threading import Event
 
 from httpx import Response
 from hypothesis import given
@@ -13,13 +14,48 @@ from litestar.status_codes import (
     HTTP_304_NOT_MODIFIED,
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
+    HTTP_422_UNPROCESSABLE_ENTITY,
 )
 from litestar.testing import AsyncTestClient
 from pytest import mark
 
+from server.api.translator import stream_fanout
+from server.features.translator.stub import TranslatorStub
+from server.schemas.v1 import TranslationFanout
 from server.typedefs.language import Language
 
 
+class GatedTranslatorStub(TranslatorStub):
+    """
+    Summary
+    -------
+    a translator stub whose fan-outs only finish decoding once the event loop has served another request
+    """
+
+    def __init__(self) -> None:
+        self.served = Event()
+
+    def translate_fanout(
+        self,
+        text: str,
+        source_language: Language,
+        target_languages: list[Language],
+        min_length_percentage: float = 0.8,
+        *,
+        profile: str | None = None,
+    ) -> list[str]:
+        if not self.served.wait(timeout=5.0):
+            raise TimeoutError("the event loop served no other request while the fan-out was decoding")
+
+        return super().translate_fanout(
+            text,
+            source_language,
+            target_languages,
+            min_length_percentage,
+            profile=profile,
+        )
+
+
 async def translate_post(client: AsyncTestClient[Litestar], text: str, source: str, target: str) -> Response:
     return await client.post("/translator", json={"text": text, "source": source, "target": target})
 
@@ -142,3 +178,89 @@ async def test_parallelism(session_client: AsyncTestClient[Litestar]) -> None:
         ]
 
     assert all(task.result().status_code == HTTP_200_OK for task in tasks)
+
+
+@mark.anyio
+@mark.parametrize("profile", ["fast", "balanced", "quality"])
+async def test_translate_with_profile(session_client: AsyncTestClient[Litestar], profile: str) -> None:
+    response = await session_client.post(
+        "/translator",
+        json={"text": "Hello, world!", "source": "eng_Latn", "target": "spa_Latn", "profile": profile},
+    )
+    assert response.status_code == HTTP_200_OK
+
+
+@mark.anyio
+async def test_translate_with_unknown_profile(session_client: AsyncTestClient[Litestar]) -> None:
+    response = await session_client.get(
+        "/translator",
+        params={"text": "Hello, world!", "source": "eng_Latn", "target": "spa_Latn", "profile": "unknown"},
+    )
+    assert response.status_code == HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@mark.anyio
+async def test_translate_fanout_api(session_client: AsyncTestClient[Litestar]) -> None:
+    response = await session_client.post(
+        "/translator/fanout",
+        json={"text": "Hello, world!", "source": "eng_Latn", "targets": ["spa_Latn", "fra_Latn", "spa_Latn"]},
+    )
+    assert response.status_code == HTTP_200_OK
+    assert set(response.json()["results"]) == {"spa_Latn", "fra_Latn"}
+
+
+@mark.anyio
+async def test_translate_fanout_stream_keeps_serving_other_requests() -> None:
+    data = TranslationFanout(text="Hello, world!", source="eng_Latn", targets=["spa_Latn", "fra_Latn", "deu_Latn"])
+    translator = GatedTranslatorStub()
+
+    async def serve_other_request() -> None:
+        translator.served.set()
+
+    async def stream() -> list[dict[str, str]]:
+        return [
+            event
+            async for event in stream_fanout(
+                translator,
+                data,
+                data.targets,
+                chunk_size=1,
+                priority_class=None,
+                tenant=None,
+            )
+        ]
+
+    # the stream starts first, so a decode on the event loop would time out before the other request is served
+    async with TaskGroup() as group:
+        events = group.create_task(stream())
+        group.create_task(serve_other_request())
+
+    assert [event["event"] for event in events.result()] == data.targets
+
+
+@mark.anyio
+async def test_translate_estimate_api(session_client: AsyncTestClient[Litestar]) -> None:
+    response = await session_client.post(
+        "/translator/estimate",
+        json={"text": "Hello, world!", "source": "eng_Latn", "target": "spa_Latn"},
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["tokens"] > 0
+
+
+@mark.anyio
+@mark.parametrize(
+    ("priority_class", "status_code"),
+    [("bulk", HTTP_200_OK), ("unknown", HTTP_422_UNPROCESSABLE_ENTITY)],
+)
+async def test_translate_with_priority_class(
+    session_client: AsyncTestClient[Litestar],
+    priority_class: str,
+    status_code: int,
+) -> None:
+    response = await session_client.post(
+        "/translator",
+        json={"text": "Hello, world!", "source": "eng_Latn", "target": "spa_Latn"},
+        headers={"X-Priority": priority_class},
+    )
+    assert response.status_code == status_code
@@ -0,0 +1,24 @@
+# ruff: noqa: S101
+
+from server.features.detector.stub import LanguageDetectorStub
+from server.features.translator.stub import TranslatorStub
+from server.features.warmup import warm_up_language_detector, warm_up_translator
+
+
+def test_warm_up_translator_times_every_phase() -> None:
+    progress: list[float] = []
+    timings = warm_up_translator(
+        TranslatorStub(),
+        language_pairs=[("eng_Latn", "spa_Latn"), ("spa_Latn", "eng_Latn")],
+        rounds=2,
+        on_progress=progress.append,
+    )
+
+    assert timings.keys() == {"single", "batch"}
+    assert all(duration >= 0.0 for duration in timings.values())
+    assert progress == [0.5, 1.0]
+
+
+def test_warm_up_language_detector() -> None:
+    timings = warm_up_language_detector(LanguageDetectorStub(), rounds=1)
+    assert timings.keys() == {"language_detector"}